@@ -24,10 +24,13 @@ class ProgramNode(ASTNode):
 
 class BalanceStatementNode(ASTNode):
     """Represents a balance statement."""
-    def __init__(self, reaction_expr):
+    def __init__(self, reaction_expr, all_solutions=False):
         self.reaction_expr = reaction_expr
+        self.all_solutions = all_solutions  # 'balance ... all;' lists every independent balancing
 
     def __repr__(self):
+        if self.all_solutions:
+            return f"BalanceStatementNode({self.reaction_expr}, all)"
         return f"BalanceStatementNode({self.reaction_expr})"
 
 
@@ -69,6 +72,45 @@ class ChemicalAnalysisNode(ASTNode):
     def __repr__(self):
         return f"ChemicalAnalysisNode(analysis_type={self.analysis_type}, target={self.target})"
 
+class PercentCompositionNode(ASTNode):
+    """Represents measured mass percentages, e.g. '[C 40.0, H 6.7, O 53.3] with molar_mass 180.16'."""
+    def __init__(self, percentages, molar_mass=None):
+        self.percentages = percentages  # element symbol -> mass percent
+        self.molar_mass = molar_mass
+
+    def __repr__(self):
+        return f"PercentCompositionNode({self.percentages}, molar_mass={self.molar_mass})"
+
+class FormulaQueryNode(ASTNode):
+    """Represents a formula search by mass, e.g. 'query formula mass 180.063 tol 5ppm'."""
+    def __init__(self, mass, tolerance=5.0, unit='ppm'):
+        self.mass = mass
+        self.tolerance = tolerance
+        self.unit = unit  # 'ppm', 'da' or 'mda'
+
+    def __repr__(self):
+        return f"FormulaQueryNode(mass={self.mass}, tol={self.tolerance}{self.unit})"
+
+class CompoundQueryNode(ASTNode):
+    """Represents a compound database query, e.g. 'query compound with S, O and molar_mass < 100'."""
+    def __init__(self, elements=None, state=None, classification=None, mass=None):
+        self.elements = elements or []
+        self.state = state                    # 'solid', 'liquid', 'gas' or 'aqueous'
+        self.classification = classification
+        self.mass = mass or []                # [(op, value), ...] molar mass comparisons
+
+    def __repr__(self):
+        return (f"CompoundQueryNode(elements={self.elements}, state={self.state}, "
+                f"classification={self.classification!r}, mass={self.mass})")
+
+class ReactionQueryNode(ASTNode):
+    """Represents a known-reaction lookup, e.g. 'query reaction with CaCO3'."""
+    def __init__(self, molecule):
+        self.molecule = molecule
+
+    def __repr__(self):
+        return f"ReactionQueryNode({self.molecule})"
+
 class ReactionExpressionNode(ASTNode):
     """Represents a chemical reaction expression (reactants -> products)."""
     def __init__(self, reactants, products):
@@ -115,16 +157,25 @@ class ChemicalTermNode(ASTNode):
 
 
 class MoleculeNode(ASTNode):
-    """Represents a molecule (collection of element groups)."""
-    def __init__(self, elements, multiplier=1):
+    """Represents a molecule or ion (collection of element groups with an optional charge)."""
+    def __init__(self, elements, multiplier=1, charge=0):
         self.elements = elements
         self.multiplier = multiplier
+        self.charge = charge  # Net ionic charge, e.g. -1 for MnO4^-
 
     def __repr__(self):
         elements = ", ".join(str(e) for e in self.elements)
+        if self.charge:
+            return f"MoleculeNode(elements=[{elements}], charge={self.charge})"
         return f"MoleculeNode(elements=[{elements}])"
 
 
+class ElectronNode(ASTNode):
+    """Represents an electron written as an explicit species (e^-)."""
+    def __repr__(self):
+        return "ElectronNode()"
+
+
 class ElementGroupNode(ASTNode):
     """Represents an element group (element symbol with optional count)."""
     def __init__(self, symbol, count=1):
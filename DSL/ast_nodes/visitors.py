@@ -49,9 +49,15 @@ class PrettyPrintVisitor(Visitor):
     def visit_MoleculeNode(self, node):
         elems = "".join(self.visit(elem) for elem in node.elements)
         if node.multiplier != 1:
-            return f"({elems}){node.multiplier}"
+            elems = f"({elems}){node.multiplier}"
+        if node.charge:
+            magnitude = abs(node.charge)
+            elems += f"^{magnitude if magnitude != 1 else ''}{'+' if node.charge > 0 else '-'}"
         return elems
 
+    def visit_ElectronNode(self, node):
+        return "e^-"
+
     def visit_ElementGroupNode(self, node):
         return f"{node.symbol}{node.count if node.count != 1 else ''}"
 
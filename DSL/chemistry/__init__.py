@@ -5,7 +5,31 @@ This package provides domain-specific chemical data and functions for ChemDSL,
 including element definitions, compound representation, reaction prediction,
 and equation balancing.
 """
+from importlib import import_module
 from .elements import ELEMENTS
-from .compounds import Compound, parse_formula
+from .compounds import (Compound, parse_formula, composition_of, FormulaMemo, formula_memo, hill_formula,
+                        canonical_formula, composition_hash, formula_hash, unique_formulas)
+from .vectors import to_vector, from_vector
+from .formatting import format_formula, FormulaFormatter
+from .compound_db import CompoundDB
+from .batch import parse_formulas, molar_masses
+from .isotopes import isotope_pattern, isotope_patterns
+from .mass_search import decompose_mass, MassDecomposer
+from .elemental_analysis import formulas_from_percentages, formulas_from_percentages_many
+from .knowledge_base import ReactionIndex, KnownReaction, parse_equations
 from .reactions import Reaction, predict_reaction
-from .balancer import balance_reaction
+from .balancer import (balance_reaction, balance_all, balance_many, BalanceProblem, BalanceDiagnosis,
+                       BudgetExceeded, CancellationToken)
+from .balance_cache import BalanceCache, reaction_key
+
+
+# Exports whose modules pull in SQLite or NumPy; they are imported on first access
+_LAZY_EXPORTS = {'Catalog': 'catalog', 'MappedCatalog': 'mapped_catalog',
+                 'build_mapped_catalog': 'mapped_catalog'}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = import_module(f"{__name__}.{_LAZY_EXPORTS[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,197 @@
+"""
+DSL/chemistry/balance_cache.py
+
+Caches balancing results under a canonical, order-independent reaction key.
+Results live in an in-process LRU and, optionally, in a SQLite file that
+survives restarts and is invalidated whenever the balancing engine version
+changes.
+"""
+
+import atexit
+import os
+import threading
+from DSL.chemistry import balancer
+from DSL.chemistry.compounds import format_charge
+from DSL.chemistry.lru import LRUCache
+
+CACHE_FILENAME = "balance_cache.sqlite3"
+
+# Results written to the persistent layer in one transaction
+WRITE_BATCH = 256
+
+
+def _species_key(orig_coeff, compound):
+    """Canonical string for one species: its scaled composition in symbol order, then its charge."""
+    composition = balancer.species_composition(compound)
+    key = "".join(f"{element}{count * orig_coeff}" for element, count in sorted(composition.items()))
+    return key + format_charge(balancer.species_charge(compound) * orig_coeff)
+
+
+def canonical_order(reactants, products, keep_order=False):
+    """
+    Compute the canonical reaction key and the species order it implies.
+    Returns (key, order) where order lists the caller's species indices
+    (reactants first) in canonical position order. With keep_order the
+    species are not sorted, for results that depend on the written order.
+    """
+    reactant_keys = [_species_key(c, compound) for c, compound in reactants]
+    product_keys = [_species_key(c, compound) for c, compound in products]
+    reactant_order = list(range(len(reactant_keys)))
+    product_order = list(range(len(product_keys)))
+    if not keep_order:
+        reactant_order.sort(key=reactant_keys.__getitem__)
+        product_order.sort(key=product_keys.__getitem__)
+
+    key = (" + ".join(reactant_keys[i] for i in reactant_order) + " -> " +
+           " + ".join(product_keys[i] for i in product_order))
+    order = reactant_order + [len(reactants) + i for i in product_order]
+    return key, order
+
+
+def reaction_key(reactants, products):
+    """
+    Build a canonical, order-independent key for a reaction.
+    'O2 + 2H2 -> 2H2O' and '2H2 + O2 -> 2H2O' share the same key.
+    """
+    return canonical_order(reactants, products)[0]
+
+
+class BalanceCache(LRUCache):
+    """
+    LRU cache of balancing results with an optional persistent SQLite layer.
+    maxsize bounds the number of in-process entries. When path is given, it
+    names a cache directory; results are also written there and read back by
+    later processes as long as balancer.ENGINE_VERSION is unchanged.
+    New results are written there in batches of WRITE_BATCH; flush() or
+    close() writes the rest.
+    hits and misses count lookups served from either layer or computed anew.
+    """
+
+    def __init__(self, maxsize=4096, path=None):
+        super().__init__(maxsize)
+        self._db = None
+        self._pending = {}
+        if path is not None:
+            self._open(path)
+
+    def _open(self, path):
+        """Open the SQLite cache in path, discarding it if it was written by another engine version."""
+        import sqlite3
+        os.makedirs(path, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(path, CACHE_FILENAME), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, coeffs TEXT)")
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        if row is None or row[0] != balancer.ENGINE_VERSION:
+            self._db.execute("DELETE FROM results")
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (balancer.ENGINE_VERSION,))
+        self._db.commit()
+
+    def get(self, key):
+        """
+        Look up a key. Returns (found, coeffs) where coeffs is a tuple in
+        canonical species order, or None for a cached failure.
+        """
+        with self._lock:
+            found, coeffs = self.peek(key)
+            if found or self._db is None:
+                return found, coeffs
+            stored = self._pending.get(key)
+            if stored is None:
+                row = self._db.execute("SELECT coeffs FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return False, None
+                stored = row[0]
+            coeffs = tuple(int(c) for c in stored.split(",")) if stored else None
+            self.store(key, coeffs)
+            return True, coeffs
+
+    def put(self, key, coeffs):
+        """Store a result (canonical species order) in every cache layer."""
+        with self._lock:
+            self.store(key, coeffs)
+            if self._db is not None:
+                self._pending[key] = ",".join(str(c) for c in coeffs) if coeffs else ""
+                if len(self._pending) >= WRITE_BATCH:
+                    self.flush()
+
+    def flush(self):
+        """Write the results not yet stored in the persistent layer in one transaction."""
+        with self._lock:
+            if self._db is not None and self._pending:
+                with self._db:
+                    self._db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?)",
+                                         self._pending.items())
+                self._pending.clear()
+
+    def clear(self):
+        """Drop every cached result, in memory and on disk, and reset the counters."""
+        with self._lock:
+            super().clear()
+            self._pending.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def close(self):
+        """Write pending results and close the persistent layer, if any."""
+        with self._lock:
+            if self._db is not None:
+                self.flush()
+                self._db.close()
+                self._db = None
+
+    def balance_reaction(self, reactants, products, mode="exact", max_coeff=20,
+                         timeout=None, max_operations=None, token=None, budget=None):
+        """
+        Cached front end for balancer.balance_reaction with the same arguments
+        and return value. BudgetExceeded results are returned but not cached.
+        """
+        # Search results depend on the written species order, so only exact ones are reordered
+        key, order = canonical_order(reactants, products, keep_order=(mode != "exact"))
+        if mode != "exact":
+            key = f"{mode}:{max_coeff}:{key}"
+
+        found, canonical = self.get(key)
+        self._count(found)
+        if not found:
+            ordered = [(reactants + products)[i] for i in order]
+            n = len(reactants)
+            canonical = balancer.balance_reaction(ordered[:n], ordered[n:], mode=mode, max_coeff=max_coeff,
+                                                  timeout=timeout, max_operations=max_operations, token=token,
+                                                  budget=budget)
+            if isinstance(canonical, balancer.BudgetExceeded):
+                return canonical
+            self.put(key, canonical)
+
+        if canonical is None:
+            return None
+        coeffs = [0] * len(order)
+        for position, index in enumerate(order):
+            coeffs[index] = canonical[position]
+        return tuple(coeffs)
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache():
+    """
+    Return the shared in-process cache, creating it on first use. Set
+    CHEMDSL_CACHE_DIR to also persist its results; they are flushed at exit.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = BalanceCache(path=os.environ.get("CHEMDSL_CACHE_DIR"))
+            atexit.register(_default_cache.close)
+        return _default_cache
+
+
+def balance_reaction(reactants, products, mode="exact", max_coeff=20,
+                     timeout=None, max_operations=None, token=None, budget=None):
+    """Balance a reaction through the shared default cache."""
+    return get_default_cache().balance_reaction(reactants, products, mode=mode, max_coeff=max_coeff,
+                                                timeout=timeout, max_operations=max_operations, token=token,
+                                                budget=budget)
@@ -1,14 +1,33 @@
 """
 DSL/chemistry/balancer.py
 
-Provides a simple algorithm to balance chemical reactions.
-For demonstration purposes, this implementation uses a brute-force search.
-In production, you might use linear algebra or other methods.
+Balances chemical reactions with exact linear algebra.
+The reaction is turned into an element-by-species composition matrix and its
+integer nullspace is found by rational Gaussian elimination, so there is no
+upper bound on the size of the coefficients.
+A search mode is kept for callers that rely on the first small-coefficient
+solution in lexicographic order; it checks candidates in NumPy blocks.
 """
 
-import itertools
 import math
-from DSL.chemistry.compounds import parse_formula
+import os
+import re
+import threading
+import time
+from collections import deque
+from fractions import Fraction
+from itertools import islice
+from DSL.chemistry.compounds import composition_of, split_charge
+
+# Number of coefficient candidates checked per NumPy block in search mode; the
+# budget is checked between blocks, so this also bounds how far a timeout overshoots
+SEARCH_BLOCK_SIZE = 65_536
+
+# Bump whenever balancing results can change; persistent caches keyed on it are discarded
+ENGINE_VERSION = "3"
+
+# Name of the extra conservation row used for ionic charge
+CHARGE_ROW = 'charge'
 
 
 def find_gcd(numbers):
@@ -21,65 +40,749 @@ def find_gcd(numbers):
     return result
 
 
+def find_lcm(numbers):
+    """
+    Find the least common multiple of a list of numbers.
+    """
+    result = 1
+    for num in numbers:
+        result = result * num // math.gcd(result, num)
+    return result
+
+
+def species_composition(compound):
+    """Return the element counts of a Compound or a formula string."""
+    if hasattr(compound, 'composition'):
+        return compound.composition
+    return composition_of(compound)
+
+
+def species_charge(compound):
+    """Return the ionic charge of a Compound or a formula string."""
+    if hasattr(compound, 'charge'):
+        return compound.charge
+    return split_charge(_formula(compound))[1]
+
+
+def split_terms(side):
+    """Split one side of an equation on '+', leaving charges such as 'Fe^2+' intact."""
+    terms, current, in_charge = [], "", False
+    for ch in side:
+        if in_charge:
+            current += ch
+            in_charge = ch not in '+-'
+        elif ch == '^':
+            current += ch
+            in_charge = True
+        elif ch == '+':
+            terms.append(current)
+            current = ""
+        else:
+            current += ch
+    terms.append(current)
+    return terms
+
+
+def parse_term(term):
+    """
+    Parse one term such as '2H2O' or 'Fe^2+' into a (coefficient, formula)
+    tuple. Raises ValueError if the term is empty or its formula contains
+    whitespace.
+    """
+    match = re.fullmatch(r'\s*(\d*)\s*(\S+)\s*', term)
+    if not match:
+        raise ValueError(f"Malformed term '{term.strip()}'")
+    return int(match.group(1)) if match.group(1) else 1, match.group(2)
+
+
+def parse_equation(equation):
+    """
+    Parse an equation string such as '2H2 + O2 -> 2H2O' or
+    'Fe^3+ + e^- -> Fe^2+' into (reactants, products) lists of
+    (coefficient, formula) tuples.
+    """
+    sides = re.split(r'->|→', equation)
+    if len(sides) != 2:
+        raise ValueError(f"Malformed equation: {equation}")
+
+    parsed = []
+    for side in sides:
+        try:
+            parsed.append([parse_term(term) for term in split_terms(side)])
+        except ValueError as e:
+            raise ValueError(f"{e} in equation: {equation}") from None
+    return parsed[0], parsed[1]
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag shared between a caller and balancing work.
+    The GUI or a server calls cancel(); running calls stop at their next check.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+class BudgetExceededError(Exception):
+    """Raised inside balancing work when its budget runs out."""
+    def __init__(self, reason):
+        self.reason = reason
+        super().__init__(f"{reason} budget exceeded")
+
+
+class Budget:
+    """
+    Wall-clock and work limits for one balancing call.
+    timeout is in seconds and max_operations counts elementary row, pivot
+    and candidate operations; either may be None for no limit. A
+    CancellationToken stops the work as soon as it is triggered.
+    """
+
+    def __init__(self, timeout=None, max_operations=None, token=None):
+        self.timeout = timeout
+        self.max_operations = max_operations
+        self.token = token
+        self.operations = 0
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+
+    def charge(self, operations=1):
+        """Account for work done and raise BudgetExceededError if a limit is hit."""
+        self.operations += operations
+        if self.token is not None and self.token.cancelled:
+            raise BudgetExceededError('cancellation')
+        if self.max_operations is not None and self.operations > self.max_operations:
+            raise BudgetExceededError('operations')
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExceededError('time')
+
+
+class BudgetExceeded:
+    """
+    Result of a balancing call that ran out of budget before finishing.
+    It is falsy like None, but tells the caller the answer is unknown rather
+    than that the reaction cannot be balanced.
+    """
+
+    def __init__(self, reason, operations=0):
+        self.reason = reason  # 'time', 'operations' or 'cancellation'
+        self.operations = operations
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return f"BudgetExceeded(reason={self.reason}, operations={self.operations})"
+
+    def __str__(self):
+        if self.reason == 'cancellation':
+            return "balancing was cancelled"
+        return f"{self.reason} budget exceeded after {self.operations} operations"
+
+
+def _budget(budget, timeout, max_operations, token):
+    """Return budget, or a new Budget for the given limits when it is None."""
+    return budget if budget is not None else Budget(timeout, max_operations, token)
+
+
+def _charge(budget, operations=1):
+    """Charge work to an optional budget."""
+    if budget is not None:
+        budget.charge(operations)
+
+
+def _formula(compound):
+    """Return the formula string of a Compound or a formula string."""
+    if hasattr(compound, 'formula'):
+        return compound.formula
+    return str(compound)
+
+
+class BalanceDiagnosis:
+    """
+    Explains why a reaction cannot be balanced.
+    reason is one of the class constants below; elements names the offending
+    elements and species the offending formulas, where applicable.
+    """
+    ONE_SIDED_ELEMENT = 'one_sided_element'
+    UNBALANCED_CHARGE = 'unbalanced_charge'
+    TRIVIAL_SOLUTION_ONLY = 'trivial_solution_only'
+    NO_POSITIVE_SOLUTION = 'no_positive_solution'
+
+    def __init__(self, reason, elements, species=None, message=""):
+        self.reason = reason
+        self.elements = list(elements)
+        self.species = list(species or [])
+        self.message = message
+
+    def __repr__(self):
+        return f"BalanceDiagnosis(reason={self.reason}, elements={self.elements}, species={self.species})"
+
+    def __str__(self):
+        return self.message
+
+
+class BalanceProblem:
+    """
+    A reaction compiled once into an element-by-species composition matrix.
+    reactants and products are lists of tuples: (coefficient, compound).
+    Each species is parsed exactly once; each column is scaled by the
+    coefficient written in the equation, with reactant columns positive
+    and product columns negative. Checking a coefficient vector is then a
+    small integer matrix-vector product.
+    When any species is an ion or an electron, net charge is conserved as
+    one more row, named by CHARGE_ROW, so redox and half-reactions are
+    balanced by the same solver.
+    """
+
+    def __init__(self, reactants, products):
+        self.reactants = list(reactants)
+        self.products = list(products)
+        self.n_reactants = len(self.reactants)
+        self.n_species = len(self.reactants) + len(self.products)
+
+        columns = []
+        for sign, side in ((1, self.reactants), (-1, self.products)):
+            for orig_coeff, compound in side:
+                column = {e: sign * c * orig_coeff for e, c in species_composition(compound).items()}
+                charge = species_charge(compound)
+                if charge:
+                    column[CHARGE_ROW] = sign * charge * orig_coeff
+                columns.append(column)
+
+        self.elements = []
+        for column in columns:
+            for element in column:
+                if element not in self.elements:
+                    self.elements.append(element)
+
+        self.matrix = [[column.get(element, 0) for column in columns]
+                       for element in self.elements]
+        self._basis = None
+
+    def __repr__(self):
+        return f"BalanceProblem(elements={self.elements}, species={self.n_species})"
+
+    def residual(self, coeffs):
+        """Return the per-element imbalance (reactants minus products) for coeffs."""
+        return [sum(a * c for a, c in zip(row, coeffs)) for row in self.matrix]
+
+    def is_balanced(self, coeffs):
+        """Check whether the coefficient vector conserves every element."""
+        return all(sum(a * c for a, c in zip(row, coeffs)) == 0 for row in self.matrix)
+
+    def nullspace(self, budget=None):
+        """Return a rational basis of the solutions of the composition matrix."""
+        if self._basis is None:
+            self._basis = nullspace(self.matrix, self.n_species, budget)
+        return self._basis
+
+    def species(self):
+        """Return the formulas of all species, reactants first."""
+        return [_formula(compound) for _, compound in self.reactants + self.products]
+
+    def positive_solution(self, budget=None):
+        """
+        Find a rational solution with every coefficient at least 1, or None.
+        Substituting x = 1 + z turns this into the feasibility of
+        A z = -A 1 with z >= 0, which is decided exactly by phase-one simplex.
+        """
+        rhs = [-sum(row) for row in self.matrix]
+        z = feasible_point(self.matrix, rhs, self.n_species, budget)
+        if z is None:
+            return None
+        return [1 + value for value in z]
+
+    def diagnose(self, budget=None):
+        """
+        Check the composition matrix for reasons the reaction cannot be balanced.
+        Returns a BalanceDiagnosis, or None if a positive solution exists.
+        """
+        # An element present on only one side can never cancel out
+        one_sided = [element for element, row in zip(self.elements, self.matrix)
+                     if all(a >= 0 for a in row) or all(a <= 0 for a in row)]
+        if CHARGE_ROW in one_sided:
+            one_sided.remove(CHARGE_ROW)
+            charged = [formula for formula, (_, compound) in zip(self.species(), self.reactants + self.products)
+                       if species_charge(compound)]
+            charge_diagnosis = BalanceDiagnosis(
+                BalanceDiagnosis.UNBALANCED_CHARGE, [], charged,
+                message=(f"Net charge is unbalanced: nothing on the other side of the reaction "
+                         f"offsets the charge of {', '.join(charged)}"))
+        else:
+            charge_diagnosis = None
+        if one_sided:
+            return BalanceDiagnosis(
+                BalanceDiagnosis.ONE_SIDED_ELEMENT, one_sided,
+                message=f"Elements appear on only one side of the reaction: {', '.join(one_sided)}")
+        if charge_diagnosis:
+            return charge_diagnosis
+
+        # Full column rank leaves only the all-zero solution
+        basis = self.nullspace(budget)
+        if not basis:
+            elements = [element for element in self.elements if element != CHARGE_ROW]
+            constraints = f"{len(elements)} element constraint{'s' if len(elements) != 1 else ''}"
+            if CHARGE_ROW in self.elements:
+                constraints += " and the charge constraint"
+            verb = "has" if len(self.elements) == 1 else "have"
+            return BalanceDiagnosis(
+                BalanceDiagnosis.TRIVIAL_SOLUTION_ONLY, elements,
+                message=(f"The {constraints} {verb} rank {self.n_species} "
+                         f"for {self.n_species} species; only the all-zero solution exists"))
+
+        if len(basis) == 1:
+            vector = basis[0]
+            if all(v > 0 for v in vector) or all(v < 0 for v in vector):
+                return None
+            sign = 1 if sum(vector) >= 0 else -1
+            stuck = [i for i, v in enumerate(vector) if sign * v <= 0]
+        else:
+            if self.positive_solution(budget) is not None:
+                return None
+            # Species that cannot take part in any non-negative solution
+            stuck = []
+            for i in range(self.n_species):
+                rhs = [-row[i] for row in self.matrix]
+                bounded = [row[:i] + [0] + row[i + 1:] for row in self.matrix]
+                if feasible_point(bounded, rhs, self.n_species, budget) is None:
+                    stuck.append(i)
+
+        formulas = self.species()
+        species = [formulas[i] for i in stuck]
+        elements = []
+        for i in stuck:
+            _, compound = (self.reactants + self.products)[i]
+            elements.extend(e for e in species_composition(compound) if e not in elements)
+        return BalanceDiagnosis(
+            BalanceDiagnosis.NO_POSITIVE_SOLUTION, elements, species,
+            message=(f"No solution gives every species a positive coefficient; "
+                     f"{', '.join(species)} cannot take part in the balanced reaction"))
+
+
+def nullspace(matrix, ncols, budget=None):
+    """
+    Compute a basis of the rational nullspace of an integer matrix.
+    Uses Gaussian elimination over Fractions to reduced row echelon form.
+    Returns a list of basis vectors, each a list of Fractions of length ncols.
+    """
+    rows = [[Fraction(value) for value in row] for row in matrix]
+    pivots = []
+    rank = 0
+
+    for col in range(ncols):
+        # Find a row with a non-zero entry in this column
+        pivot_row = next((r for r in range(rank, len(rows)) if rows[r][col] != 0), None)
+        if pivot_row is None:
+            continue
+        rows[rank], rows[pivot_row] = rows[pivot_row], rows[rank]
+
+        # Normalize the pivot row and eliminate the column everywhere else
+        _charge(budget, len(rows))
+        pivot = rows[rank][col]
+        rows[rank] = [value / pivot for value in rows[rank]]
+        for r in range(len(rows)):
+            if r != rank and rows[r][col] != 0:
+                factor = rows[r][col]
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[rank])]
+
+        pivots.append(col)
+        rank += 1
+        if rank == len(rows):
+            break
+
+    basis = []
+    for free in (c for c in range(ncols) if c not in pivots):
+        vector = [Fraction(0)] * ncols
+        vector[free] = Fraction(1)
+        for r, pivot_col in enumerate(pivots):
+            vector[pivot_col] = -rows[r][free]
+        basis.append(vector)
+    return basis
+
+
+def feasible_point(matrix, rhs, ncols, budget=None):
+    """
+    Find x >= 0 with matrix x = rhs, or return None if there is none.
+    Runs phase one of the simplex method over Fractions with Bland's rule,
+    so the answer is exact and the pivoting cannot cycle.
+    """
+    m = len(matrix)
+    if m == 0:
+        return [Fraction(0)] * ncols
+
+    # Tableau: structural columns, one artificial column per row, right-hand side
+    tableau = []
+    for i, (row, b) in enumerate(zip(matrix, rhs)):
+        sign = -1 if b < 0 else 1
+        artificial = [Fraction(1 if k == i else 0) for k in range(m)]
+        tableau.append([Fraction(sign * a) for a in row] + artificial + [Fraction(sign * b)])
+    basis = [ncols + i for i in range(m)]
+    width = ncols + m
+
+    while True:
+        _charge(budget, m)
+        # Reduced costs of minimizing the sum of the artificial variables
+        entering = None
+        for j in range(width):
+            cost = (1 if j >= ncols else 0) - sum(tableau[i][j] for i in range(m) if basis[i] >= ncols)
+            if cost < 0:
+                entering = j
+                break
+        if entering is None:
+            break
+
+        leaving = None
+        for i in range(m):
+            if tableau[i][entering] > 0:
+                ratio = tableau[i][-1] / tableau[i][entering]
+                if leaving is None or ratio < best or (ratio == best and basis[i] < basis[leaving]):
+                    leaving, best = i, ratio
+
+        pivot = tableau[leaving][entering]
+        tableau[leaving] = [value / pivot for value in tableau[leaving]]
+        for i in range(m):
+            if i != leaving and tableau[i][entering] != 0:
+                factor = tableau[i][entering]
+                tableau[i] = [a - factor * b for a, b in zip(tableau[i], tableau[leaving])]
+        basis[leaving] = entering
+
+    if any(tableau[i][-1] != 0 for i in range(m) if basis[i] >= ncols):
+        return None
+    point = [Fraction(0)] * ncols
+    for i, j in enumerate(basis):
+        if j < ncols:
+            point[j] = tableau[i][-1]
+    return point
+
+
+def to_integer_vector(vector):
+    """
+    Scale a rational vector to the smallest integer vector with the same direction.
+    """
+    lcm = find_lcm([value.denominator for value in vector])
+    integers = [int(value * lcm) for value in vector]
+    gcd = find_gcd([abs(value) for value in integers])
+    if gcd == 0:
+        return integers
+    return [value // gcd for value in integers]
+
+
+def search_coefficients(problem, max_coeff=20, block_size=SEARCH_BLOCK_SIZE, budget=None):
+    """
+    Find the first balancing coefficient vector in lexicographic order.
+    Candidates range over 1..max_coeff per species, in the same order as
+    itertools.product, and are generated as blocks of rows of a 2-D integer
+    array. Each block is checked with one matrix product against the
+    composition matrix. Returns the raw candidate tuple or None.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("NumPy is required for the search balancing mode")
+
+    n = problem.n_species
+    matrix = np.array(problem.matrix, dtype=np.int64).reshape(len(problem.matrix), n)
+    # Place values of each species in the mixed-radix candidate index
+    place = max_coeff ** np.arange(n - 1, -1, -1, dtype=np.int64)
+    total = max_coeff ** n
+
+    for start in range(0, total, block_size):
+        index = np.arange(start, min(start + block_size, total), dtype=np.int64)
+        _charge(budget, len(index))
+        candidates = (index[:, None] // place) % max_coeff + 1
+        residual = candidates @ matrix.T
+        hits = np.flatnonzero(~residual.any(axis=1))
+        if hits.size:
+            return tuple(int(c) for c in candidates[hits[0]])
+    return None
+
+
+def integer_kernel(matrix, ncols, budget=None):
+    """
+    Compute a basis of the integer nullspace lattice of an integer matrix.
+    Integer column operations bring [A; I] to column echelon form (a column
+    Hermite reduction); the identity part of the columns whose A part became
+    zero spans every integer solution, not just a sublattice of them.
+    """
+    m = len(matrix)
+    columns = [[row[j] for row in matrix] + [1 if i == j else 0 for i in range(ncols)]
+               for j in range(ncols)]
+    rank = 0
+    for i in range(m):
+        # Euclid on row i leaves at most one non-zero entry among the remaining columns
+        for j in range(rank + 1, ncols):
+            while columns[j][i] != 0:
+                _charge(budget)
+                if columns[rank][i] == 0 or abs(columns[j][i]) < abs(columns[rank][i]):
+                    columns[rank], columns[j] = columns[j], columns[rank]
+                    continue
+                q = columns[j][i] // columns[rank][i]
+                columns[j] = [a - q * b for a, b in zip(columns[j], columns[rank])]
+        if rank < ncols and columns[rank][i] != 0:
+            rank += 1
+    return [column[m:] for column in columns[rank:]]
+
+
+def lll_reduce(basis, delta=Fraction(3, 4), budget=None):
+    """
+    Reduce an integer lattice basis with the Lenstra-Lenstra-Lovasz algorithm.
+    Arithmetic is exact; the returned vectors are short and nearly orthogonal.
+    """
+    basis = [list(vector) for vector in basis]
+    n = len(basis)
+
+    def dot(u, v):
+        return sum(a * b for a, b in zip(u, v))
+
+    def gram_schmidt():
+        ortho = []
+        mu = [[Fraction(0)] * n for _ in range(n)]
+        for i in range(n):
+            vector = [Fraction(a) for a in basis[i]]
+            for j in range(i):
+                mu[i][j] = dot(basis[i], ortho[j]) / dot(ortho[j], ortho[j])
+                vector = [a - mu[i][j] * b for a, b in zip(vector, ortho[j])]
+            ortho.append(vector)
+        return ortho, mu
+
+    ortho, mu = gram_schmidt()
+    k = 1
+    while k < n:
+        _charge(budget, n)
+        for j in range(k - 1, -1, -1):
+            q = round(mu[k][j])
+            if q:
+                basis[k] = [a - q * b for a, b in zip(basis[k], basis[j])]
+                ortho, mu = gram_schmidt()
+        if dot(ortho[k], ortho[k]) >= (delta - mu[k][k - 1] ** 2) * dot(ortho[k - 1], ortho[k - 1]):
+            k += 1
+        else:
+            basis[k], basis[k - 1] = basis[k - 1], basis[k]
+            ortho, mu = gram_schmidt()
+            k = max(k - 1, 1)
+    return basis
+
+
+def _multipliers(dimension, norm):
+    """Yield every integer vector of the given length whose absolute values sum to norm."""
+    if dimension == 1:
+        yield (norm,)
+        if norm:
+            yield (-norm,)
+        return
+    for head in range(norm + 1):
+        for tail in _multipliers(dimension - 1, norm - head):
+            yield (head,) + tail
+            if head:
+                yield (-head,) + tail
+
+
+def balance_all(reactants, products, timeout=None, max_operations=None, token=None, budget=None):
+    """
+    Return a basis of independent minimal integer balancings of a reaction.
+    Each entry is a tuple of multipliers, one per species (reactants first).
+    A vector may contain zeros or negative entries; positive balancings are
+    integer combinations of these, see enumerate_balancings.
+    Returns a BudgetExceeded result if the budget runs out. Passing a Budget
+    instead of the limits shares it with other calls.
+    """
+    budget = _budget(budget, timeout, max_operations, token)
+    try:
+        return _balance_all(BalanceProblem(reactants, products), budget)
+    except BudgetExceededError as e:
+        return BudgetExceeded(e.reason, budget.operations)
+
+
+def _balance_all(problem, budget=None):
+    """Compute the reduced integer balancing basis of a compiled problem."""
+    kernel = integer_kernel(problem.matrix, problem.n_species, budget)
+    solutions = []
+    for vector in lll_reduce(kernel, budget=budget) if kernel else []:
+        # Orient each vector so that most of its weight is positive
+        if sum(vector) < 0:
+            vector = [-c for c in vector]
+        solutions.append(tuple(vector))
+    return solutions
+
+
+def enumerate_balancings(reactants, products, limit=None, max_norm=12,
+                         timeout=None, max_operations=None, token=None, budget=None):
+    """
+    Lazily yield distinct strictly positive balancings of a reaction.
+    Integer combinations of the balance_all basis are visited in shells of
+    increasing multiplier size up to max_norm; only primitive vectors (gcd 1)
+    are yielded, so no balancing is a multiple of another. At most limit
+    results are produced when limit is given. If the budget (the limits, or
+    a shared Budget) runs out first, the last item yielded is a falsy
+    BudgetExceeded result, so a cut-off enumeration is never mistaken for a
+    finished one.
+    """
+    budget = _budget(budget, timeout, max_operations, token)
+    try:
+        basis = _balance_all(BalanceProblem(reactants, products), budget)
+    except BudgetExceededError as e:
+        yield BudgetExceeded(e.reason, budget.operations)
+        return
+    if not basis:
+        return
+    count = 0
+    for norm in range(1, max_norm + 1):
+        for multipliers in _multipliers(len(basis), norm):
+            try:
+                budget.charge()
+            except BudgetExceededError as e:
+                yield BudgetExceeded(e.reason, budget.operations)
+                return
+            coeffs = [sum(m * vector[i] for m, vector in zip(multipliers, basis))
+                      for i in range(len(basis[0]))]
+            if any(c <= 0 for c in coeffs) or find_gcd(coeffs) != 1:
+                continue
+            yield tuple(coeffs)
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+
+def diagnose_reaction(reactants, products, timeout=None, max_operations=None, token=None, budget=None):
+    """
+    Explain why a reaction given as (coefficient, compound) lists cannot be
+    balanced. Returns a BalanceDiagnosis, None if it can be balanced, or a
+    BudgetExceeded result if the budget (the limits, or a shared Budget)
+    runs out first.
+    """
+    budget = _budget(budget, timeout, max_operations, token)
+    try:
+        return BalanceProblem(reactants, products).diagnose(budget)
+    except BudgetExceededError as e:
+        return BudgetExceeded(e.reason, budget.operations)
+
+
 def is_balanced(reactants, products, coeffs):
     """
     Check if reaction is balanced given lists of (coefficient, formula) and a coefficient vector.
     reactants and products are lists of tuples: (coefficient, compound)
     coeffs: tuple of integers, first part for reactants, second for products.
     """
-    element_set = set()
-    # Extract all elements from both sides of the reaction
-    for _, compound in reactants + products:
-        # Ensure we're accessing the formula attribute correctly
-        if hasattr(compound, 'formula'):
-            formula = compound.formula
-        else:
-            formula = compound
-
-        # Parse the formula to get elements
-        parsed_formula = parse_formula(formula)
-        element_set.update(parsed_formula.keys())
-
-    # Check if each element is balanced on both sides
-    for element in element_set:
-        # Sum the count of each element on the reactant side
-        left = 0
-        for i, (orig_coeff, compound) in enumerate(reactants):
-            if hasattr(compound, 'formula'):
-                formula = compound.formula
-            else:
-                formula = compound
+    return BalanceProblem(reactants, products).is_balanced(coeffs)
 
-            parsed_formula = parse_formula(formula)
-            element_count = parsed_formula.get(element, 0)
-            left += coeffs[i] * element_count * orig_coeff
 
-        # Sum the count of each element on the product side
-        right = 0
-        for j, (orig_coeff, compound) in enumerate(products):
-            if hasattr(compound, 'formula'):
-                formula = compound.formula
-            else:
-                formula = compound
+def balance_reaction(reactants, products, mode="exact", max_coeff=20,
+                     timeout=None, max_operations=None, token=None, budget=None):
+    """
+    Balance a reaction given lists of (coefficient, compound) tuples.
+    Returns a tuple of the smallest positive integer multipliers, one per
+    species (reactants first, then products), or None if the reaction
+    cannot be balanced.
+
+    mode="exact" solves the composition matrix directly with no limit on the
+    coefficients. mode="search" returns the first solution in lexicographic
+    order with every multiplier between 1 and max_coeff.
+
+    timeout (seconds), max_operations and a CancellationToken bound the work;
+    when one of them runs out a falsy BudgetExceeded result is returned.
+    A Budget passed instead is shared with the caller's other calls.
+    """
+    if mode not in ("exact", "search"):
+        raise ValueError(f"Unknown balancing mode: {mode}")
+
+    budget = _budget(budget, timeout, max_operations, token)
+    try:
+        return _balance_problem(BalanceProblem(reactants, products), mode, max_coeff, budget)
+    except BudgetExceededError as e:
+        return BudgetExceeded(e.reason, budget.operations)
+
 
-            parsed_formula = parse_formula(formula)
-            element_count = parsed_formula.get(element, 0)
-            right += coeffs[len(reactants) + j] * element_count * orig_coeff
+def _balance_problem(problem, mode, max_coeff, budget):
+    """Balance a compiled problem, raising BudgetExceededError if the budget runs out."""
+    if problem.n_species == 0:
+        return None
 
-        if left != right:
-            return False
-    return True
+    # Reject unbalanceable equations before any search or elimination work
+    if problem.diagnose(budget) is not None:
+        return None
 
+    if mode == "search":
+        coeffs = search_coefficients(problem, max_coeff, budget=budget)
+        if coeffs is None:
+            return None
+        gcd = find_gcd(coeffs)
+        return tuple(c // gcd for c in coeffs)
 
-def balance_reaction(reactants, products, max_coeff=20):
-    n = len(reactants)
-    m = len(products)
-    total = n + m
+    basis = problem.nullspace(budget)
 
-    for coeffs in itertools.product(range(1, max_coeff + 1), repeat=total):
+    # With several independent solutions, combine them with every free species set to 1
+    vector = [sum(column) for column in zip(*basis)]
+    coeffs = to_integer_vector(vector)
+    if all(c < 0 for c in coeffs):
+        coeffs = [-c for c in coeffs]
+    if any(c <= 0 for c in coeffs):
+        # Fall back to a strictly positive solution of the under-determined system
+        coeffs = to_integer_vector(problem.positive_solution(budget))
+    return tuple(coeffs)
+
+
+def _balance_chunk(chunk, mode, timeout=None, max_operations=None, token=None):
+    """Balance a list of equations, capturing each failure as a message."""
+    results = []
+    for equation in chunk:
+        try:
+            if isinstance(equation, str):
+                reactants, products = parse_equation(equation)
+            else:
+                reactants, products = equation
+            results.append((balance_reaction(reactants, products, mode=mode, timeout=timeout,
+                                             max_operations=max_operations, token=token), None))
+        except Exception as e:
+            results.append((None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def balance_many(equations, workers=None, chunksize=256, mode="exact",
+                 timeout=None, max_operations=None, token=None):
+    """
+    Balance a stream of equations, yielding one (coeffs, error) pair per
+    equation in input order. Each equation is either a string such as
+    'Fe + O2 -> Fe2O3' or a (reactants, products) pair of lists. coeffs is
+    what balance_reaction returns; error is None, or a message when the
+    equation could not be parsed or balanced, so one bad entry never aborts
+    the batch.
+
+    Equations are sent to a process pool in chunks of chunksize, with only a
+    few chunks in flight per worker. workers=1 balances everything in the
+    calling process, deterministically and without a pool.
+
+    timeout and max_operations apply to each equation separately. A
+    CancellationToken stops the batch: in-process it interrupts the current
+    equation, with a pool no further chunks are submitted.
+    """
+    workers = workers or os.cpu_count() or 1
+    equations = iter(equations)
+    chunks = iter(lambda: list(islice(equations, chunksize)), [])
 
-        if is_balanced(reactants, products, coeffs):
-            gcd = find_gcd(coeffs)
-            return tuple(c // gcd for c in coeffs)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _balance_chunk(chunk, mode, timeout, max_operations, token)
+            if token is not None and token.cancelled:
+                return
+        return
 
-    return None
\ No newline at end of file
+    # Imported here so that importing the balancer does not load multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            if token is not None and token.cancelled:
+                break
+            pending.append(pool.submit(_balance_chunk, chunk, mode, timeout, max_operations))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
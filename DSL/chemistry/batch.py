@@ -0,0 +1,66 @@
+"""
+DSL/chemistry/batch.py
+
+Parses whole columns of formula strings (e.g. supplier catalogs) into a
+single NumPy composition matrix, and computes molar masses for every row
+with one dot product.
+"""
+
+from DSL.chemistry.compounds import parse_formula
+from DSL.chemistry.elements import ATOMIC_NUMBERS, atomic_weight
+
+
+def parse_formulas(formulas):
+    """
+    Parse an iterable of formula strings.
+    Returns (counts, element_index, errors):
+      counts         int64 matrix, one row per formula, one column per element present
+      element_index  element symbol -> column, columns in atomic-number order
+      errors         boolean mask of rows whose formula could not be parsed
+    Rows with errors are all zero. Each distinct string is parsed only once.
+    """
+    import numpy as np
+    unique = {}    # formula -> row in the unique table
+    inverse = []
+    for formula in formulas:
+        row = unique.get(formula)
+        if row is None:
+            row = unique[formula] = len(unique)
+        inverse.append(row)
+
+    rows, symbols, values = [], [], []
+    failed = np.zeros(len(unique), dtype=bool)
+    for formula, row in unique.items():
+        try:
+            composition = parse_formula(formula)
+        except (ValueError, TypeError, AttributeError):
+            failed[row] = True
+            continue
+        for element, count in composition.items():
+            rows.append(row)
+            symbols.append(element)
+            values.append(count)
+
+    present = sorted(set(symbols), key=ATOMIC_NUMBERS.__getitem__)
+    element_index = {element: column for column, element in enumerate(present)}
+    table = np.zeros((len(unique), len(present)), dtype=np.int64)
+    if values:
+        columns = np.fromiter((element_index[s] for s in symbols), dtype=np.int64, count=len(symbols))
+        np.add.at(table, (np.asarray(rows, dtype=np.int64), columns), values)
+
+    inverse = np.asarray(inverse, dtype=np.int64)
+    return table[inverse], element_index, failed[inverse]
+
+
+def atomic_weights(element_index):
+    """Return the atomic-weight vector aligned with the columns of element_index."""
+    import numpy as np
+    weights = np.zeros(len(element_index))
+    for element, column in element_index.items():
+        weights[column] = atomic_weight(element)
+    return weights
+
+
+def molar_masses(counts, element_index):
+    """Molar mass of every row of a parse_formulas counts matrix, in g/mol."""
+    return counts @ atomic_weights(element_index)
@@ -0,0 +1,252 @@
+"""
+DSL/chemistry/catalog.py
+
+On-disk compound, element and reaction catalog in a local SQLite file, for
+collections far larger than the COMPOUNDS table. Each thread gets its own
+connection from a small pool, lookups go through a read-through in-process
+LRU, and bulk loads from CSV or JSONL run in batched executemany calls.
+Set CHEMDSL_CATALOG to a catalog file to have elements.get_compound and
+elements.get_element consult it.
+"""
+
+import csv
+import json
+import sqlite3
+import threading
+from DSL.chemistry.balancer import parse_equation
+from DSL.chemistry.compounds import canonical_formula
+from DSL.chemistry.elements import ELEMENTS, ATOMIC_NUMBERS
+from DSL.chemistry.lru import LRUCache
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS compounds ("
+    " id INTEGER PRIMARY KEY, formula TEXT NOT NULL UNIQUE, canonical TEXT NOT NULL,"
+    " name TEXT, state TEXT, classification TEXT, molar_mass REAL, data TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS compounds_canonical ON compounds (canonical)",
+    "CREATE INDEX IF NOT EXISTS compounds_name ON compounds (name COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS compounds_molar_mass ON compounds (molar_mass)",
+    "CREATE TABLE IF NOT EXISTS elements (z INTEGER PRIMARY KEY, symbol TEXT NOT NULL UNIQUE, data TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS reactions (id INTEGER PRIMARY KEY, equation TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE IF NOT EXISTS reaction_species ("
+    " reaction INTEGER NOT NULL REFERENCES reactions (id), canonical TEXT NOT NULL, side INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS reaction_species_canonical ON reaction_species (canonical)",
+)
+
+# Statements are fixed strings, so sqlite3 prepares each once per connection and reuses it
+_INSERT_COMPOUND = ("INSERT OR REPLACE INTO compounds (formula, canonical, name, state, classification, molar_mass, data)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)")
+_INSERT_ELEMENT = "INSERT OR REPLACE INTO elements (z, symbol, data) VALUES (?, ?, ?)"
+_INSERT_REACTION = "INSERT OR IGNORE INTO reactions (equation) VALUES (?)"
+_REACTION_ID = "SELECT id FROM reactions WHERE equation = ?"
+_INSERT_SPECIES = "INSERT INTO reaction_species (reaction, canonical, side) VALUES (?, ?, ?)"
+_COMPOUND_BY_FORMULA = "SELECT data FROM compounds WHERE formula = ?"
+_COMPOUND_BY_CANONICAL = "SELECT data FROM compounds WHERE canonical = ? ORDER BY id LIMIT 1"
+_COMPOUNDS_BY_MASS = "SELECT data FROM compounds WHERE molar_mass BETWEEN ? AND ? ORDER BY molar_mass LIMIT ?"
+_ELEMENT_BY_SYMBOL = "SELECT data FROM elements WHERE symbol = ?"
+_REACTIONS_OF = ("SELECT DISTINCT r.equation FROM reaction_species s JOIN reactions r ON r.id = s.reaction"
+                 " WHERE s.canonical = ? ORDER BY r.id")
+
+# CSV columns read as numbers, and columns holding ';'-separated lists
+NUMERIC_COLUMNS = ('molar_mass', 'density', 'melting_point', 'boiling_point')
+LIST_COLUMNS = ('common_uses', 'hazards', 'production_methods', 'reactions')
+
+
+def _species(equation):
+    """
+    Yield (formula, side) for each species of 'A + B -> C', side 0 for
+    reactants and 1 for products. Charges such as 'Ca^2+' stay intact.
+    Raises ValueError for a malformed equation.
+    """
+    for side, terms in enumerate(parse_equation(equation)):
+        for _, formula in terms:
+            yield formula, side
+
+
+def csv_record(row):
+    """Convert one CSV row to a record: numeric columns to float, list columns split on ';'."""
+    record = {}
+    for column, value in row.items():
+        if value is None or value == '':
+            continue
+        if column in NUMERIC_COLUMNS:
+            try:
+                value = float(value)
+            except ValueError:
+                pass
+        elif column in LIST_COLUMNS:
+            value = [item.strip() for item in value.split(';') if item.strip()]
+        record[column] = value
+    return record
+
+
+def read_csv(path):
+    """Yield the compound records of a CSV file with a header row."""
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield csv_record(row)
+
+
+def read_jsonl(path):
+    """Yield the compound records of a file with one JSON record per line."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class Catalog(LRUCache):
+    """
+    SQLite-backed catalog of compound and element records (dicts shaped
+    like the COMPOUNDS and ELEMENTS entries) and reaction equations.
+    maxsize bounds the in-process LRU of decoded records; hits and misses
+    count lookups answered by it or read from the database.
+    """
+
+    def __init__(self, path, maxsize=4096):
+        super().__init__(maxsize)
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        db = self._connection()
+        db.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            db.execute(statement)
+        db.commit()
+
+    def __repr__(self):
+        return f"Catalog({self.path!r}, cached={len(self._entries)}, hits={self.hits}, misses={self.misses})"
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM compounds").fetchone()[0]
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use."""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256)
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+            with self._lock:
+                self._connections.append(db)
+        return db
+
+    def _cached(self, key, query, params):
+        """Read-through lookup: the LRU first, then one prepared query. Returns a record or None."""
+        found, record = self.lookup(key)
+        if found:
+            return record
+        row = self._connection().execute(query, params).fetchone()
+        if row is None:
+            return None
+        record = json.loads(row[0])
+        self.store(key, record)
+        return record
+
+    def get_compound(self, formula):
+        """
+        Get the record of a compound, matching any spelling of its
+        composition. Raises ValueError if the catalog has no such compound.
+        """
+        record = self._cached(('compound', formula), _COMPOUND_BY_FORMULA, (formula,))
+        if record is None:
+            try:
+                canonical = canonical_formula(formula)
+            except ValueError:
+                canonical = None
+            if canonical is not None:
+                record = self._cached(('canonical', canonical), _COMPOUND_BY_CANONICAL, (canonical,))
+        if record is None:
+            raise ValueError(f"Unknown compound formula: {formula}")
+        return record
+
+    def get_element(self, symbol):
+        """Get the record of an element. Raises ValueError if the catalog has none."""
+        record = self._cached(('element', symbol), _ELEMENT_BY_SYMBOL, (symbol,))
+        if record is None:
+            raise ValueError(f"Unknown element symbol: {symbol}")
+        return record
+
+    def compounds_by_mass(self, low, high, limit=100):
+        """Records with molar mass in [low, high], lightest first, via the molar-mass index."""
+        rows = self._connection().execute(_COMPOUNDS_BY_MASS, (low, high, limit)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def reactions_of(self, formula):
+        """Equations that involve a compound (any spelling) as reactant or product."""
+        rows = self._connection().execute(_REACTIONS_OF, (canonical_formula(formula),)).fetchall()
+        return [row[0] for row in rows]
+
+    def load_compounds(self, records, batch_size=10000):
+        """
+        Bulk-load compound records (dicts with at least a 'formula'), replacing
+        records with the same formula. Rows go in with executemany, batch_size
+        at a time, in one transaction. Records whose formula cannot be parsed
+        are skipped. Returns the number of records loaded.
+        """
+        db = self._connection()
+        loaded = 0
+        batch = []
+        with db:
+            for record in records:
+                formula = record.get('formula')
+                try:
+                    canonical = canonical_formula(formula)
+                except (ValueError, TypeError):
+                    continue
+                batch.append((formula, canonical, record.get('name'), record.get('state'),
+                              record.get('classification'), record.get('molar_mass'), json.dumps(record)))
+                if len(batch) >= batch_size:
+                    db.executemany(_INSERT_COMPOUND, batch)
+                    loaded += len(batch)
+                    batch = []
+            db.executemany(_INSERT_COMPOUND, batch)
+            loaded += len(batch)
+        self.clear()
+        return loaded
+
+    def load_csv(self, path, batch_size=10000):
+        """Bulk-load compounds from a CSV file with a header row (see NUMERIC_COLUMNS and LIST_COLUMNS)."""
+        return self.load_compounds(read_csv(path), batch_size)
+
+    def load_jsonl(self, path, batch_size=10000):
+        """Bulk-load compounds from a file with one JSON record per line."""
+        return self.load_compounds(read_jsonl(path), batch_size)
+
+    def load_elements(self, elements=ELEMENTS):
+        """Load element records (symbol -> record) and their common reactions."""
+        db = self._connection()
+        with db:
+            db.executemany(_INSERT_ELEMENT, [(ATOMIC_NUMBERS[symbol], symbol, json.dumps(dict(record)))
+                                             for symbol, record in elements.items()])
+        self.load_reactions(equation for record in elements.values()
+                            for equation in record.get('common_reactions', []))
+        self.clear()
+
+    def load_reactions(self, equations):
+        """
+        Load reaction equations such as '2H2 + O2 -> 2H2O' and index their
+        species by canonical formula. Equations already present, or with an
+        unparseable species, are skipped. Returns the number added.
+        """
+        db = self._connection()
+        added = 0
+        with db:
+            for equation in equations:
+                try:
+                    species = [(canonical_formula(formula), side) for formula, side in _species(equation)]
+                except ValueError:
+                    continue
+                if db.execute(_INSERT_REACTION, (equation,)).rowcount == 0:
+                    continue
+                reaction = db.execute(_REACTION_ID, (equation,)).fetchone()[0]
+                db.executemany(_INSERT_SPECIES, [(reaction, canonical, side) for canonical, side in species])
+                added += 1
+        return added
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._lock:
+            for db in self._connections:
+                db.close()
+            self._connections.clear()
+        self._local = threading.local()
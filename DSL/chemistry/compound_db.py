@@ -0,0 +1,222 @@
+"""
+DSL/chemistry/compound_db.py
+
+Indexed compound database. Every compound gets a row number; element
+membership, state and classification words are kept as bitsets over rows
+(Python ints, so combining filters is a bitwise AND), and molar masses are
+kept sorted so a mass range is two bisections. A small planner starts from
+the most selective filter and checks the rest against it.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from DSL.chemistry.compounds import composition_of
+from DSL.chemistry.elements import COMPOUNDS, atomic_weight
+
+# States recognised in a compound's 'state' text
+STATES = ('solid', 'liquid', 'gas', 'aqueous')
+
+# Mass comparison -> (bisect function, which end of the range it bounds)
+_MASS_BOUNDS = {
+    '>': (bisect_right, 'low'),
+    '>=': (bisect_left, 'low'),
+    '<': (bisect_left, 'high'),
+    '<=': (bisect_right, 'high'),
+}
+
+
+def _words(text):
+    """Lower-case words of a free-text field, for the word indexes."""
+    return set(re.findall(r"[a-z0-9]+", str(text).lower()))
+
+
+def _rows(bits):
+    """Yield the row numbers set in a bitset, in increasing order."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def _count(bits):
+    """Number of rows in a bitset."""
+    return bin(bits).count('1')
+
+
+def _bitset(rows, size):
+    """Build the bitset of some rows out of size in one pass, through a byte buffer."""
+    buffer = bytearray((size + 7) // 8)
+    for row in rows:
+        buffer[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+class CompoundDB:
+    """
+    Compound records (dicts shaped like the COMPOUNDS entries) with
+    secondary indexes on elements, state, classification and molar mass.
+    The initial compounds are indexed in bulk; add() indexes one more.
+    """
+
+    def __init__(self, compounds=None):
+        self.formulas = []
+        self.records = []
+        self._masses = []           # every molar mass, sorted
+        self._mass_rows = []        # row of each entry in _masses
+        self._by_element = {}       # element -> bitset of rows containing it
+        self._by_state = {}         # state -> bitset
+        self._by_class = {}         # classification word -> bitset
+        self._all = 0
+        if compounds:
+            self._build(compounds)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __repr__(self):
+        return f"CompoundDB({len(self)} compounds)"
+
+    @staticmethod
+    def _prepare(formula, record):
+        """Return (record, composition, mass) for a new row, filling in its formula and molar mass."""
+        record = dict(record or {})
+        composition = composition_of(formula)
+        mass = record.get('molar_mass')
+        if mass is None:
+            mass = record['molar_mass'] = sum(atomic_weight(e) * n for e, n in composition.items())
+        record.setdefault('formula', formula)
+        return record, composition, mass
+
+    @staticmethod
+    def _index_keys(record, composition):
+        """Yield (index attribute, key) for every secondary index entry of a row."""
+        for element in composition:
+            yield '_by_element', element
+        for state in _words(record.get('state', '')) & set(STATES):
+            yield '_by_state', state
+        for word in _words(record.get('classification', '')):
+            yield '_by_class', word
+
+    def _build(self, compounds):
+        """
+        Index many compounds at once: the masses are sorted once and each
+        bitset is built once from its row list, instead of one list insert
+        and one big-int rewrite per compound.
+        """
+        members = {}
+        by_mass = []
+        for formula, record in compounds.items():
+            record, composition, mass = self._prepare(formula, record)
+            row = len(self.records)
+            self.formulas.append(formula)
+            self.records.append(record)
+            by_mass.append((mass, row))
+            for key in self._index_keys(record, composition):
+                members.setdefault(key, []).append(row)
+
+        by_mass.sort()
+        self._masses = [mass for mass, _ in by_mass]
+        self._mass_rows = [row for _, row in by_mass]
+        size = len(self.records)
+        self._all = (1 << size) - 1
+        for (index, key), rows in members.items():
+            getattr(self, index)[key] = _bitset(rows, size)
+
+    def add(self, formula, record=None):
+        """Add a compound and index it. Returns its row number."""
+        record, composition, mass = self._prepare(formula, record)
+        row = len(self.records)
+        bit = 1 << row
+        self.formulas.append(formula)
+        self.records.append(record)
+        self._all |= bit
+        for index, key in self._index_keys(record, composition):
+            index = getattr(self, index)
+            index[key] = index.get(key, 0) | bit
+        i = bisect_right(self._masses, mass)
+        self._masses.insert(i, mass)
+        self._mass_rows.insert(i, row)
+        return row
+
+    def _mass_span(self, mass):
+        """Turn [(op, value), ...] mass comparisons into a slice [low, high) of _masses."""
+        low, high = 0, len(self._masses)
+        for op, value in mass:
+            if op not in _MASS_BOUNDS:
+                raise ValueError(f"Unknown mass comparison: {op}. Use <, <=, > or >=.")
+            search, end = _MASS_BOUNDS[op]
+            if end == 'low':
+                low = max(low, search(self._masses, value))
+            else:
+                high = min(high, search(self._masses, value))
+        return low, max(low, high)
+
+    def plan(self, elements=(), state=None, classification=None, mass=()):
+        """
+        Resolve every filter to its index probe and order them by estimated
+        size. Returns a list of (size, description, bitset or mass span),
+        smallest first; an empty filter list means a full scan.
+        """
+        probes = []
+        for element in elements:
+            probes.append((self._by_element.get(element, 0), f"element {element}"))
+        if state is not None:
+            state = state.lower()
+            if state not in STATES:
+                raise ValueError(f"Unknown state: {state}. Use {', '.join(STATES)}.")
+            probes.append((self._by_state.get(state, 0), f"state {state}"))
+        if classification is not None:
+            for word in sorted(_words(classification)):
+                probes.append((self._by_class.get(word, 0), f"classification '{word}'"))
+        steps = [(_count(bits), description, bits) for bits, description in probes]
+        if mass:
+            low, high = self._mass_span(mass)
+            bounds = " and ".join(f"{op} {value}" for op, value in mass)
+            steps.append((high - low, f"molar mass {bounds}", (low, high)))
+        steps.sort(key=lambda step: step[0])
+        return steps
+
+    def query(self, elements=(), state=None, classification=None, mass=()):
+        """
+        Return the (formula, record) pairs that contain every element in
+        elements, match state ('solid', 'liquid', 'gas' or 'aqueous'),
+        contain every word of classification, and satisfy every (op, value)
+        molar-mass comparison in mass. Results are sorted by molar mass.
+        """
+        steps = self.plan(elements, state, classification, mass)
+        bitsets = [probe for _, _, probe in steps if isinstance(probe, int)]
+        span = next((probe for _, _, probe in steps if isinstance(probe, tuple)), None)
+
+        selected = self._all
+        for bits in bitsets:
+            selected &= bits
+            if not selected:
+                return []
+        if span is not None and (not bitsets or span[1] - span[0] <= _count(selected)):
+            # The mass range is the narrowest probe: walk it and test the bitset
+            rows = [row for row in self._mass_rows[span[0]:span[1]] if selected >> row & 1]
+        else:
+            rows = sorted(_rows(selected), key=lambda row: self.records[row]['molar_mass'])
+            if span is not None:
+                in_span = set(self._mass_rows[span[0]:span[1]])
+                rows = [row for row in rows if row in in_span]
+        return [(self.formulas[row], self.records[row]) for row in rows]
+
+    def explain(self, elements=(), state=None, classification=None, mass=()):
+        """Describe the plan query() would follow, one probe per line with its size."""
+        steps = self.plan(elements, state, classification, mass)
+        if not steps:
+            return f"full scan ({len(self)} rows)"
+        return "\n".join(f"{size:>6}  {description}" for size, description, _ in steps)
+
+
+# Index over COMPOUNDS, built on first use
+_default_db = None
+
+
+def compound_db():
+    """Return the shared CompoundDB over the COMPOUNDS table."""
+    global _default_db
+    if _default_db is None:
+        _default_db = CompoundDB(COMPOUNDS)
+    return _default_db
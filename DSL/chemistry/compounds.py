@@ -1,20 +1,93 @@
 """
 DSL/chemistry/compounds.py
 
-Defines a Compound class for representing chemical compounds and provides
-a basic formula parser.
+Defines a Compound class for representing chemical compounds and ions and
+provides a basic formula parser.
 """
 
+import hashlib
 import re
-from DSL.chemistry.elements import ELEMENTS
+import weakref
+from types import MappingProxyType
+from DSL.chemistry.elements import ATOMIC_NUMBERS, atomic_weight
+from DSL.chemistry.lru import LRUCache
+
+# Spellings accepted for the electron as an explicit species
+ELECTRON_FORMULAS = ('e^-', 'e-', 'e')
+
+
+def is_electron(formula: str) -> bool:
+    """Check whether a formula string denotes an electron."""
+    return formula.strip() in ELECTRON_FORMULAS
+
+
+def split_charge(formula: str):
+    """
+    Split ionic charge notation off a formula.
+    "Fe^2+" -> ("Fe", 2), "MnO4^-" -> ("MnO4", -1), "H2O" -> ("H2O", 0).
+    An electron ("e^-", "e-" or "e") gives ("e", -1).
+    """
+    formula = formula.strip()
+    if is_electron(formula):
+        return 'e', -1
+    if '^' not in formula:
+        return formula, 0
+    match = re.fullmatch(r'(.*?)\^(\d*)([+-])', formula)
+    if not match:
+        return formula, 0
+    magnitude = int(match.group(2)) if match.group(2) else 1
+    return match.group(1), magnitude if match.group(3) == '+' else -magnitude
+
+
+def format_charge(charge: int) -> str:
+    """Format a charge as caret notation, e.g. 2 -> "^2+", -1 -> "^-", 0 -> ""."""
+    if charge == 0:
+        return ""
+    magnitude = abs(charge)
+    return f"^{magnitude if magnitude != 1 else ''}{'+' if charge > 0 else '-'}"
+
 
 class Compound:
-    def __init__(self, formula: str):
-        self.formula = formula
+    """
+    An immutable chemical species, interned by formula: Compound("H2O")
+    returns the same object for as long as any reference to it is alive.
+    Compounds are hashable and compare equal to each other and to their
+    formula string. Different spellings of one composition, such as
+    "C2H5OH" and "CH3OCH3", stay distinct compounds that keep their
+    written formula; canonical_formula() relates them.
+    """
+
+    __slots__ = ('formula', 'composition', 'charge', '_molar_mass', '_vector', '__weakref__')
+
+    # Live compounds by formula; entries vanish when the last reference goes
+    _registry = weakref.WeakValueDictionary()
+
+    def __new__(cls, formula: str):
+        formula = formula.strip()
+        compound = cls._registry.get(formula)
+        if compound is not None:
+            return compound
+
+        compound = super().__new__(cls)
+        set_attribute = object.__setattr__
+        set_attribute(compound, 'formula', formula)
         try:
-            self.composition = parse_formula(formula)  # Dict of element: count
+            set_attribute(compound, 'composition', composition_of(formula))  # Read-only mapping of element: count
         except ValueError as e:
             raise ValueError(f"Invalid compound formula '{formula}': {str(e)}")
+        set_attribute(compound, 'charge', split_charge(formula)[1])  # Net ionic charge, e.g. -1 for MnO4^-
+        set_attribute(compound, '_molar_mass', None)
+        set_attribute(compound, '_vector', None)
+        return cls._registry.setdefault(formula, compound)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Compound is immutable; cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Compound is immutable; cannot delete '{name}'")
+
+    def __reduce__(self):
+        return Compound, (self.formula,)
 
     def __repr__(self):
         return f"Compound('{self.formula}')"
@@ -29,21 +102,75 @@ class Compound:
             return self.formula == other.formula
         return False
 
+    def __hash__(self):
+        # Hash like the formula string, since a compound equals its formula
+        return hash(self.formula)
+
+    @classmethod
+    def from_vector(cls, vector):
+        """Build the compound for a composition vector, with its formula in Hill order."""
+        # Imported here so that NumPy is only loaded by code that uses vectors
+        from DSL.chemistry import vectors
+        return cls(hill_formula(*vectors.from_vector(vector)))
+
+    @property
+    def vector(self):
+        """
+        The composition as a dense vector indexed by atomic number, with the
+        charge in slot 0 (see vectors.py). Computed once; read-only under NumPy.
+        """
+        if self._vector is None:
+            from DSL.chemistry import vectors
+            vector = vectors.to_vector(self.composition, self.charge)
+            if vectors.numpy() is not None:
+                vector.flags.writeable = False
+            object.__setattr__(self, '_vector', vector)
+        return self._vector
+
     def molar_mass(self):
-        """Calculate the molar mass of the compound based on its composition."""
-        mass = 0
-        for element, count in self.composition.items():
-            if element in ELEMENTS:
-                mass += ELEMENTS[element]['atomic_weight'] * count
-            else:
-                raise ValueError(f"Unknown element: {element}")
-        return mass
+        """Calculate the molar mass of the compound based on its composition (cached)."""
+        if self._molar_mass is None:
+            mass = 0
+            for element, count in self.composition.items():
+                mass += atomic_weight(element) * count
+            object.__setattr__(self, '_molar_mass', mass)
+        return self._molar_mass
+
+
+# Value of each digit, for reading subscripts without slicing
+_DIGITS = {str(d): d for d in range(10)}
+# Closing bracket -> the bracket that opens it
+_CLOSERS = {')': '(', ']': '['}
+# Characters that start a hydrate segment, as in "CuSO4·5H2O"
+_HYDRATE_DOTS = ('·', '.', '*')
+
+
+def _unmatched_paren(formula, start, depth):
+    """
+    Whether the outermost of depth open '(' groups is never closed in
+    formula[start:]. The recursive parser this one replaced checked a group
+    for its closing parenthesis before reading its contents, so an unclosed
+    group is reported ahead of an unknown element inside it.
+    """
+    for c in formula[start:]:
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+            if depth == 0:
+                return False
+    return True
 
 
 def parse_formula(formula: str) -> dict:
     """
     Parse a chemical formula string into a dictionary of elements and their counts.
-    Handles nested parentheses, e.g., "Ca(NO3)2" or "H2O" or "((CH3)3C)2NH".
+    Handles nested groups and hydrates, e.g., "Ca(NO3)2", "K4[Fe(CN)6]",
+    "((CH3)3C)2NH" or "CuSO4·5H2O".
+    The formula is scanned once, left to right, by index: subscripts are
+    accumulated digit by digit and nothing is sliced except two-letter
+    symbols. Each open group keeps its own counts on a stack and is merged
+    into its parent, scaled, when it closes.
     """
     # If the formula is already a Compound object, extract its formula string
     if hasattr(formula, 'formula'):
@@ -54,76 +181,188 @@ def parse_formula(formula: str) -> dict:
     if not formula:
         raise ValueError("Empty formula")
 
-    # Simple regex for element counting, works for basic formulas
-    composition = {}
-
-    # Handle parentheses recursively
-    def parse_part(part, multiplier=1):
-        # Match elements with optional subscripts
-        i = 0
-        while i < len(part):
-            # Match an element (capital letter followed by optional lowercase)
-            if i < len(part) and 'A' <= part[i] <= 'Z':
-                # Get the element symbol
-                symbol = part[i]
+    # Charge notation carries no atoms; an electron has none at all
+    if '^' in formula or formula in ELECTRON_FORMULAS:
+        formula, _ = split_charge(formula)
+        if formula == 'e':
+            return {}
+
+    digits = _DIGITS
+    symbols = ATOMIC_NUMBERS
+    text = formula + ' '    # sentinel, so looking one character ahead never runs off the end
+    end = len(formula)
+    counts = {}             # counts of the innermost open group (or the current hydrate segment)
+    stack = []              # (parent counts, opening bracket) of each open group
+    composition = None      # finished hydrate segments, once a hydrate dot is seen
+    coefficient = 1         # multiplier of the current hydrate segment
+    i = 0
+
+    while i < end:
+        c = text[i]
+        if 'A' <= c <= 'Z':
+            i += 1
+            following = text[i]
+            if 'a' <= following <= 'z':
+                c += following
+                i += 1
+                following = text[i]
+            if c not in symbols:
+                open_parens = sum(1 for _, opener in stack if opener == '(')
+                if open_parens and _unmatched_paren(formula, i, open_parens):
+                    raise ValueError("Mismatched parentheses in formula")
+                raise ValueError(f"Unknown element symbol: {c}")
+            if following in digits:
+                count = digits[following]
                 i += 1
-                # Check for lowercase letter
-                if i < len(part) and 'a' <= part[i] <= 'z':
-                    symbol += part[i]
+                following = text[i]
+                while following in digits:
+                    count = count * 10 + digits[following]
                     i += 1
+                    following = text[i]
+                counts[c] = counts.get(c, 0) + count
+            else:
+                counts[c] = counts.get(c, 0) + 1
+        elif c == '(' or c == '[':
+            stack.append((counts, c))
+            counts = {}
+            i += 1
+        elif c in _CLOSERS:
+            i += 1
+            if not stack:
+                continue  # A stray closer is skipped like any other character
+            group = counts
+            counts, opener = stack.pop()
+            if opener != _CLOSERS[c]:
+                raise ValueError("Mismatched parentheses in formula")
+            following = text[i]
+            if following in digits:
+                factor = digits[following]
+                i += 1
+                following = text[i]
+                while following in digits:
+                    factor = factor * 10 + digits[following]
+                    i += 1
+                    following = text[i]
+                for element, n in group.items():
+                    counts[element] = counts.get(element, 0) + n * factor
+            else:
+                for element, n in group.items():
+                    counts[element] = counts.get(element, 0) + n
+        elif c in _HYDRATE_DOTS:
+            if stack:
+                raise ValueError("Mismatched parentheses in formula")
+            if composition is None:
+                composition = {}
+            for element, n in counts.items():
+                composition[element] = composition.get(element, 0) + n * coefficient
+            counts = {}
+            i += 1
+            coefficient = 0
+            while text[i] in digits:
+                coefficient = coefficient * 10 + digits[text[i]]
+                i += 1
+            coefficient = coefficient or 1
+        else:
+            i += 1  # Skip any other character
 
-                # Check if the element is valid
-                if symbol not in ELEMENTS:
-                    raise ValueError(f"Unknown element symbol: {symbol}")
+    if stack:
+        raise ValueError("Mismatched parentheses in formula")
+    if composition is None:
+        return counts
+    for element, n in counts.items():
+        composition[element] = composition.get(element, 0) + n * coefficient
+    return composition
 
-                # Get the subscript
-                count = ""
-                while i < len(part) and '0' <= part[i] <= '9':
-                    count += part[i]
-                    i += 1
 
-                # Convert count to integer, default to 1 if no count
-                count = int(count) if count else 1
-                count *= multiplier
+class FormulaMemo(LRUCache):
+    """
+    Bounded LRU memo of parse_formula shared by the whole process.
+    Values are read-only MappingProxyType views, so one cached composition
+    can be handed to every caller safely. Invalid formulas are not cached;
+    they raise the same ValueError on every lookup. hits and misses count
+    lookups answered from the memo or parsed anew.
+    """
 
-                # Add to composition
-                composition[symbol] = composition.get(symbol, 0) + count
+    def __init__(self, maxsize=65536):
+        super().__init__(maxsize)
 
-            # Handle parentheses
-            elif i < len(part) and part[i] == '(':
-                # Find the matching closing parenthesis
-                paren_level = 1
-                start = i + 1
-                i += 1
-                while i < len(part) and paren_level > 0:
-                    if part[i] == '(':
-                        paren_level += 1
-                    elif part[i] == ')':
-                        paren_level -= 1
-                    i += 1
+    def __call__(self, formula):
+        """Return the read-only composition of a formula string or Compound."""
+        if hasattr(formula, 'formula'):
+            formula = formula.formula
+        found, composition = self.lookup(formula)
+        if found:
+            return composition
+        composition = MappingProxyType(parse_formula(formula))
+        self.store(formula, composition)
+        return composition
 
-                if paren_level != 0:
-                    raise ValueError("Mismatched parentheses in formula")
 
-                # Get the subscript for the parenthesized group
-                group_multiplier = ""
-                while i < len(part) and '0' <= part[i] <= '9':
-                    group_multiplier += part[i]
-                    i += 1
+# Shared memo used by Compound, the balancer and the reaction predictor
+formula_memo = FormulaMemo()
 
-                group_multiplier = int(group_multiplier) if group_multiplier else 1
-                group_multiplier *= multiplier
 
-                # Parse the contents of the parentheses
-                parse_part(part[start:i-1], group_multiplier)
+def composition_of(formula):
+    """
+    Memoized parse_formula: return the composition of a formula as a
+    read-only mapping shared between callers. Use parse_formula for a
+    private, mutable dict.
+    """
+    return formula_memo(formula)
 
-            else:
-                # Skip any other character
-                i += 1
 
-    # Parse the entire formula
-    parse_part(formula)
+def hill_formula(composition, charge=0):
+    """
+    Write a composition in Hill order: C, then H, then the other elements
+    alphabetically; without carbon, every element alphabetically. Any charge
+    is appended in caret notation. {'C': 2, 'H': 6, 'O': 1} -> "C2H6O".
+    """
+    if not any(composition.values()):
+        return ELECTRON_FORMULAS[0] if charge == -1 else format_charge(charge)
+    if composition.get('C'):
+        order = ['C'] + (['H'] if composition.get('H') else []) + sorted(e for e in composition if e not in ('C', 'H'))
+    else:
+        order = sorted(composition)
+    formula = "".join(f"{e}{composition[e] if composition[e] != 1 else ''}" for e in order if composition[e])
+    return formula + format_charge(charge)
+
+
+def canonical_formula(formula):
+    """
+    Canonical Hill-order spelling of a formula, so that every way of writing
+    the same composition maps to one string:
+    "C2H5OH", "CH3CH2OH" and "HOCH2CH3" all give "C2H6O".
+    """
+    if hasattr(formula, 'formula'):
+        formula = formula.formula
+    return hill_formula(composition_of(formula), split_charge(formula)[1])
+
 
+def composition_hash(composition, charge=0):
+    """
+    Stable 64-bit hash of a composition (and charge): the BLAKE2b digest of
+    its Hill formula. Unlike hash(), it is the same in every process and can
+    be stored.
+    """
+    digest = hashlib.blake2b(hill_formula(composition, charge).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def formula_hash(formula):
+    """Stable 64-bit composition hash of a formula string or Compound."""
+    if hasattr(formula, 'formula'):
+        formula = formula.formula
+    return composition_hash(composition_of(formula), split_charge(formula)[1])
 
 
-    return composition
\ No newline at end of file
+def unique_formulas(formulas):
+    """
+    Yield the first formula of each distinct composition, in input order,
+    in one pass: only a set of 64-bit hashes is kept, not the formulas.
+    """
+    seen = set()
+    for formula in formulas:
+        key = formula_hash(formula)
+        if key not in seen:
+            seen.add(key)
+            yield formula
@@ -0,0 +1,109 @@
+"""
+DSL/chemistry/elemental_analysis.py
+
+Inverse elemental analysis: recovers candidate empirical and molecular
+formulas from measured mass percentages. Candidate atom counts are laid out
+as a grid around the measured mole ratios (scaled by 1..max_multiplier and
+rounded both ways), and the whole grid is scored at once with NumPy.
+"""
+
+from itertools import product
+from DSL.chemistry.compounds import hill_formula
+from DSL.chemistry.elements import ELEMENTS, atomic_weight
+
+
+def _candidate_grid(ratios, max_multiplier):
+    """
+    All reduced count vectors obtained by scaling the mole ratios (smallest
+    = 1) by 1..max_multiplier and rounding each element down or up.
+    """
+    import numpy as np
+    multipliers = np.arange(1, max_multiplier + 1)[:, None]
+    scaled = multipliers * ratios[None, :]
+    offsets = np.array(list(product((0, 1), repeat=len(ratios))))
+    grid = (np.floor(scaled)[:, None, :] + offsets[None, :, :]).reshape(-1, len(ratios)).astype(np.int64)
+    # Every analysed element must be present
+    grid = grid[(grid > 0).all(axis=1)]
+    # Keep each formula once, in lowest terms
+    grid //= np.gcd.reduce(grid, axis=1)[:, None]
+    return np.unique(grid, axis=0)
+
+
+def score_candidates(counts, weights, percentages):
+    """
+    Vectorized scoring kernel: RMS deviation (in percentage points) between
+    the measured percentages and those implied by each row of counts.
+    """
+    import numpy as np
+    masses = counts * weights[None, :]
+    predicted = 100 * masses / masses.sum(axis=1, keepdims=True)
+    return np.sqrt(((predicted - percentages[None, :]) ** 2).mean(axis=1))
+
+
+def formulas_from_percentages(percentages, molar_mass=None, limit=5, max_multiplier=12,
+                              max_error=1.0, mass_tolerance=0.02):
+    """
+    Rank candidate formulas for mass percentages such as {'C': 40.0, 'H': 6.7, 'O': 53.3}.
+    Percentages are normalized to sum to 100. Returns up to limit tuples
+    (empirical, molecular, error) sorted by error (RMS deviation in
+    percentage points, at most max_error), then by formula size.
+    When molar_mass is given, molecular is the empirical formula scaled to
+    the nearest whole multiple of it, and candidates whose molecular mass is
+    off by more than mass_tolerance (relative) are dropped; otherwise
+    molecular is None.
+    """
+    import numpy as np
+    elements = list(percentages)
+    if not elements:
+        raise ValueError("No percentages given")
+    for element in elements:
+        if element not in ELEMENTS:
+            raise ValueError(f"Unknown element symbol: {element}")
+    measured = np.array([float(percentages[e]) for e in elements])
+    if (measured <= 0).any():
+        raise ValueError("Mass percentages must be positive")
+    measured *= 100 / measured.sum()
+    weights = np.array([atomic_weight(e) for e in elements])
+
+    moles = measured / weights
+    grid = _candidate_grid(moles / moles.min(), max_multiplier)
+    errors = score_candidates(grid, weights, measured)
+
+    keep = errors <= max_error
+    grid, errors = grid[keep], errors[keep]
+    empirical_masses = grid @ weights
+    multiples = np.ones(len(grid), dtype=np.int64)
+    if molar_mass is not None:
+        multiples = np.maximum(1, np.rint(molar_mass / empirical_masses)).astype(np.int64)
+        mass_errors = np.abs(multiples * empirical_masses - molar_mass) / molar_mass
+        keep = mass_errors <= mass_tolerance
+        grid, errors, multiples = grid[keep], errors[keep], multiples[keep]
+
+    order = np.lexsort((grid.sum(axis=1), errors))[:limit]
+    results = []
+    for row in order:
+        counts = dict(zip(elements, grid[row].tolist()))
+        empirical = hill_formula(counts)
+        molecular = None
+        if molar_mass is not None:
+            molecular = hill_formula({e: n * int(multiples[row]) for e, n in counts.items()})
+        results.append((empirical, molecular, float(errors[row])))
+    return results
+
+
+def formulas_from_percentages_many(analyses, molar_masses=None, **options):
+    """
+    Batch form of formulas_from_percentages for a sequence of percentage
+    mappings (and optionally a parallel sequence of molar masses, None
+    entries allowed). Returns one result per analysis; an analysis that
+    cannot be processed yields its ValueError instead of a list.
+    """
+    analyses = list(analyses)
+    molar_masses = list(molar_masses) if molar_masses is not None else [None] * len(analyses)
+    results = []
+    for percentages, molar_mass in zip(analyses, molar_masses):
+        try:
+            results.append(formulas_from_percentages(percentages, molar_mass, **options))
+        except ValueError as e:
+            results.append(e)
+    return results
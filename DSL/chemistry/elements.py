@@ -1,225 +1,236 @@
 """
 DSL/chemistry/elements.py
 
-Provides definitions and data for chemical elements.
+Provides definitions and data for chemical elements. Element data for all
+118 elements lives in data/elements.tsv and is read on first use: atomic
+weights and electronegativities go into arrays indexed by atomic number,
+and the text fields of an element are decoded when it is first looked up.
+Natural isotopic compositions are read from data/isotopes.tsv in the same way.
 """
 
-# A more complete periodic table dictionary
-ELEMENTS = {
-    'H': {
-        'name': 'Hydrogen',
-        'atomic_weight': 1.008,
-        'state': 'Gas',
-        'group': 'Nonmetal',
-        'electronegativity': 2.20,
-        'common_compounds': ['H2O', 'HCl', 'H2SO4'],
-        'common_reactions': ['2H2 + O2 -> 2H2O', 'H2 + Cl2 -> 2HCl']
-    },
-    'He': {
-        'name': 'Helium',
-        'atomic_weight': 4.0026,
-        'state': 'Gas',
-        'group': 'Noble Gas',
-        'electronegativity': None,  # Noble gases have no electronegativity
-        'common_compounds': [],  # Noble gases rarely form compounds
-        'common_reactions': []
-    },
-    'Li': {
-        'name': 'Lithium',
-        'atomic_weight': 6.94,
-        'state': 'Solid',
-        'group': 'Alkali Metal',
-        'electronegativity': 0.98,
-        'common_compounds': ['Li2O', 'LiCl', 'LiOH'],
-        'common_reactions': ['4Li + O2 -> 2Li2O', '2Li + 2H2O -> 2LiOH + H2']
-    },
-    'Be': {
-        'name': 'Beryllium',
-        'atomic_weight': 9.0122,
-        'state': 'Solid',
-        'group': 'Alkaline Earth Metal',
-        'electronegativity': 1.57,
-        'common_compounds': ['BeO', 'BeCl2'],
-        'common_reactions': ['2Be + O2 -> 2BeO']
-    },
-    'B': {
-        'name': 'Boron',
-        'atomic_weight': 10.81,
-        'state': 'Solid',
-        'group': 'Metalloid',
-        'electronegativity': 2.04,
-        'common_compounds': ['B2O3', 'H3BO3'],
-        'common_reactions': ['4B + 3O2 -> 2B2O3']
-    },
-    'C': {
-        'name': 'Carbon',
-        'atomic_weight': 12.011,
-        'state': 'Solid',
-        'group': 'Nonmetal',
-        'electronegativity': 2.55,
-        'common_compounds': ['CO2', 'CH4', 'C6H12O6'],
-        'common_reactions': ['C + O2 -> CO2', 'CH4 + 2O2 -> CO2 + 2H2O']
-    },
-    'N': {
-        'name': 'Nitrogen',
-        'atomic_weight': 14.007,
-        'state': 'Gas',
-        'group': 'Nonmetal',
-        'electronegativity': 3.04,
-        'common_compounds': ['NH3', 'NO2', 'HNO3'],
-        'common_reactions': ['N2 + 3H2 -> 2NH3']
-    },
-    'O': {
-        'name': 'Oxygen',
-        'atomic_weight': 15.999,
-        'state': 'Gas',
-        'group': 'Nonmetal',
-        'electronegativity': 3.44,
-        'common_compounds': ['H2O', 'CO2', 'O3'],
-        'common_reactions': ['2H2 + O2 -> 2H2O', 'C + O2 -> CO2']
-    },
-    'F': {
-        'name': 'Fluorine',
-        'atomic_weight': 18.998,
-        'state': 'Gas',
-        'group': 'Halogen',
-        'electronegativity': 3.98,
-        'common_compounds': ['HF', 'NaF'],
-        'common_reactions': ['H2 + F2 -> 2HF']
-    },
-    'Ne': {
-        'name': 'Neon',
-        'atomic_weight': 20.180,
-        'state': 'Gas',
-        'group': 'Noble Gas',
-        'electronegativity': None,
-        'common_compounds': [],
-        'common_reactions': []
-    },
-    'Na': {
-        'name': 'Sodium',
-        'atomic_weight': 22.990,
-        'state': 'Solid',
-        'group': 'Alkali Metal',
-        'electronegativity': 0.93,
-        'common_compounds': ['NaCl', 'NaOH', 'Na2CO3'],
-        'common_reactions': ['2Na + Cl2 -> 2NaCl', '2Na + 2H2O -> 2NaOH + H2']
-    },
-    'Mg': {
-        'name': 'Magnesium',
-        'atomic_weight': 24.305,
-        'state': 'Solid',
-        'group': 'Alkaline Earth Metal',
-        'electronegativity': 1.31,
-        'common_compounds': ['MgO', 'MgCl2'],
-        'common_reactions': ['2Mg + O2 -> 2MgO']
-    },
-    'Al': {
-        'name': 'Aluminum',
-        'atomic_weight': 26.982,
-        'state': 'Solid',
-        'group': 'Post-Transition Metal',
-        'electronegativity': 1.61,
-        'common_compounds': ['Al2O3', 'AlCl3'],
-        'common_reactions': ['4Al + 3O2 -> 2Al2O3']
-    },
-    'Si': {
-        'name': 'Silicon',
-        'atomic_weight': 28.085,
-        'state': 'Solid',
-        'group': 'Metalloid',
-        'electronegativity': 1.90,
-        'common_compounds': ['SiO2', 'SiCl4'],
-        'common_reactions': ['Si + O2 -> SiO2']
-    },
-    'P': {
-        'name': 'Phosphorus',
-        'atomic_weight': 30.974,
-        'state': 'Solid',
-        'group': 'Nonmetal',
-        'electronegativity': 2.19,
-        'common_compounds': ['P2O5', 'H3PO4'],
-        'common_reactions': ['4P + 5O2 -> 2P2O5']
-    },
-    'S': {
-        'name': 'Sulfur',
-        'atomic_weight': 32.06,
-        'state': 'Solid',
-        'group': 'Nonmetal',
-        'electronegativity': 2.58,
-        'common_compounds': ['SO2', 'H2SO4'],
-        'common_reactions': ['S + O2 -> SO2']
-    },
-    'Cl': {
-        'name': 'Chlorine',
-        'atomic_weight': 35.45,
-        'state': 'Gas',
-        'group': 'Halogen',
-        'electronegativity': 3.16,
-        'common_compounds': ['HCl', 'NaCl'],
-        'common_reactions': ['H2 + Cl2 -> 2HCl']
-    },
-    'Ar': {
-        'name': 'Argon',
-        'atomic_weight': 39.948,
-        'state': 'Gas',
-        'group': 'Noble Gas',
-        'electronegativity': None,
-        'common_compounds': [],
-        'common_reactions': []
-    },
-    'K': {
-        'name': 'Potassium',
-        'atomic_weight': 39.098,
-        'state': 'Solid',
-        'group': 'Alkali Metal',
-        'electronegativity': 0.82,
-        'common_compounds': ['KCl', 'KOH'],
-        'common_reactions': ['2K + Cl2 -> 2KCl']
-    },
-    'Ca': {
-        'name': 'Calcium',
-        'atomic_weight': 40.078,
-        'state': 'Solid',
-        'group': 'Alkaline Earth Metal',
-        'electronegativity': 1.00,
-        'common_compounds': ['CaO', 'CaCO3'],
-        'common_reactions': ['2Ca + O2 -> 2CaO']
-    },
-    'Fe': {
-        'name': 'Iron',
-        'atomic_weight': 55.845,
-        'state': 'Solid',
-        'group': 'Transition Metal',
-        'electronegativity': 1.83,
-        'common_compounds': ['Fe2O3', 'FeCl3'],
-        'common_reactions': ['4Fe + 3O2 -> 2Fe2O3']
-    },
-    'Cu': {
-        'name': 'Copper',
-        'atomic_weight': 63.546,
-        'state': 'Solid',
-        'group': 'Transition Metal',
-        'electronegativity': 1.90,
-        'common_compounds': ['CuO', 'CuSO4'],
-        'common_reactions': ['2Cu + O2 -> 2CuO']
-    },
-    'Zn': {
-        'name': 'Zinc',
-        'atomic_weight': 65.38,
-        'state': 'Solid',
-        'group': 'Transition Metal',
-        'electronegativity': 1.65,
-        'common_compounds': ['ZnO', 'ZnCl2'],
-        'common_reactions': ['2Zn + O2 -> 2ZnO']
-    }
-}
+import os
+import threading
+from array import array
+from collections.abc import Mapping
+from math import isnan, nan
+
+# Every element symbol in periodic order; SYMBOLS[z - 1] has atomic number z
+SYMBOLS = (
+    'H', 'He', 'Li', 'Be', 'B', 'C', 'N', 'O', 'F', 'Ne',
+    'Na', 'Mg', 'Al', 'Si', 'P', 'S', 'Cl', 'Ar', 'K', 'Ca',
+    'Sc', 'Ti', 'V', 'Cr', 'Mn', 'Fe', 'Co', 'Ni', 'Cu', 'Zn',
+    'Ga', 'Ge', 'As', 'Se', 'Br', 'Kr', 'Rb', 'Sr', 'Y', 'Zr',
+    'Nb', 'Mo', 'Tc', 'Ru', 'Rh', 'Pd', 'Ag', 'Cd', 'In', 'Sn',
+    'Sb', 'Te', 'I', 'Xe', 'Cs', 'Ba', 'La', 'Ce', 'Pr', 'Nd',
+    'Pm', 'Sm', 'Eu', 'Gd', 'Tb', 'Dy', 'Ho', 'Er', 'Tm', 'Yb',
+    'Lu', 'Hf', 'Ta', 'W', 'Re', 'Os', 'Ir', 'Pt', 'Au', 'Hg',
+    'Tl', 'Pb', 'Bi', 'Po', 'At', 'Rn', 'Fr', 'Ra', 'Ac', 'Th',
+    'Pa', 'U', 'Np', 'Pu', 'Am', 'Cm', 'Bk', 'Cf', 'Es', 'Fm',
+    'Md', 'No', 'Lr', 'Rf', 'Db', 'Sg', 'Bh', 'Hs', 'Mt', 'Ds',
+    'Rg', 'Cn', 'Nh', 'Fl', 'Mc', 'Lv', 'Ts', 'Og',
+)
+
+# Element symbol -> atomic number
+ATOMIC_NUMBERS = {symbol: z for z, symbol in enumerate(SYMBOLS, start=1)}
+
+
+# Packaged element data, one tab-separated row per element in atomic-number order
+DATA_FILE = os.path.join(os.path.dirname(__file__), 'data', 'elements.tsv')
+# Packaged isotope data, one tab-separated row per naturally occurring isotope
+ISOTOPE_FILE = os.path.join(os.path.dirname(__file__), 'data', 'isotopes.tsv')
+
+# Element groups whose members are metals
+METAL_GROUPS = frozenset({'Alkali Metal', 'Alkaline Earth Metal', 'Transition Metal',
+                          'Post-Transition Metal', 'Lanthanide', 'Actinide'})
+
+
+class ElementTable(Mapping):
+    """
+    Read-only mapping of element symbol -> data dict (name, atomic_weight,
+    state, group, electronegativity, common_compounds, common_reactions),
+    backed by a data file that is only read on first access.
+    """
+
+    def __init__(self, path=DATA_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._rows = None           # undecoded text fields, by atomic number
+        self._weights = None
+        self._electronegativities = None
+        self._records = {}
+
+    def _load(self):
+        """Read the data file once: numeric columns into arrays, text fields kept as bytes."""
+        with self._lock:
+            if self._rows is not None:
+                return
+            with open(self.path, 'rb') as f:
+                lines = [line for line in f.read().splitlines() if line and not line.startswith(b'#')]
+            if len(lines) != len(SYMBOLS):
+                raise ValueError(f"{self.path}: expected {len(SYMBOLS)} elements, found {len(lines)}")
+            # Slot 0 is unused so that index == atomic number
+            weights = array('d', [0.0])
+            electronegativities = array('d', [nan])
+            rows = [b'']
+            for symbol, line in zip(SYMBOLS, lines):
+                row_symbol, weight, electronegativity, text = line.split(b'\t', 3)
+                if row_symbol.decode('ascii') != symbol:
+                    raise ValueError(f"{self.path}: expected {symbol}, found {row_symbol.decode('ascii')}")
+                weights.append(float(weight))
+                electronegativities.append(float(electronegativity) if electronegativity else nan)
+                rows.append(text)
+            self._weights = weights
+            self._electronegativities = electronegativities
+            self._rows = rows
+
+    @property
+    def weights(self):
+        """Atomic weights as array('d') indexed by atomic number (slot 0 is 0.0)."""
+        if self._rows is None:
+            self._load()
+        return self._weights
+
+    @property
+    def electronegativities(self):
+        """Pauling electronegativities as array('d') indexed by atomic number; NaN where unknown."""
+        if self._rows is None:
+            self._load()
+        return self._electronegativities
+
+    def __getitem__(self, symbol):
+        record = self._records.get(symbol)
+        if record is None:
+            z = ATOMIC_NUMBERS[symbol]
+            if self._rows is None:
+                self._load()
+            name, state, group, compounds, reactions = self._rows[z].decode('utf-8').split('\t')
+            electronegativity = self._electronegativities[z]
+            record = self._records.setdefault(symbol, {
+                'name': name,
+                'atomic_weight': self._weights[z],
+                'state': state,
+                'group': group,
+                'electronegativity': None if isnan(electronegativity) else electronegativity,
+                'common_compounds': compounds.split(';') if compounds else [],
+                'common_reactions': reactions.split(';') if reactions else [],
+            })
+        return record
+
+    def __contains__(self, symbol):
+        return symbol in ATOMIC_NUMBERS
+
+    def __iter__(self):
+        return iter(SYMBOLS)
+
+    def __len__(self):
+        return len(SYMBOLS)
+
+
+ELEMENTS = ElementTable()
+
+
+def atomic_weights():
+    """Atomic weights of every element as array('d') indexed by atomic number."""
+    return ELEMENTS.weights
+
+
+def atomic_weight(symbol):
+    """
+    Atomic weight of one element, without decoding its text fields.
+    Raises ValueError if the element symbol is unknown.
+    """
+    z = ATOMIC_NUMBERS.get(symbol)
+    if z is None:
+        raise ValueError(f"Unknown element: {symbol}")
+    return ELEMENTS.weights[z]
+
+
+def is_metal(symbol):
+    """Check whether an element belongs to one of the METAL_GROUPS."""
+    return ELEMENTS[symbol]['group'] in METAL_GROUPS
+
+
+class IsotopeTable(Mapping):
+    """
+    Read-only mapping of element symbol -> list of its naturally occurring
+    isotopes as (exact mass in u, natural abundance), lightest first.
+    Elements without a natural isotopic composition (Tc, Pm, ...) are absent.
+    The data file is only read on first access.
+    """
+
+    def __init__(self, path=ISOTOPE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._isotopes = None
+
+    def _load(self):
+        """Read the data file once."""
+        with self._lock:
+            if self._isotopes is not None:
+                return
+            isotopes = {}
+            with open(self.path, encoding='ascii') as f:
+                for line in f:
+                    if line.strip() and not line.startswith('#'):
+                        symbol, _, mass, abundance = line.split('\t')
+                        if symbol not in ATOMIC_NUMBERS:
+                            raise ValueError(f"{self.path}: unknown element {symbol}")
+                        isotopes.setdefault(symbol, []).append((float(mass), float(abundance)))
+            self._isotopes = isotopes
+
+    def __getitem__(self, symbol):
+        if self._isotopes is None:
+            self._load()
+        return self._isotopes[symbol]
+
+    def __iter__(self):
+        if self._isotopes is None:
+            self._load()
+        return iter(self._isotopes)
+
+    def __len__(self):
+        if self._isotopes is None:
+            self._load()
+        return len(self._isotopes)
+
+
+ISOTOPES = IsotopeTable()
+
+# Rest mass of the electron in u, for the exact mass of ions
+ELECTRON_MASS = 0.000548579909
+
+
+# Optional persistent catalog consulted before the built-in tables (see catalog.py)
+_catalog = None
+
+
+def set_catalog(catalog):
+    """Make get_compound and get_element consult catalog first (a catalog.Catalog, or None)."""
+    global _catalog
+    _catalog = catalog
+
+
+def get_catalog():
+    """Return the catalog in use, opening the file named by CHEMDSL_CATALOG on first use."""
+    global _catalog
+    if _catalog is None and os.environ.get("CHEMDSL_CATALOG"):
+        # Imported here because catalog.py itself imports this module
+        from DSL.chemistry.catalog import Catalog
+        _catalog = Catalog(os.environ["CHEMDSL_CATALOG"])
+    return _catalog
+
 
 def get_element(symbol):
     """
     Get element data for the given symbol.
     Raises ValueError if the element symbol is unknown.
     """
+    catalog = get_catalog()
+    if catalog is not None:
+        try:
+            return catalog.get_element(symbol)
+        except ValueError:
+            pass
     if symbol not in ELEMENTS:
         raise ValueError(f"Unknown element symbol: {symbol}")
     return ELEMENTS[symbol]
@@ -453,11 +464,34 @@ COMPOUNDS = {
     }
 }
 
+# COMPOUNDS keys by canonical (Hill) formula, built on first use
+_compounds_by_canonical = None
+
+
 def get_compound(formula):
     """
-    Get compound data for the given formula.
+    Get compound data for the given formula. Any spelling of a listed
+    composition matches, e.g. "CH3CH2OH" finds the "C2H5OH" entry.
     Raises ValueError if the compound formula is unknown.
     """
-    if formula not in COMPOUNDS:
+    catalog = get_catalog()
+    if catalog is not None:
+        try:
+            return catalog.get_compound(formula)
+        except ValueError:
+            pass
+    if formula in COMPOUNDS:
+        return COMPOUNDS[formula]
+
+    # Imported here because compounds.py itself imports this module
+    from DSL.chemistry.compounds import canonical_formula
+    global _compounds_by_canonical
+    if _compounds_by_canonical is None:
+        _compounds_by_canonical = {canonical_formula(key): key for key in COMPOUNDS}
+    try:
+        key = _compounds_by_canonical.get(canonical_formula(formula))
+    except ValueError:
+        key = None
+    if key is None:
         raise ValueError(f"Unknown compound formula: {formula}")
-    return COMPOUNDS[formula]
\ No newline at end of file
+    return COMPOUNDS[key]
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+DSL/chemistry/formatting.py
+
+Writes formulas with their polyatomic ions grouped, e.g. "CuN2O6" as
+"Cu(NO3)2" and "N2H8SO4" as "(NH4)2SO4". A composition is split into a
+cation (one element or ammonium) and an anion; the anion is reduced to
+lowest terms and looked up in a table of known ions keyed by reduced
+composition, so each candidate split costs one dictionary lookup.
+Decisions are memoized per composition in a bounded LRU.
+"""
+
+import re
+from math import gcd
+from DSL.chemistry.compounds import composition_of, split_charge, format_charge, ELECTRON_FORMULAS
+from DSL.chemistry.elements import is_metal
+from DSL.chemistry.lru import LRUCache
+
+# Polyatomic anions recognised when grouping
+POLYATOMIC_IONS = (
+    'OH', 'CN', 'SCN', 'NO3', 'NO2', 'SO4', 'SO3', 'HSO4', 'S2O3', 'PO4', 'HPO4', 'H2PO4',
+    'CO3', 'HCO3', 'C2O4', 'C2H3O2', 'ClO', 'ClO2', 'ClO3', 'ClO4', 'BrO3', 'IO3',
+    'MnO4', 'CrO4', 'Cr2O7', 'SiO3', 'BO3', 'AsO4',
+)
+
+AMMONIUM = 'NH4'
+
+
+def _reduce(composition):
+    """Return (reduced, multiple): the composition in lowest terms as a sorted tuple, and the divisor."""
+    divisor = 0
+    for n in composition.values():
+        divisor = gcd(divisor, n)
+    return tuple(sorted((e, n // divisor) for e, n in composition.items())), divisor
+
+
+def _ion_composition(ion):
+    """Composition of a flat ion formula from the table; needs no element data."""
+    composition = {}
+    for element, count in re.findall(r"([A-Z][a-z]?)(\d*)", ion):
+        composition[element] = composition.get(element, 0) + int(count or 1)
+    return composition
+
+
+def _ion_table(ions):
+    """Index ions by reduced composition: reduced -> [(ion, multiple)]."""
+    table = {}
+    for ion in ions:
+        reduced, multiple = _reduce(_ion_composition(ion))
+        table.setdefault(reduced, []).append((ion, multiple))
+    return table
+
+
+_IONS = _ion_table(POLYATOMIC_IONS)
+_AMMONIUM = _ion_composition(AMMONIUM)
+
+
+def _cations(composition):
+    """
+    Yield (label, count, atoms) for each way to take a cation off the
+    composition: every metal in it, then ammonium. Nonmetals are never
+    split off, so molecular formulas like CH2O2 are not read as "C(OH)2".
+    """
+    for element in composition:
+        if is_metal(element):
+            yield element, composition[element], {element: composition[element]}
+    most = min(composition.get(e, 0) // n for e, n in _AMMONIUM.items())
+    for count in range(most, 0, -1):
+        yield AMMONIUM, count, {e: n * count for e, n in _AMMONIUM.items()}
+
+
+def _group(label, count):
+    """Write count units of an element or ion, parenthesizing repeated ions."""
+    if count == 1:
+        return label
+    if label == AMMONIUM or label in POLYATOMIC_IONS:
+        return f"({label}){count}"
+    return f"{label}{count}"
+
+
+def ionic_formula(composition):
+    """
+    Write a composition as cation + anion with polyatomic ions grouped, or
+    return None when no split repeats a polyatomic ion (for molecular
+    compounds such as C6H12O6, and salts such as CuSO4 whose usual spelling
+    needs no grouping). {'Ca': 3, 'P': 2, 'O': 8} -> "Ca3(PO4)2".
+    """
+    for label, count, atoms in _cations(composition):
+        rest = {e: n - atoms.get(e, 0) for e, n in composition.items() if n != atoms.get(e, 0)}
+        if not rest or any(n < 0 for n in rest.values()):
+            continue
+        reduced, multiple = _reduce(rest)
+        matches = [(ion, multiple // k) for ion, k in _IONS.get(reduced, ()) if multiple % k == 0]
+        if not matches and label == AMMONIUM and len(rest) == 1:
+            # Ammonium salts of monatomic anions, e.g. (NH4)2S
+            (element, n), = rest.items()
+            matches = [(element, n)]
+        for anion, anion_count in matches:
+            repeated = (anion_count > 1 and anion in POLYATOMIC_IONS) or (label == AMMONIUM and count > 1)
+            if not repeated:
+                return None
+            return _group(label, count) + _group(anion, anion_count)
+    return None
+
+
+class FormulaFormatter(LRUCache):
+    """
+    Formats formulas for display, remembering the grouping chosen for each
+    composition in a bounded LRU of at most maxsize compositions.
+    """
+
+    def __init__(self, maxsize=4096):
+        super().__init__(maxsize)
+
+    def format(self, formula):
+        """
+        Return formula with its polyatomic ions grouped, or unchanged when
+        grouping does not apply. Any ionic charge is kept: "e" -> "e^-".
+        """
+        neutral, charge = split_charge(formula)
+        if charge:
+            if neutral == 'e':
+                return ELECTRON_FORMULAS[0]
+            return self.format(neutral) + format_charge(charge)
+        try:
+            composition = composition_of(neutral)
+        except ValueError:
+            return formula
+        key = frozenset(composition.items())
+        found, grouped = self.lookup(key)
+        if not found:
+            grouped = ionic_formula(composition)
+            self.store(key, grouped)
+        return grouped if grouped is not None else formula
+
+
+# Shared formatter used by the interpreter
+default_formatter = FormulaFormatter()
+
+
+def format_formula(formula):
+    """Format a formula with the shared formatter. "CuN2O6" -> "Cu(NO3)2"."""
+    return default_formatter.format(formula)
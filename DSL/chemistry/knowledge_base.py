@@ -0,0 +1,378 @@
+"""
+DSL/chemistry/knowledge_base.py
+
+Known reactions, parsed once from the 'common_reactions' of ELEMENTS, the
+'reactions' and 'production_methods' text of COMPOUNDS, and user reaction
+files. Every species is indexed by canonical formula, so the reactions
+involving a compound are one dictionary lookup, and reactions are also
+indexed by their set of reactants for predict_reaction, most trusted source
+and simplest products first. The parsed index is saved as JSON and reloaded
+while its sources are unchanged.
+"""
+
+import hashlib
+import json
+import os
+import re
+from DSL.chemistry.balancer import parse_term, split_terms
+from DSL.chemistry.compounds import Compound, canonical_formula
+from DSL.chemistry.elements import ELEMENTS, COMPOUNDS
+
+# Bump when the parser or the file layout changes, to invalidate saved indexes
+INDEX_VERSION = "3"
+INDEX_FILENAME = "reaction_index.json"
+
+# Source prefixes of the built-in tables; production methods describe how to
+# make some other compound, so they are the last reactions to predict from
+ELEMENT_SOURCE = "element"
+COMPOUND_SOURCE = "compound"
+PRODUCTION_SOURCE = "production of"
+
+ARROWS = ('<->', '⇌', '⇄', '->', '→')
+REVERSIBLE_ARROWS = ('<->', '⇌', '⇄')
+
+_SUBSCRIPTS = str.maketrans('₀₁₂₃₄₅₆₇₈₉', '0123456789')
+_SUPERSCRIPT_DIGITS = str.maketrans('⁰¹²³⁴⁵⁶⁷⁸⁹', '0123456789')
+# A superscript charge such as '²⁻' or '⁺', rewritten as '^2-' / '^+'
+_SUPERSCRIPT_CHARGE = re.compile(r"([⁰¹²³⁴⁵⁶⁷⁸⁹]*)([⁺⁻])")
+_ARROW = re.compile("|".join(re.escape(arrow) for arrow in ARROWS))
+# Lower-case words written as terms, e.g. '... + 6H2O + energy'
+_NON_SPECIES = re.compile(r"^[a-z][a-z ]*$")
+
+
+def _ascii(text):
+    """Rewrite Unicode subscripts and superscript charges in plain DSL notation."""
+    text = text.translate(_SUBSCRIPTS)
+    return _SUPERSCRIPT_CHARGE.sub(
+        lambda m: "^" + m.group(1).translate(_SUPERSCRIPT_DIGITS) + ("+" if m.group(2) == '⁺' else "-"), text)
+
+
+def _terms(half):
+    """
+    Parse one side of an equation into [(coefficient, formula)] with the
+    balancer's term parser, or None if a term is not a species.
+    """
+    terms = []
+    for term in split_terms(half):
+        if _NON_SPECIES.match(term.strip()):
+            continue
+        try:
+            terms.append(parse_term(term))
+        except ValueError:
+            return None
+    return terms or None
+
+
+def parse_equations(text):
+    """
+    Extract the equations written in a free-text reaction entry. Returns a
+    list of (label, reactants, products, reversible) with reactants and
+    products as [(coefficient, formula)]; text without an equation gives [].
+    'Contact process: S + O₂ → SO₂, 2SO₂ + O₂ → 2SO₃' gives two equations
+    labelled 'Contact process'.
+    """
+    text = _ascii(text)
+    label = None
+    head, colon, rest = text.partition(':')
+    if colon and not _ARROW.search(head):
+        label, text = head.strip(), rest
+    equations = []
+    for part in re.split(r",\s+", text):
+        sides = _ARROW.split(part)
+        if len(sides) != 2:
+            continue
+        reactants, products = _terms(sides[0]), _terms(sides[1])
+        if reactants is None or products is None:
+            continue
+        reversible = any(arrow in part for arrow in REVERSIBLE_ARROWS)
+        equations.append((label, reactants, products, reversible))
+    return equations
+
+
+def _equation(reactants, products, reversible):
+    """Write '2H2 + O2 -> 2H2O' (or with '<->' when reversible)."""
+    def side(terms):
+        return " + ".join(f"{coeff if coeff != 1 else ''}{formula}" for coeff, formula in terms)
+    return f"{side(reactants)} {'<->' if reversible else '->'} {side(products)}"
+
+
+def _species_key(formulas):
+    """Order-independent key of a set of species: their sorted canonical formulas."""
+    return " + ".join(sorted({canonical_formula(formula) for formula in formulas}))
+
+
+def _equation_key(reactants, products):
+    """Order- and spelling-independent key of an equation, coefficients included."""
+    def side(terms):
+        return " + ".join(sorted(f"{coeff} {canonical_formula(formula)}" for coeff, formula in terms))
+    return f"{side(reactants)} -> {side(products)}"
+
+
+class KnownReaction:
+    """One parsed reaction with the label and source it was read from."""
+
+    __slots__ = ('equation', 'reactants', 'products', 'reversible', 'label', 'source')
+
+    def __init__(self, reactants, products, reversible=False, label=None, source=None):
+        self.reactants = [(int(coeff), formula) for coeff, formula in reactants]
+        self.products = [(int(coeff), formula) for coeff, formula in products]
+        self.reversible = reversible
+        self.label = label
+        self.source = source
+        self.equation = _equation(self.reactants, self.products, reversible)
+
+    def __repr__(self):
+        return f"KnownReaction({self.equation!r})"
+
+    @property
+    def priority(self):
+        """
+        How much the source is trusted for prediction, lowest first: 0 for
+        element reactions, 1 for compound reactions and reaction files,
+        2 for production methods.
+        """
+        source = self.source or ""
+        if source.startswith(f"{ELEMENT_SOURCE} "):
+            return 0
+        if source.startswith(f"{PRODUCTION_SOURCE} "):
+            return 2
+        return 1
+
+    def rank(self, direction=1):
+        """
+        Sort key for choosing among reactions with the same reactants:
+        priority, then the number of product species read in direction.
+        """
+        return self.priority, len(self.products if direction == 1 else self.reactants)
+
+    def species(self):
+        """Canonical formulas of every species, reactants first."""
+        return [canonical_formula(formula) for _, formula in self.reactants + self.products]
+
+    def reaction(self, direction=1):
+        """
+        Materialize as a reactions.Reaction of Compounds; direction -1 gives
+        the reverse reaction of a reversible equilibrium.
+        """
+        # Imported here because reactions.py consults this module
+        from DSL.chemistry.reactions import Reaction
+        reactants, products = (self.reactants, self.products) if direction == 1 else (self.products, self.reactants)
+        return Reaction([(coeff, Compound(formula)) for coeff, formula in reactants],
+                        [(coeff, Compound(formula)) for coeff, formula in products])
+
+    def to_dict(self):
+        return {'reactants': self.reactants, 'products': self.products, 'reversible': self.reversible,
+                'label': self.label, 'source': self.source}
+
+
+class ReactionIndex:
+    """
+    Known reactions with an inverted index from canonical formula to the
+    reactions that involve it, and an index from reactant set to the
+    reactions that start from exactly those species. Duplicate equations
+    are kept once, under the first source that gave them.
+    """
+
+    def __init__(self, reactions=()):
+        self.reactions = []
+        self.fingerprint = None
+        self._equations = {}        # equation key -> reaction id
+        self._by_species = {}       # canonical formula -> [(reaction id, side)], side 0 reactant, 1 product
+        self._by_reactants = {}     # reactant-set key -> [(reaction id, direction)]
+        for reaction in reactions:
+            self.add(reaction)
+
+    def __len__(self):
+        return len(self.reactions)
+
+    def __repr__(self):
+        return f"ReactionIndex({len(self)} reactions, {len(self._by_species)} species)"
+
+    def add(self, reaction):
+        """Index a KnownReaction. Returns its id, or None if the equation was already known."""
+        key = _equation_key(reaction.reactants, reaction.products)
+        if key in self._equations:
+            return None
+        sides = [{canonical_formula(formula) for _, formula in terms}
+                 for terms in (reaction.reactants, reaction.products)]
+        rid = self._equations[key] = len(self.reactions)
+        self.reactions.append(reaction)
+        for side, species in enumerate(sides):
+            for canonical in species:
+                self._by_species.setdefault(canonical, []).append((rid, side))
+        self._by_reactants.setdefault(_species_key(sides[0]), []).append((rid, 1))
+        if reaction.reversible:
+            self._by_reactants.setdefault(_species_key(sides[1]), []).append((rid, -1))
+        return rid
+
+    def add_text(self, text, source=None):
+        """Parse and index every equation in a free-text entry. Returns the number added."""
+        added = 0
+        for label, reactants, products, reversible in parse_equations(text):
+            try:
+                reaction = KnownReaction(reactants, products, reversible, label, source)
+                added += self.add(reaction) is not None
+            except ValueError:
+                continue
+        return added
+
+    def load_file(self, path):
+        """
+        Index a reaction file: one equation per line, optionally labelled
+        ('Haber process: N2 + 3H2 -> 2NH3'); blank lines and lines starting
+        with '#' are ignored. Returns the number of reactions added.
+        """
+        added = 0
+        with open(path, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    added += self.add_text(line, f"{path}:{number}")
+        return added
+
+    def involving(self, formula):
+        """Reactions with formula (any spelling) as a reactant or product."""
+        return self._lookup(formula, (0, 1))
+
+    def producing(self, formula):
+        """Reactions with formula among their products."""
+        return self._lookup(formula, (1,))
+
+    def consuming(self, formula):
+        """Reactions with formula among their reactants."""
+        return self._lookup(formula, (0,))
+
+    def _lookup(self, formula, sides):
+        try:
+            entries = self._by_species.get(canonical_formula(formula), ())
+        except ValueError:
+            return []
+        ids = dict.fromkeys(rid for rid, side in entries if side in sides)
+        return [self.reactions[rid] for rid in ids]
+
+    def from_reactants(self, formulas):
+        """
+        Reactions that start from exactly the species in formulas (any order
+        or spelling), as (KnownReaction, direction) pairs; direction is -1
+        when a reversible reaction is read from right to left. Matches are
+        ordered by KnownReaction.rank, ties in the order they were added.
+        """
+        try:
+            key = _species_key(formulas)
+        except ValueError:
+            return []
+        matches = sorted(self._by_reactants.get(key, ()),
+                         key=lambda entry: (self.reactions[entry[0]].rank(entry[1]), entry[0]))
+        return [(self.reactions[rid], direction) for rid, direction in matches]
+
+    def save(self, path):
+        """Write the parsed reactions and both indexes to a JSON file."""
+        data = {'version': INDEX_VERSION, 'fingerprint': self.fingerprint,
+                'reactions': [reaction.to_dict() for reaction in self.reactions],
+                'equations': self._equations,
+                'species': self._by_species, 'reactant_sets': self._by_reactants}
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by save(). Raises ValueError if it was written by another INDEX_VERSION."""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"{path} is not a version {INDEX_VERSION} reaction index")
+        index = cls()
+        index.fingerprint = data['fingerprint']
+        index.reactions = [KnownReaction(**record) for record in data['reactions']]
+        index._equations = data['equations']
+        index._by_species = {formula: [tuple(entry) for entry in entries]
+                             for formula, entries in data['species'].items()}
+        index._by_reactants = {key: [tuple(entry) for entry in entries]
+                               for key, entries in data['reactant_sets'].items()}
+        return index
+
+
+def builtin_sources():
+    """Yield (text, source) for every reaction text of the built-in ELEMENTS and COMPOUNDS tables."""
+    for symbol, record in ELEMENTS.items():
+        for text in record.get('common_reactions', []):
+            yield text, f"{ELEMENT_SOURCE} {symbol}"
+    for formula, record in COMPOUNDS.items():
+        for text in record.get('reactions', []):
+            yield text, f"{COMPOUND_SOURCE} {formula}"
+        for text in record.get('production_methods', []):
+            yield text, f"{PRODUCTION_SOURCE} {formula}"
+
+
+def fingerprint(sources, paths=()):
+    """Hash INDEX_VERSION, every (text, source) pair and the contents of every reaction file."""
+    digest = hashlib.sha1(INDEX_VERSION.encode())
+    for text, source in sources:
+        digest.update(f"{source}\t{text}\n".encode('utf-8'))
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def build_index(sources=None, paths=()):
+    """
+    Build a ReactionIndex from (text, source) pairs (the built-in tables by
+    default) and reaction files, stamped with their fingerprint.
+    """
+    sources = list(builtin_sources() if sources is None else sources)
+    index = ReactionIndex()
+    for text, source in sources:
+        index.add_text(text, source)
+    for path in paths:
+        index.load_file(path)
+    index.fingerprint = fingerprint(sources, paths)
+    return index
+
+
+def cached_index(directory, sources=None, paths=()):
+    """
+    Return the index of the given sources, reusing the copy saved in
+    directory while its fingerprint matches and rewriting it otherwise.
+    """
+    sources = list(builtin_sources() if sources is None else sources)
+    path = os.path.join(directory, INDEX_FILENAME)
+    try:
+        index = ReactionIndex.load(path)
+    except (OSError, ValueError, KeyError, TypeError):
+        index = None
+    if index is None or index.fingerprint != fingerprint(sources, paths):
+        index = build_index(sources, paths)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            index.save(path)
+        except OSError:
+            pass
+    return index
+
+
+# Index used by predict_reaction, built on first use
+_knowledge_base = None
+
+
+def set_knowledge_base(index):
+    """Make predict_reaction consult index (a ReactionIndex, or None to rebuild the default)."""
+    global _knowledge_base
+    _knowledge_base = index
+
+
+def knowledge_base():
+    """
+    Return the shared ReactionIndex over the built-in tables plus the reaction
+    files listed in CHEMDSL_REACTIONS (separated by os.pathsep). With
+    CHEMDSL_CACHE_DIR set, the parsed index is saved there and reloaded by
+    later processes.
+    """
+    global _knowledge_base
+    if _knowledge_base is None:
+        paths = [path for path in os.environ.get("CHEMDSL_REACTIONS", "").split(os.pathsep) if path]
+        directory = os.environ.get("CHEMDSL_CACHE_DIR")
+        _knowledge_base = cached_index(directory, paths=paths) if directory else build_index(paths=paths)
+    return _knowledge_base
@@ -0,0 +1,90 @@
+"""
+DSL/chemistry/lru.py
+
+Bounded, thread-safe least-recently-used cache shared by the formula memo,
+the formula formatter, the balancing cache and the SQLite catalog.
+Subclasses decide what a miss computes or reads; this class keeps the
+entries, the capacity and the hit/miss counters.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Mapping of at most maxsize entries that evicts the least recently used
+    one. hits and misses count lookup() calls answered from the cache or
+    not. Every method holds one reentrant lock, which subclasses may also
+    take to make a lookup and the work behind it atomic.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return (f"{type(self).__name__}(size={len(self._entries)}, maxsize={self.maxsize}, "
+                f"hits={self.hits}, misses={self.misses})")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def peek(self, key):
+        """Return (found, value) for key, marking it recently used, without counting a hit or miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return True, self._entries[key]
+            return False, None
+
+    def lookup(self, key):
+        """Return (found, value) for key and count the hit or miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def store(self, key, value):
+        """Insert or refresh an entry, evicting the least recently used ones beyond maxsize."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _count(self, hit):
+        """Count one lookup, for subclasses that answer some misses from another layer."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def resize(self, maxsize):
+        """Change the capacity, evicting the least recently used entries if needed."""
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return the hit/miss counters and current size as a dictionary."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self._entries), 'maxsize': self.maxsize}
@@ -0,0 +1,219 @@
+"""
+DSL/chemistry/mapped_catalog.py
+
+Read-only binary compound catalog opened with numpy.memmap. The file is
+written once by build_mapped_catalog and holds four sections: fixed-width
+records sorted by composition hash, a molar-mass index, the sparse
+compositions the records point to, and JSON property blobs. Opening it reads only the header; every process
+that opens the same file shares the operating system's page cache, and a
+record is decoded into Python objects only when it is looked at.
+"""
+
+import json
+import numpy as np
+from DSL.chemistry.compounds import Compound, composition_of, composition_hash, split_charge, hill_formula
+from DSL.chemistry.elements import SYMBOLS, ATOMIC_NUMBERS, atomic_weight
+
+MAGIC = b"CHEMCAT1"
+# Sections start on multiples of ALIGNMENT bytes
+ALIGNMENT = 64
+
+RECORD_DTYPE = np.dtype([
+    ('hash', '<u8'),                 # composition_hash of the formula
+    ('molar_mass', '<f8'),
+    ('charge', '<i4'),
+    ('composition_length', '<u4'),   # number of (z, count) atoms
+    ('composition_offset', '<u8'),   # first atom in the compositions section
+    ('blob_offset', '<u8'),          # first byte in the blobs section
+    ('blob_length', '<u8'),
+])
+ATOM_DTYPE = np.dtype([('z', '<u2'), ('count', '<u4')])
+# Secondary index: every record's molar mass and row, sorted by mass
+MASS_DTYPE = np.dtype([('molar_mass', '<f8'), ('row', '<i8')])
+
+
+def _aligned(position):
+    """Round a file position up to the next section boundary."""
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def build_mapped_catalog(path, records):
+    """
+    Write a mapped catalog of compound records (dicts with at least a
+    'formula', shaped like the COMPOUNDS entries). Records whose formula
+    cannot be parsed are skipped; molar_mass is computed when missing.
+    Returns the number of records written.
+    """
+    rows, atoms, blobs = [], [], []
+    atom_count = blob_size = 0
+    for record in records:
+        formula = record.get('formula')
+        try:
+            composition = composition_of(formula)
+            charge = split_charge(formula)[1]
+        except (ValueError, TypeError, AttributeError):
+            continue
+        mass = record.get('molar_mass')
+        if not isinstance(mass, (int, float)):
+            mass = sum(atomic_weight(e) * n for e, n in composition.items())
+        blob = json.dumps(record).encode('utf-8')
+        rows.append((composition_hash(composition, charge), mass, charge, len(composition),
+                     atom_count, blob_size, len(blob)))
+        atoms.extend(sorted((ATOMIC_NUMBERS[e], n) for e, n in composition.items()))
+        blobs.append(blob)
+        atom_count += len(composition)
+        blob_size += len(blob)
+
+    table = np.array(rows, dtype=RECORD_DTYPE)
+    table = table[np.argsort(table['hash'], kind='stable')]
+    mass_index = np.empty(len(table), dtype=MASS_DTYPE)
+    mass_index['row'] = np.argsort(table['molar_mass'], kind='stable')
+    mass_index['molar_mass'] = table['molar_mass'][mass_index['row']]
+    compositions = np.array(atoms, dtype=ATOM_DTYPE)
+
+    sections = {}
+    position = _aligned(len(MAGIC) + 4 + 1024)  # room for the header
+    for name, size in (('records', table.nbytes), ('mass_index', mass_index.nbytes),
+                       ('compositions', compositions.nbytes), ('blobs', blob_size)):
+        sections[name] = position
+        position = _aligned(position + size)
+    header = json.dumps({'count': len(table), 'atoms': len(compositions), 'blob_size': blob_size,
+                         'sections': sections}).encode('ascii')
+    if len(header) > 1024:
+        raise ValueError("Catalog header too large")
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC + len(header).to_bytes(4, 'little') + header)
+        for name, data in (('records', table.tobytes()), ('mass_index', mass_index.tobytes()),
+                           ('compositions', compositions.tobytes())):
+            f.seek(sections[name])
+            f.write(data)
+        f.seek(sections['blobs'])
+        for blob in blobs:
+            f.write(blob)
+        f.truncate(position)
+    return len(table)
+
+
+class CatalogEntry:
+    """One compound of a MappedCatalog; its fields are decoded on first access."""
+
+    __slots__ = ('catalog', 'row', '_properties')
+
+    def __init__(self, catalog, row):
+        self.catalog = catalog
+        self.row = row
+        self._properties = None
+
+    def __repr__(self):
+        return f"CatalogEntry({self.formula!r}, molar_mass={self.molar_mass:.3f})"
+
+    @property
+    def molar_mass(self):
+        return float(self.catalog.records['molar_mass'][self.row])
+
+    @property
+    def composition(self):
+        """Element -> count mapping, in atomic-number order."""
+        return self.catalog.composition(self.row)
+
+    @property
+    def properties(self):
+        """The stored record (name, state, ...), decoded from JSON on first access."""
+        if self._properties is None:
+            self._properties = self.catalog.properties(self.row)
+        return self._properties
+
+    @property
+    def formula(self):
+        return self.properties.get('formula') or hill_formula(self.composition,
+                                                              int(self.catalog.records['charge'][self.row]))
+
+    def compound(self):
+        """Materialize the entry as a Compound."""
+        return Compound(self.formula)
+
+
+class MappedCatalog:
+    """
+    A catalog file written by build_mapped_catalog, mapped read-only.
+    Lookups are binary searches on the hash column; nothing is copied
+    out of the mapping until an entry's fields are read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a mapped compound catalog")
+            header = json.loads(f.read(int.from_bytes(f.read(4), 'little')))
+        sections = header['sections']
+        count = header['count']
+        self.records = self._map(RECORD_DTYPE, sections['records'], count)
+        self.mass_index = self._map(MASS_DTYPE, sections['mass_index'], count)
+        self.compositions = self._map(ATOM_DTYPE, sections['compositions'], header['atoms'])
+        self.blobs = self._map(np.uint8, sections['blobs'], header['blob_size'])
+        self._hashes = self.records['hash']
+
+    def _map(self, dtype, offset, length):
+        """Map one section read-only (an empty array for an empty section, which mmap cannot map)."""
+        if not length:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode='r', offset=offset, shape=(length,))
+
+    def __repr__(self):
+        return f"MappedCatalog({self.path!r}, {len(self)} compounds)"
+
+    def __len__(self):
+        return len(self.records)
+
+    def composition(self, row):
+        """Composition of the record at row, in atomic-number order."""
+        record = self.records[row]
+        start = int(record['composition_offset'])
+        atoms = self.compositions[start:start + int(record['composition_length'])]
+        return {SYMBOLS[z - 1]: int(n) for z, n in zip(atoms['z'].tolist(), atoms['count'].tolist())}
+
+    def properties(self, row):
+        """Decode the property blob of the record at row."""
+        record = self.records[row]
+        start = int(record['blob_offset'])
+        return json.loads(self.blobs[start:start + int(record['blob_length'])].tobytes())
+
+    def rows(self, formula):
+        """Rows whose composition and charge match formula (any spelling); isomers share a hash."""
+        key = np.uint64(composition_hash(composition_of(formula), split_charge(formula)[1]))
+        return range(int(np.searchsorted(self._hashes, key, 'left')),
+                     int(np.searchsorted(self._hashes, key, 'right')))
+
+    def find(self, formula):
+        """Every entry with the composition of formula."""
+        return [CatalogEntry(self, row) for row in self.rows(formula)]
+
+    def by_mass(self, low, high):
+        """Entries with molar mass in [low, high], lightest first."""
+        masses = self.mass_index['molar_mass']
+        lo = int(np.searchsorted(masses, low, 'left'))
+        hi = int(np.searchsorted(masses, high, 'right'))
+        return [CatalogEntry(self, row) for row in self.mass_index['row'][lo:hi].tolist()]
+
+    def get_compound(self, formula):
+        """
+        Get the stored record of a compound, preferring an entry written with
+        the same spelling. Raises ValueError if the catalog has no such
+        compound, like elements.get_compound.
+        """
+        try:
+            entries = self.find(formula)
+        except ValueError:
+            entries = []
+        if not entries:
+            raise ValueError(f"Unknown compound formula: {formula}")
+        for entry in entries:
+            if entry.properties.get('formula') == formula:
+                return entry.properties
+        return entries[0].properties
+
+    def get_element(self, symbol):
+        """Mapped catalogs hold no element records; always raises ValueError."""
+        raise ValueError(f"Unknown element symbol: {symbol}")
@@ -0,0 +1,222 @@
+"""
+DSL/chemistry/mass_search.py
+
+Finds every elemental formula whose mass matches a measured mass within a
+tolerance (mass decomposition). Element masses are scaled to integers and
+an extended residue table, built by round-robin dynamic programming over
+the residues of the lightest element, answers "is this integer mass
+decomposable by the first i elements?" in constant time. Backtracking only
+descends into branches that can still be completed, so results come out
+lazily and the search stays output-sensitive at high masses.
+"""
+
+from math import ceil, floor, gcd, inf
+from DSL.chemistry.compounds import hill_formula
+from DSL.chemistry.elements import ISOTOPES, atomic_weight
+
+# Default search alphabet: CHNOPS plus the halogens
+DEFAULT_ALPHABET = ('C', 'H', 'N', 'O', 'P', 'S', 'F', 'Cl', 'Br', 'I')
+
+# Usual valences, for ring-double-bond-equivalent (RDBE) filtering
+VALENCES = {
+    'H': 1, 'B': 3, 'C': 4, 'N': 3, 'O': 2, 'F': 1, 'Na': 1, 'Si': 4,
+    'P': 3, 'S': 2, 'Cl': 1, 'K': 1, 'Br': 1, 'I': 1,
+}
+
+# Approximate integer mass resolution in u; finer means a bigger residue table, coarser more candidates to filter
+DEFAULT_PRECISION = 1e-4
+
+
+def element_mass(element, masses="monoisotopic"):
+    """
+    Mass of one atom: the most abundant isotope for "monoisotopic" (what a
+    mass spectrometer measures) or the standard atomic weight for "average".
+    """
+    if masses == "monoisotopic":
+        if element not in ISOTOPES:
+            raise ValueError(f"No isotope data for element: {element}")
+        return max(ISOTOPES[element], key=lambda isotope: isotope[1])[0]
+    if masses == "average":
+        return atomic_weight(element)
+    raise ValueError(f"Unknown mass type: {masses}. Use 'monoisotopic' or 'average'.")
+
+
+def rdbe(counts):
+    """Ring and double bond equivalents: 1 + sum(n * (valence - 2)) / 2."""
+    total = 2
+    for element, n in counts.items():
+        if element not in VALENCES:
+            raise ValueError(f"No valence known for element: {element}")
+        total += n * (VALENCES[element] - 2)
+    return total / 2
+
+
+def tolerance_window(mass, tolerance, unit="ppm"):
+    """Return the (low, high) mass interval for a tolerance in ppm, Da or mDa."""
+    unit = unit.lower()
+    if unit == "ppm":
+        delta = mass * tolerance * 1e-6
+    elif unit == "da":
+        delta = tolerance
+    elif unit == "mda":
+        delta = tolerance * 1e-3
+    else:
+        raise ValueError(f"Unknown tolerance unit: {unit}. Use 'ppm', 'da' or 'mda'.")
+    return mass - delta, mass + delta
+
+
+class MassDecomposer:
+    """
+    Decomposes masses over a fixed alphabet of elements. The residue table
+    depends only on the alphabet and precision, so one decomposer can
+    answer any number of queries.
+    """
+
+    def __init__(self, alphabet=DEFAULT_ALPHABET, masses="monoisotopic", precision=DEFAULT_PRECISION):
+        real = {element: element_mass(element, masses) for element in alphabet}
+        # Lightest element first: its residues index the table
+        self.alphabet = sorted(real, key=real.get)
+        self.masses = [real[e] for e in self.alphabet]
+        self.precision = precision
+        self.blowup = self._best_blowup(1 / precision)
+        self.integer_masses = [round(m * self.blowup) for m in self.masses]
+        if self.integer_masses[0] < 1:
+            raise ValueError("Precision is too coarse for the lightest element")
+        # Rounding error in integer units per u, bounding how far integer and real masses drift apart
+        errors = [(a - m * self.blowup) / m for a, m in zip(self.integer_masses, self.masses)]
+        self._min_error = min(errors)
+        self._max_error = max(errors)
+        self._table = self._residue_table()
+
+    def __repr__(self):
+        return f"MassDecomposer(alphabet={self.alphabet}, precision={self.precision})"
+
+    def _best_blowup(self, nominal, spread=0.01, candidates=20000):
+        """
+        Pick the scale factor within spread of nominal that minimizes the
+        worst relative rounding error of the element masses. Near-integer
+        scaled masses keep the integer search window, and so the number of
+        false candidates, small.
+        """
+        best, best_error = nominal, inf
+        for t in range(-candidates // 2, candidates // 2 + 1):
+            blowup = nominal * (1 + spread * 2 * t / candidates)
+            error = max(abs(round(m * blowup) - m * blowup) / m for m in self.masses) / blowup
+            if error < best_error:
+                best, best_error = blowup, error
+        return best
+
+    def _residue_table(self):
+        """
+        Build the extended residue table: table[i][r] is the smallest integer
+        mass congruent to r modulo the lightest mass that the first i + 1
+        elements can decompose (inf if none).
+        """
+        a0 = self.integer_masses[0]
+        row = [inf] * a0
+        row[0] = 0
+        table = [row]
+        for ai in self.integer_masses[1:]:
+            row = list(row)
+            d = gcd(a0, ai)
+            for p in range(d):
+                # Start each cycle of residues from its current minimum
+                n = min(row[r] for r in range(p, a0, d))
+                if n == inf:
+                    continue
+                for _ in range(a0 // d):
+                    n += ai
+                    r = n % a0
+                    n = min(n, row[r])
+                    row[r] = n
+            table.append(row)
+        return table
+
+    def _decompositions(self, mass, i, counts, limits):
+        """Yield every way to write integer mass with the first i + 1 elements (counts filled in place)."""
+        a0 = self.integer_masses[0]
+        if i == 0:
+            if mass % a0 == 0 and mass // a0 <= limits[0]:
+                counts[0] = mass // a0
+                yield counts
+            return
+        previous = self._table[i - 1]
+        step = self.integer_masses[i]
+        for j in range(limits[i] + 1):
+            if mass < 0:
+                break
+            if mass >= previous[mass % a0]:
+                counts[i] = j
+                yield from self._decompositions(mass, i - 1, counts, limits)
+            mass -= step
+        counts[i] = 0
+
+    def decompose(self, mass, tolerance=5.0, unit="ppm", bounds=None, rdbe_range=None, valence=False):
+        """
+        Lazily yield (formula, exact_mass) for every formula within tolerance
+        of mass, roughly nearest first.
+        bounds maps elements to (min, max) atom counts.
+        rdbe_range keeps formulas whose RDBE lies in an inclusive (low, high) range.
+        valence keeps only whole, non-negative RDBE values (even-electron molecules).
+        """
+        low, high = tolerance_window(mass, tolerance, unit)
+        k = len(self.alphabet)
+        minimum = [0] * k
+        limits = [int(high // m) for m in self.masses]
+        for element, (lo_count, hi_count) in (bounds or {}).items():
+            if element not in self.alphabet:
+                raise ValueError(f"Element {element} is not in the search alphabet")
+            i = self.alphabet.index(element)
+            minimum[i] = lo_count
+            limits[i] = min(limits[i], hi_count)
+        fixed = sum(n * m for n, m in zip(minimum, self.masses))
+        limits = [hi_count - lo_count for hi_count, lo_count in zip(limits, minimum)]
+        if any(limit < 0 for limit in limits) or high < fixed:
+            return
+
+        # Integer masses whose decompositions can land in [low, high] after rounding
+        low, high = low - fixed, high - fixed
+        b = self.blowup
+        first = ceil(max(0.0, low * b + min(low * self._min_error, high * self._min_error)))
+        last = floor(high * b + max(low * self._max_error, high * self._max_error))
+
+        top = self._table[-1]
+        a0 = self.integer_masses[0]
+        counts = [0] * k
+        # Integer masses nearest the target first, so the best matches come out early
+        center = (mass - fixed) * b
+        for integer_mass in sorted(range(first, last + 1), key=lambda n: abs(n - center)):
+            if integer_mass < top[integer_mass % a0]:
+                continue
+            for found in self._decompositions(integer_mass, k - 1, counts, limits):
+                exact = fixed + sum(n * m for n, m in zip(found, self.masses))
+                if not low + fixed <= exact <= high + fixed:
+                    continue
+                composition = {e: n + lo_count for e, n, lo_count in zip(self.alphabet, found, minimum)
+                               if n + lo_count}
+                if not composition:
+                    continue
+                if rdbe_range is not None or valence:
+                    value = rdbe(composition)
+                    if valence and (value < 0 or value != int(value)):
+                        continue
+                    if rdbe_range is not None and not rdbe_range[0] <= value <= rdbe_range[1]:
+                        continue
+                yield hill_formula(composition), exact
+
+
+# Decomposers by (alphabet, masses, precision), since building the table is the expensive part
+_decomposers = {}
+
+
+def decompose_mass(mass, tolerance=5.0, unit="ppm", alphabet=DEFAULT_ALPHABET, masses="monoisotopic",
+                   bounds=None, rdbe_range=None, valence=False, precision=DEFAULT_PRECISION):
+    """
+    Lazily yield (formula, exact_mass) for every formula over alphabet whose
+    mass is within tolerance of mass. See MassDecomposer.decompose.
+    """
+    key = (tuple(alphabet), masses, precision)
+    decomposer = _decomposers.get(key)
+    if decomposer is None:
+        decomposer = _decomposers[key] = MassDecomposer(alphabet, masses, precision)
+    return decomposer.decompose(mass, tolerance, unit, bounds=bounds, rdbe_range=rdbe_range, valence=valence)
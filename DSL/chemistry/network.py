@@ -0,0 +1,269 @@
+"""
+DSL/chemistry/network.py
+
+Represents large reaction networks (e.g. combustion mechanisms) as a sparse
+species x reactions stoichiometric matrix stored in CSR form on plain NumPy
+arrays, with bulk operations over every reaction at once.
+"""
+
+import numpy as np
+from DSL.chemistry import vectors
+from DSL.chemistry.compounds import Compound
+from DSL.chemistry.elements import SYMBOLS
+from DSL.chemistry.balancer import CHARGE_ROW, parse_equation
+
+# Relative residual norm below which a reaction counts as a combination of earlier ones
+RANK_TOLERANCE = 1e-9
+
+
+class CSRMatrix:
+    """
+    Compressed sparse row matrix: row i holds data[indptr[i]:indptr[i + 1]]
+    at the columns indices[indptr[i]:indptr[i + 1]].
+    """
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+
+    @classmethod
+    def from_coo(cls, rows, cols, data, shape):
+        """Build a CSR matrix from coordinate triplets, summing duplicates and dropping zeros."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        data = np.asarray(data, dtype=np.int64)
+        if len(data):
+            keys = rows * shape[1] + cols
+            order = np.argsort(keys, kind='stable')
+            keys, data = keys[order], data[order]
+            unique, starts = np.unique(keys, return_index=True)
+            data = np.add.reduceat(data, starts)
+            keep = data != 0
+            unique, data = unique[keep], data[keep]
+            rows, cols = unique // shape[1], unique % shape[1]
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(indptr, cols, data, shape)
+
+    def __repr__(self):
+        return f"CSRMatrix(shape={self.shape}, nnz={self.nnz})"
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def row_indices(self):
+        """Return the row index of every stored entry."""
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def row(self, i):
+        """Return (columns, values) of the stored entries in row i."""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def dot(self, vector):
+        """Matrix-vector product."""
+        products = self.data * np.asarray(vector)[self.indices]
+        return np.bincount(self.row_indices(), weights=products, minlength=self.shape[0])
+
+    def left_multiply(self, dense):
+        """Compute dense @ self for a dense (k x rows) array."""
+        dense = np.asarray(dense)
+        contributions = dense[:, self.row_indices()] * self.data
+        result = np.zeros((dense.shape[0], self.shape[1]), dtype=np.int64)
+        for k in range(dense.shape[0]):
+            result[k] = np.bincount(self.indices, weights=contributions[k], minlength=self.shape[1])
+        return result
+
+    def dense_rows(self, start, stop):
+        """Return rows start:stop as a dense NumPy array."""
+        lo, hi = self.indptr[start], self.indptr[stop]
+        dense = np.zeros((stop - start, self.shape[1]), dtype=self.data.dtype)
+        rows = np.repeat(np.arange(stop - start), np.diff(self.indptr[start:stop + 1]))
+        dense[rows, self.indices[lo:hi]] = self.data[lo:hi]
+        return dense
+
+    def transpose(self):
+        """Return the transpose as a new CSR matrix."""
+        return CSRMatrix.from_coo(self.indices, self.row_indices(), self.data,
+                                  (self.shape[1], self.shape[0]))
+
+    def toarray(self):
+        """Return the matrix as a dense NumPy array."""
+        dense = np.zeros(self.shape, dtype=self.data.dtype)
+        dense[self.row_indices(), self.indices] = self.data
+        return dense
+
+
+class ReactionNetwork:
+    """
+    A set of reactions over a shared species index.
+    Species are keyed by formula (charge included) and parsed once; each
+    reaction is a column of the stoichiometric matrix with products positive
+    and reactants negative.
+    """
+
+    def __init__(self):
+        self.species = []          # formula of each species row
+        self.species_index = {}    # formula -> row
+        self.reactions = []        # name of each reaction column
+        self.reaction_index = {}   # name -> column
+        self._compounds = []
+        self._rows = []
+        self._cols = []
+        self._data = []
+        self._matrix = None
+
+    def __repr__(self):
+        return f"ReactionNetwork(species={len(self.species)}, reactions={len(self.reactions)})"
+
+    def __len__(self):
+        return len(self.reactions)
+
+    @classmethod
+    def from_equations(cls, equations):
+        """Build a network from equation strings such as 'H + O2 -> OH + O'."""
+        network = cls()
+        for equation in equations:
+            network.add_equation(equation)
+        return network
+
+    def _species_row(self, compound):
+        formula = compound.formula if hasattr(compound, 'formula') else str(compound).strip()
+        row = self.species_index.get(formula)
+        if row is None:
+            row = len(self.species)
+            self.species_index[formula] = row
+            self.species.append(formula)
+            self._compounds.append(compound if hasattr(compound, 'composition') else Compound(formula))
+        return row
+
+    def add_reaction(self, reactants, products, name=None):
+        """
+        Add a reaction given lists of (coefficient, compound) tuples, where a
+        compound may also be a formula string. Returns its column index.
+        """
+        column = len(self.reactions)
+        name = name if name is not None else f"R{column + 1}"
+        if name in self.reaction_index:
+            raise ValueError(f"Duplicate reaction name: {name}")
+
+        for sign, side in ((-1, reactants), (1, products)):
+            for coeff, compound in side:
+                self._rows.append(self._species_row(compound))
+                self._cols.append(column)
+                self._data.append(sign * coeff)
+
+        self.reaction_index[name] = column
+        self.reactions.append(name)
+        self._matrix = None
+        return column
+
+    def add_equation(self, equation, name=None):
+        """Add a reaction written as an equation string. Returns its column index."""
+        reactants, products = parse_equation(equation)
+        return self.add_reaction(reactants, products, name=name)
+
+    def stoichiometric_matrix(self):
+        """Return the species x reactions stoichiometric matrix in CSR form."""
+        if self._matrix is None:
+            self._matrix = CSRMatrix.from_coo(self._rows, self._cols, self._data,
+                                              (len(self.species), len(self.reactions)))
+        return self._matrix
+
+    def element_matrix(self):
+        """
+        Return (elements, matrix) where matrix is the dense elements x species
+        composition array, elements in atomic-number order. Net charge is
+        included as the CHARGE_ROW row when any species is charged.
+        """
+        matrix = vectors.stack([compound.vector for compound in self._compounds]).astype(np.int64)
+        present = np.flatnonzero(matrix[1:].any(axis=1)) + 1
+        elements = [SYMBOLS[z - 1] for z in present]
+        if matrix[vectors.CHARGE_INDEX].any():
+            present = np.append(present, vectors.CHARGE_INDEX)
+            elements.append(CHARGE_ROW)
+        return elements, matrix[present]
+
+    def imbalance(self):
+        """
+        Return (elements, residual) where residual[e, r] is the net amount of
+        element e produced by reaction r; zero everywhere for a balanced network.
+        """
+        elements, composition = self.element_matrix()
+        return elements, self.stoichiometric_matrix().left_multiply(composition)
+
+    def check_mass_balance(self):
+        """Return a boolean array telling, per reaction, whether every element is conserved."""
+        _, residual = self.imbalance()
+        return ~residual.any(axis=0)
+
+    def unbalanced_reactions(self):
+        """Return the names of reactions that do not conserve every element and charge."""
+        balanced = self.check_mass_balance()
+        return [self.reactions[r] for r in np.flatnonzero(~balanced)]
+
+    def conservation_laws(self):
+        """
+        Return (elements, laws) for the element conservation laws of the network.
+        laws is the sub-array of element_matrix() rows whose weighted species
+        totals every reaction leaves unchanged.
+        """
+        elements, residual = self.imbalance()
+        conserved = ~residual.any(axis=1)
+        _, composition = self.element_matrix()
+        return [e for e, ok in zip(elements, conserved) if ok], composition[conserved]
+
+    def _pivot_columns(self, block_size=256):
+        """
+        Find the reactions independent of the earlier ones by orthogonalizing
+        the stoichiometric columns in reaction order. Columns are projected
+        against the accepted basis a block at a time (matrix products), then
+        against each other; a column whose residual norm falls below
+        RANK_TOLERANCE times its own norm is dependent.
+        """
+        transposed = self.stoichiometric_matrix().transpose()
+        n_reactions, n_species = transposed.shape
+        basis = np.zeros((min(n_reactions, n_species), n_species))
+        rank = 0
+        independent = []
+
+        for start in range(0, n_reactions, block_size):
+            stop = min(start + block_size, n_reactions)
+            block = transposed.dense_rows(start, stop).astype(float)
+            norms = np.linalg.norm(block, axis=1)
+            accepted = basis[:rank]
+            # Project twice so that rounding left by the first pass is removed
+            for _ in range(2):
+                block -= (block @ accepted.T) @ accepted
+
+            for i in range(stop - start):
+                vector = block[i]
+                length = np.linalg.norm(vector)
+                if length <= RANK_TOLERANCE * max(norms[i], 1.0):
+                    continue
+                vector = vector / length
+                vector -= basis[:rank].T @ (basis[:rank] @ vector)
+                vector /= np.linalg.norm(vector)
+                basis[rank] = vector
+                rank += 1
+                independent.append(start + i)
+                rest = block[i + 1:]
+                rest -= np.outer(rest @ vector, vector)
+                if rank == len(basis):
+                    return independent
+        return independent
+
+    def rank(self):
+        """Return the rank of the stoichiometric matrix."""
+        return len(self._pivot_columns())
+
+    def independent_reactions(self):
+        """
+        Return the names of a maximal linearly independent subset of reactions,
+        preferring earlier reactions. Every other reaction is a linear
+        combination of these.
+        """
+        return [self.reactions[r] for r in self._pivot_columns()]
@@ -4,7 +4,9 @@ DSL/chemistry/reactions.py
 Defines the Reaction class and functions for predicting reactions.
 """
 
-from DSL.chemistry.compounds import Compound, parse_formula
+from DSL.chemistry.compounds import Compound, canonical_formula
+from DSL.chemistry.balancer import BalanceProblem
+from DSL.chemistry.knowledge_base import knowledge_base
 
 class Reaction:
     def __init__(self, reactants: list, products: list):
@@ -21,22 +23,10 @@ class Reaction:
 
     def is_balanced(self):
         """Check if the reaction is balanced."""
-        # Get all elements involved in the reaction
-        elements = set()
-        for _, comp in self.reactants + self.products:
-            elements.update(parse_formula(comp.formula).keys())
-
-        # For each element, check if it's balanced
-        for element in elements:
-            left_count = sum(coeff * parse_formula(comp.formula).get(element, 0)
-                             for coeff, comp in self.reactants)
-            right_count = sum(coeff * parse_formula(comp.formula).get(element, 0)
-                              for coeff, comp in self.products)
-
-            if left_count != right_count:
-                return False
-
-        return True
+        # Each species is parsed once; the written coefficients are already
+        # folded into the composition matrix, so every multiplier is 1.
+        problem = BalanceProblem(self.reactants, self.products)
+        return problem.is_balanced([1] * problem.n_species)
 
 def predict_reaction(reactants: list):
     """
@@ -46,7 +36,13 @@ def predict_reaction(reactants: list):
     - Metal oxide formation
     - Acids and bases
     - Simple synthesis reactions
+    Known reactions from the knowledge base take precedence over the rules,
+    except production methods of other compounds, which are tried last.
     """
+    known = _known_reaction(reactants, max_priority=1)
+    if known is not None:
+        return known
+
     # Check for specific reaction patterns and handle them
 
     # 1. Hydrogen combustion: 2H2 + O2 -> 2H2O
@@ -101,9 +97,9 @@ def predict_reaction(reactants: list):
     #    Validated Synthesis Reactions
     if len(reactants) == 2:
         # Check if both reactants are elements (e.g., Na + Cl)
-        if all(len(parse_formula(r.formula)) == 1 for r in reactants):
-            elem1 = list(parse_formula(reactants[0].formula).keys())[0]  # e.g., "Na"
-            elem2 = list(parse_formula(reactants[1].formula).keys())[0]  # e.g., "Cl"
+        if all(len(r.composition) == 1 for r in reactants):
+            elem1 = list(reactants[0].composition.keys())[0]  # e.g., "Na"
+            elem2 = list(reactants[1].composition.keys())[0]  # e.g., "Cl"
 
             # Get valencies from a predefined dictionary (add this to elements.py)
             valency = {
@@ -141,7 +137,7 @@ def predict_reaction(reactants: list):
 
         if metal and compound:
             # Extract metal from compound (e.g., "Cu" from "CuSO4")
-            compound_elements = parse_formula(compound.formula)
+            compound_elements = compound.composition
             displaced_metal = next((elem for elem in compound_elements if _is_metal(elem)), None)
 
             # Check reactivity
@@ -191,6 +187,26 @@ def predict_reaction(reactants: list):
                 products=[(2, hydroxide), (1, Compound("H2"))]
             )
 
+    # 9. A production method of another compound that starts from these reactants
+    return _known_reaction(reactants)
+
+
+def _known_reaction(reactants, max_priority=None):
+    """
+    The best-ranked known reaction that starts from exactly these reactants
+    (see ReactionIndex.from_reactants), ignoring sources whose priority is
+    above max_priority, with the caller's compounds in place of the
+    knowledge base's spellings.
+    """
+    matches = [(known, direction) for known, direction in knowledge_base().from_reactants(reactants)
+               if max_priority is None or known.priority <= max_priority]
+    if not matches:
+        return None
+    known, direction = matches[0]
+    reaction = known.reaction(direction)
+    given = {canonical_formula(r): r for r in reactants}
+    reaction.reactants = [(coeff, given.get(canonical_formula(c), c)) for coeff, c in reaction.reactants]
+    return reaction
 
 def _contains_compounds(compounds, formulas):
     """Check if the list of compounds contains all the specified formulas."""
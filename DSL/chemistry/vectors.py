@@ -0,0 +1,138 @@
+"""
+DSL/chemistry/vectors.py
+
+Dense composition vectors: a fixed-length integer vector indexed by atomic
+number, with the net charge kept in slot 0. Vectors are NumPy int32 arrays
+when NumPy is installed and array('i') otherwise, and support element-wise
+add, scale and compare plus molar mass and balance checks without touching
+symbol dictionaries. NumPy is imported on first use, not with this module.
+"""
+
+from array import array
+from DSL.chemistry.elements import SYMBOLS, ATOMIC_NUMBERS, atomic_weights
+
+# The numpy module once imported, or False when it is not installed
+_np = None
+
+
+def numpy():
+    """Return the numpy module, importing it on first use, or None when it is not installed."""
+    global _np
+    if _np is None:
+        try:
+            import numpy as np
+        except ImportError:  # NumPy is optional; vectors fall back to array('i')
+            np = False
+        _np = np
+    return _np or None
+
+VECTOR_LENGTH = len(SYMBOLS) + 1
+CHARGE_INDEX = 0
+
+# Atomic weight by atomic number, built on first use so importing stays cheap
+_WEIGHTS = None
+
+
+def _weights():
+    """Return the atomic-weight vector, as a NumPy array when NumPy is available."""
+    global _WEIGHTS
+    if _WEIGHTS is None:
+        np = numpy()
+        _WEIGHTS = np.array(atomic_weights()) if np is not None else atomic_weights()
+    return _WEIGHTS
+
+
+def zeros():
+    """Return an all-zero composition vector."""
+    np = numpy()
+    if np is not None:
+        return np.zeros(VECTOR_LENGTH, dtype=np.int32)
+    return array('i', bytes(4 * VECTOR_LENGTH))
+
+
+def to_vector(composition, charge=0):
+    """Convert an element -> count mapping (and a net charge) to a vector."""
+    vector = zeros()
+    for element, count in composition.items():
+        vector[ATOMIC_NUMBERS[element]] += count
+    vector[CHARGE_INDEX] = charge
+    return vector
+
+
+def from_vector(vector):
+    """
+    Convert a vector back to (composition, charge), with the composition
+    dict in atomic-number order.
+    """
+    composition = {SYMBOLS[z - 1]: int(vector[z]) for z in range(1, VECTOR_LENGTH) if vector[z]}
+    return composition, int(vector[CHARGE_INDEX])
+
+
+def add(a, b):
+    """Element-wise sum of two vectors."""
+    np = numpy()
+    if np is not None:
+        return np.add(a, b, dtype=np.int32)
+    return array('i', (x + y for x, y in zip(a, b)))
+
+
+def subtract(a, b):
+    """Element-wise difference of two vectors."""
+    np = numpy()
+    if np is not None:
+        return np.subtract(a, b, dtype=np.int32)
+    return array('i', (x - y for x, y in zip(a, b)))
+
+
+def scale(vector, factor):
+    """Multiply every count (and the charge) by an integer factor."""
+    np = numpy()
+    if np is not None:
+        return np.multiply(vector, factor, dtype=np.int32)
+    return array('i', (x * factor for x in vector))
+
+
+def equal(a, b):
+    """Check whether two vectors hold the same counts and charge."""
+    np = numpy()
+    if np is not None:
+        return bool(np.array_equal(a, b))
+    return a == b
+
+
+def combine(terms):
+    """Return the sum of coeff * vector over (coeff, vector) pairs."""
+    total = zeros()
+    for coeff, vector in terms:
+        total = add(total, scale(vector, coeff))
+    return total
+
+
+def is_balanced(reactants, products, coeffs):
+    """
+    Check a reaction given lists of reactant and product vectors and one
+    coefficient per species (reactants first). Charge must balance too.
+    """
+    n = len(reactants)
+    left = combine(zip(coeffs[:n], reactants))
+    right = combine(zip(coeffs[n:], products))
+    return equal(left, right)
+
+
+def molar_mass(vector):
+    """Molar mass of the composition in g/mol; the charge slot is ignored."""
+    weights = _weights()
+    np = numpy()
+    if np is not None:
+        return float(weights[1:] @ np.asarray(vector[1:], dtype=float))
+    return sum(w * c for w, c in zip(weights[1:], vector[1:]))
+
+
+def stack(vectors):
+    """Stack vectors as the columns of a (VECTOR_LENGTH x n) NumPy matrix."""
+    np = numpy()
+    if np is None:
+        raise ImportError("stack() requires NumPy")
+    if not len(vectors):
+        return np.zeros((VECTOR_LENGTH, 0), dtype=np.int32)
+    return np.stack([np.asarray(v, dtype=np.int32) for v in vectors], axis=1)
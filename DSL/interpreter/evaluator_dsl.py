@@ -5,18 +5,37 @@ Implements the Evaluator that traverses the AST and executes the ChemDSL program
 """
 
 from DSL.ast_nodes import nodes
-from DSL.chemistry import balancer, reactions, compounds, ELEMENTS
-from DSL.chemistry.elements import COMPOUNDS
+from DSL.chemistry import (balancer, balance_cache, reactions, compounds, compound_db, formatting, mass_search,
+                           elemental_analysis, knowledge_base, ELEMENTS)
+from itertools import islice
+from DSL.chemistry.elements import get_compound, get_element
 from DSL.interpreter.enviroment_dsl import Environment
 from DSL.utils.error_handler import ErrorHandler
 import logging
 
 
 class Evaluator:
-    def __init__(self):
+    def __init__(self, cache=None, balance_timeout=None, balance_max_operations=None, cancel_token=None):
         self.env = Environment()
         from DSL.utils.error_handler import ErrorHandler
         self.error_handler = ErrorHandler()
+        # Balancing results are shared across evaluators unless a cache is supplied
+        self.cache = cache if cache is not None else balance_cache.get_default_cache()
+        # Default budgets for every balancing call in a program, so one bad line can't starve the rest
+        self.balance_timeout = balance_timeout
+        self.balance_max_operations = balance_max_operations
+        self.cancel_token = cancel_token
+
+    def set_budgets(self, timeout=None, max_operations=None, cancel_token=None):
+        """Set the default time (seconds) and operation budgets for balancing calls."""
+        self.balance_timeout = timeout
+        self.balance_max_operations = max_operations
+        if cancel_token is not None:
+            self.cancel_token = cancel_token
+
+    def _budget(self):
+        """A new Budget with the default limits, shared by every balancing call of one statement."""
+        return balancer.Budget(self.balance_timeout, self.balance_max_operations, self.cancel_token)
 
     def evaluate(self, node):
         try:
@@ -43,60 +62,76 @@ class Evaluator:
                 results.append(result)
         return "\n".join(str(r) for r in results)
 
-    # In evaluator_dsl.py
     def format_formula(self, formula: str) -> str:
-        """Convert formulas like 'CuN2O6' to 'Cu(NO3)2'."""
-        from collections import defaultdict
-        import re
+        """Convert formulas like 'CuN2O6' to 'Cu(NO3)2'; molecular formulas are left as written."""
+        return formatting.format_formula(formula)
 
-        # Split formula into elements and counts (e.g., [('Cu', 1), ('N', 2), ('O', 6)])
-        elements = re.findall(r'([A-Z][a-z]*)(\d*)', formula)
-        elements = [(elem, int(count) if count else 1) for elem, count in elements]
+    def format_balanced(self, reactants, products, coeffs):
+        """Format a reaction with balancing multipliers applied to its written coefficients."""
+        balanced_reactants = []
+        for i, (orig_coeff, compound) in enumerate(reactants):
+            new_coeff = coeffs[i] * orig_coeff
+            formula = self.format_formula(compound.formula)  # Apply formatting
+            balanced_reactants.append(f"{new_coeff if new_coeff != 1 else ''}{formula}")
 
-        # Find the greatest common divisor (GCD) of counts
-        counts = [count for _, count in elements[1:]]  # Skip the first element (e.g., Cu)
-        if not counts:
-            return formula
+        balanced_products = []
+        for j, (orig_coeff, compound) in enumerate(products):
+            new_coeff = coeffs[len(reactants) + j] * orig_coeff
+            formula = self.format_formula(compound.formula)  # Apply formatting
+            balanced_products.append(f"{new_coeff if new_coeff != 1 else ''}{formula}")
 
-        from math import gcd
-        common_divisor = counts[0]
-        for count in counts[1:]:
-            common_divisor = gcd(common_divisor, count)
-
-        # If a common divisor exists, format as a subgroup
-        if common_divisor > 1:
-            subgroup = "".join([f"{elem}{count // common_divisor}" for elem, count in elements[1:]])
-            return f"{elements[0][0]}({subgroup}){common_divisor}"
-        return formula
+        return f"{' + '.join(balanced_reactants)} → {' + '.join(balanced_products)}"
 
     def eval_BalanceStatementNode(self, node):
         try:
             reaction = self.eval_ReactionExpressionNode(node.reaction_expr)
             reactants = [(coeff, compound) for coeff, compound in reaction.reactants]
             products = [(coeff, compound) for coeff, compound in reaction.products]
-            coeffs = balancer.balance_reaction(reactants, products)
+            budget = self._budget()
+            if node.all_solutions:
+                return self.balance_all(reactants, products, budget=budget)
+
+            coeffs = self.cache.balance_reaction(reactants, products, budget=budget)
+            if isinstance(coeffs, balancer.BudgetExceeded):
+                return f"Balancing stopped: {coeffs}."
             if not coeffs:
+                diagnosis = balancer.diagnose_reaction(reactants, products, budget=budget)
+                if isinstance(diagnosis, balancer.BudgetExceeded):
+                    return f"Balancing stopped: {diagnosis}."
+                if diagnosis:
+                    return f"Could not balance reaction: {diagnosis}."
                 return "Could not balance reaction."
 
-            # Format formulas with parentheses
-            balanced_reactants = []
-            for i, (orig_coeff, compound) in enumerate(reactants):
-                new_coeff = coeffs[i] * orig_coeff
-                formula = self.format_formula(compound.formula)  # Apply formatting
-                balanced_reactants.append(f"{new_coeff if new_coeff != 1 else ''}{formula}")
-
-            balanced_products = []
-            for j, (orig_coeff, compound) in enumerate(products):
-                new_coeff = coeffs[len(reactants) + j] * orig_coeff
-                formula = self.format_formula(compound.formula)  # Apply formatting
-                balanced_products.append(f"{new_coeff if new_coeff != 1 else ''}{formula}")
-
-            return f"Balanced Reaction: {' + '.join(balanced_reactants)} → {' + '.join(balanced_products)}"
+            return f"Balanced Reaction: {self.format_balanced(reactants, products, coeffs)}"
 
         except Exception as e:
             self.error_handler.add_error(f"Balance error: {str(e)}")
             return f"Balance failed: {str(e)}"
 
+    def balance_all(self, reactants, products, limit=10, budget=None):
+        """
+        List the independent balancings of a reaction and its first positive
+        ones. The three balancer calls share one budget.
+        """
+        budget = budget if budget is not None else self._budget()
+        diagnosis = balancer.diagnose_reaction(reactants, products, budget=budget)
+        if isinstance(diagnosis, balancer.BudgetExceeded):
+            return f"Balancing stopped: {diagnosis}."
+        if diagnosis:
+            return f"Could not balance reaction: {diagnosis}."
+
+        basis = balancer.balance_all(reactants, products, budget=budget)
+        if isinstance(basis, balancer.BudgetExceeded):
+            return f"Balancing stopped: {basis}."
+        lines = [f"Balanced Reactions ({len(basis)} independent solution{'s' if len(basis) != 1 else ''}):"]
+        balancings = balancer.enumerate_balancings(reactants, products, limit=limit, budget=budget)
+        for k, coeffs in enumerate(balancings, 1):
+            if isinstance(coeffs, balancer.BudgetExceeded):
+                lines.append(f"Balancing stopped: {coeffs}.")
+                break
+            lines.append(f"  {k}. {self.format_balanced(reactants, products, coeffs)}")
+        return "\n".join(lines)
+
     def eval_PredictStatementNode(self, node):
         print("\n=== EVALUATION ===")
         print("Evaluating PredictStatementNode")
@@ -134,8 +169,9 @@ class Evaluator:
             if len(elements) == 1:
                 # Element analysis
                 element_symbol = list(elements)[0]
-                element_data = ELEMENTS.get(element_symbol)
-                if not element_data:
+                try:
+                    element_data = get_element(element_symbol)
+                except ValueError:
                     raise ValueError(f"Element '{element_symbol}' not found.")
 
                 result = {
@@ -161,29 +197,33 @@ class Evaluator:
                     'detail_level': node.detail_level
                 }
 
-                # Add additional compound information if available
-                if formula in COMPOUNDS:
-                    compound_data = COMPOUNDS[formula]
+                # Add additional compound information if available, under any spelling
+                try:
+                    compound_data = get_compound(formula)
+                except ValueError:
+                    compound_data = None
+                if compound_data is not None:
                     # Only add detailed info if detail_level is 'all'
                     if node.detail_level == 'all':
+                        # Catalog records may leave some fields out
                         result.update({
-                            'name': compound_data['name'],
-                            'state': compound_data['state'],
-                            'classification': compound_data['classification'],
-                            'density': compound_data['density'],
-                            'melting_point': compound_data['melting_point'],
-                            'boiling_point': compound_data['boiling_point'],
-                            'solubility': compound_data['solubility'],
-                            'acidity': compound_data['acidity'],
-                            'common_uses': compound_data['common_uses'],
-                            'hazards': compound_data['hazards']
+                            'name': compound_data.get('name', 'N/A'),
+                            'state': compound_data.get('state', 'N/A'),
+                            'classification': compound_data.get('classification', 'N/A'),
+                            'density': compound_data.get('density', 'N/A'),
+                            'melting_point': compound_data.get('melting_point', 'N/A'),
+                            'boiling_point': compound_data.get('boiling_point', 'N/A'),
+                            'solubility': compound_data.get('solubility', 'N/A'),
+                            'acidity': compound_data.get('acidity', 'N/A'),
+                            'common_uses': compound_data.get('common_uses', []),
+                            'hazards': compound_data.get('hazards', [])
                         })
                     # Always add name and basic info even for basic detail level
                     else:
                         result.update({
-                            'name': compound_data['name'],
-                            'state': compound_data['state'],
-                            'classification': compound_data['classification']
+                            'name': compound_data.get('name', 'N/A'),
+                            'state': compound_data.get('state', 'N/A'),
+                            'classification': compound_data.get('classification', 'N/A')
                         })
 
             return result
@@ -382,6 +422,8 @@ class Evaluator:
             if isinstance(target, compounds.Compound):
                 empirical_formula = self.calculate_empirical_formula(target)
                 return f"Empirical Formula of {target.formula}: {empirical_formula}"
+            elif isinstance(node.target, nodes.PercentCompositionNode):
+                return self.formulas_from_percentages(node.target)
             else:
                 return f"Empirical formula can only be calculated for compounds."
 
@@ -403,6 +445,68 @@ class Evaluator:
         else:
             return f"Unknown analysis type: {analysis_type}"
 
+    def eval_FormulaQueryNode(self, node, limit=20, scan=1000):
+        """List the chemically valid formulas matching a mass, closest first."""
+        matches = list(islice(mass_search.decompose_mass(node.mass, node.tolerance, node.unit, valence=True), scan))
+        if not matches:
+            return f"No formulas match {node.mass} ± {node.tolerance} {node.unit}."
+        matches.sort(key=lambda match: abs(match[1] - node.mass))
+        lines = [f"Formulas matching {node.mass} ± {node.tolerance} {node.unit} ({len(matches)}{'+' if len(matches) == scan else ''} found):"]
+        for formula, mass in matches[:limit]:
+            error = (mass - node.mass) / node.mass * 1e6
+            lines.append(f"  {formula}  {mass:.5f}  ({error:+.1f} ppm)")
+        return "\n".join(lines)
+
+    def eval_CompoundQueryNode(self, node):
+        """List the known compounds matching every filter of a compound query, lightest first."""
+        filters = []
+        if node.elements:
+            filters.append("with " + ", ".join(node.elements))
+        if node.state:
+            filters.append(f"state {node.state}")
+        if node.classification:
+            filters.append(f"classification '{node.classification}'")
+        filters.extend(f"molar mass {op} {value}" for op, value in node.mass)
+        description = " and ".join(filters) or "in the database"
+
+        matches = compound_db.compound_db().query(node.elements, node.state, node.classification, node.mass)
+        if not matches:
+            return f"No compounds {description}."
+        lines = [f"Compounds {description} ({len(matches)} found):"]
+        for formula, record in matches:
+            lines.append(f"  {formula}  {record.get('name', '')}  {record['molar_mass']:.3f} g/mol")
+        return "\n".join(lines)
+
+    def eval_ReactionQueryNode(self, node):
+        """List the known reactions that involve a compound, as reactant or product."""
+        formula = self.evaluate(node.molecule).formula
+        known = knowledge_base.knowledge_base().involving(formula)
+        if not known:
+            return f"No known reactions involve {formula}."
+        lines = [f"Known reactions involving {formula} ({len(known)} found):"]
+        for reaction in known:
+            lines.append(f"  {reaction.equation}" + (f"  ({reaction.label})" if reaction.label else ""))
+        return "\n".join(lines)
+
+    def eval_PercentCompositionNode(self, node):
+        return node
+
+    def formulas_from_percentages(self, node, limit=5):
+        """List the best-fitting formulas for measured mass percentages."""
+        analysis = ", ".join(f"{element} {percent}%" for element, percent in node.percentages.items())
+        if node.molar_mass is not None:
+            analysis += f" (M = {node.molar_mass} g/mol)"
+        candidates = elemental_analysis.formulas_from_percentages(node.percentages, node.molar_mass, limit=limit)
+        if not candidates:
+            return f"No formula fits {analysis}."
+        lines = [f"Candidate formulas for {analysis}:"]
+        for k, (empirical, molecular, error) in enumerate(candidates, 1):
+            if molecular is not None:
+                lines.append(f"  {k}. {molecular} (empirical {empirical}, error {error:.2f}%)")
+            else:
+                lines.append(f"  {k}. {empirical} (error {error:.2f}%)")
+        return "\n".join(lines)
+
     def calculate_oxidation_states(self, compound):
         """Calculate oxidation states for a compound."""
         # Example implementation (simplified)
@@ -523,6 +627,9 @@ class Evaluator:
         if node.multiplier != 1:
             formula = f"({formula}){node.multiplier}"
 
+        # Ions carry their charge in caret notation, e.g. MnO4^-
+        formula += compounds.format_charge(node.charge)
+
         # Create a Compound object
         try:
             return compounds.Compound(formula)
@@ -530,9 +637,12 @@ class Evaluator:
             self.error_handler.add_error(f"Invalid molecule: {formula}. {str(e)}")
             raise
 
+    def eval_ElectronNode(self, node):
+        return compounds.Compound(compounds.ELECTRON_FORMULAS[0])
+
     def eval_ElementGroupNode(self, node):
         # Check if element exists in the periodic table
-        if node.symbol not in compounds.ELEMENTS:
+        if node.symbol not in ELEMENTS:
             self.error_handler.add_error(f"Unknown element symbol: {node.symbol}")
 
         # Return element symbol with count
@@ -42,6 +42,7 @@ tokens = (
     'EQUALS', 'LPAREN', 'RPAREN', 'LBRACKET', 'RBRACKET',
     'LBRACE', 'RBRACE', 'COMMA', 'SEMICOLON',
     'CARET', 'ASSIGN',
+    'LT', 'LE', 'GT', 'GE',
 
     # Special tokens for charge notation
     'POSITIVE', 'NEGATIVE',
@@ -63,6 +64,10 @@ t_COMMA = r','
 t_SEMICOLON = r';'
 t_CARET = r'\^'
 t_ASSIGN = r'='
+t_LT = r'<'
+t_LE = r'<='
+t_GT = r'>'
+t_GE = r'>='
 t_POSITIVE = r'\+'
 t_NEGATIVE = r'-'
 
@@ -145,6 +150,12 @@ def t_ELEMENT_SYMBOL(t):
     t.type = 'ELEMENT_SYMBOL'
     return t
 
+# Must come before t_INTEGER: PLY tries function rules in definition order
+def t_FLOAT(t):
+    r'\d+\.\d*'
+    t.value = float(t.value)
+    return t
+
 def t_INTEGER(t):
     r'\d+'
     t.value = int(t.value)
@@ -156,11 +167,6 @@ def t_IDENTIFIER(t):
     t.type = keywords.get(t.value, 'IDENTIFIER')  # Look up in keywords dictionary
     return t
 
-def t_FLOAT(t):
-    r'\d+\.\d*'
-    t.value = float(t.value)
-    return t
-
 def t_STRING(t):
     r'"[^"]*"'
     t.value = t.value[1:-1]  # Remove quotes
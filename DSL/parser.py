@@ -25,14 +25,22 @@ def p_statement(p):
                  | analyze_statement
                  | reaction_type_statement
                  | thermodynamic_statement
-                 | chemical_analysis_statement"""
+                 | chemical_analysis_statement
+                 | query_statement"""
     p[0] = p[1]
 
 
 def p_balance_statement(p):
-    """balance_statement : BALANCE reaction_expr"""
+    """balance_statement : BALANCE reaction_expr
+                         | BALANCE reaction_expr IDENTIFIER"""
     print(f"[Parser] Building BalanceStatementNode")
-    p[0] = nodes.BalanceStatementNode(p[2])
+    all_solutions = False
+    if len(p) > 3:
+        if p[3] == 'all':
+            all_solutions = True
+        else:
+            raise SyntaxError(f"Invalid balance specifier: {p[3]}. Use 'all'.")
+    p[0] = nodes.BalanceStatementNode(p[2], all_solutions=all_solutions)
 
 def p_predict_statement(p):
     """predict_statement : PREDICT reaction_expr
@@ -147,9 +155,98 @@ def p_chemical_analysis_statement(p):
                                    | PERCENT_YIELD OF reaction_expr
                                    | EMPIRICAL_FORMULA OF molecule
                                    | MOLECULAR_FORMULA OF molecule
-                                   | MOLAR_MASS OF molecule"""
+                                   | MOLAR_MASS OF molecule
+                                   | EMPIRICAL_FORMULA OF percent_composition"""
     p[0] = nodes.ChemicalAnalysisNode(p[1].upper(), p[3])
 
+def p_percent_composition(p):
+    """percent_composition : LBRACKET percent_list RBRACKET
+                           | LBRACKET percent_list RBRACKET WITH MOLAR_MASS number"""
+    # empirical_formula of [C 40.0, H 6.7, O 53.3] with molar_mass 180.16;
+    p[0] = nodes.PercentCompositionNode(dict(p[2]), molar_mass=p[6] if len(p) > 4 else None)
+
+def p_percent_list(p):
+    """percent_list : ELEMENT_SYMBOL number
+                    | ELEMENT_SYMBOL number COMMA percent_list"""
+    p[0] = [(p[1], p[2])] + (p[4] if len(p) > 3 else [])
+
+def p_query_statement(p):
+    """query_statement : QUERY IDENTIFIER IDENTIFIER number
+                       | QUERY IDENTIFIER IDENTIFIER number IDENTIFIER number IDENTIFIER
+                       | QUERY COMPOUND
+                       | QUERY COMPOUND query_filters
+                       | QUERY REACTION WITH molecule"""
+    if p.slice[2].type == 'REACTION':
+        # query reaction with CaCO3;
+        p[0] = nodes.ReactionQueryNode(p[4])
+        return
+    if p.slice[2].type == 'COMPOUND':
+        # query compound with S, O and molar_mass < 100 and liquid;
+        p[0] = nodes.CompoundQueryNode()
+        for kind, value in (p[3] if len(p) > 3 else []):
+            if kind == 'elements':
+                p[0].elements.extend(value)
+            elif kind == 'mass':
+                p[0].mass.append(value)
+            elif getattr(p[0], kind) is not None:
+                raise SyntaxError(f"Duplicate {kind} filter in compound query.")
+            else:
+                setattr(p[0], kind, value)
+        return
+    # query formula mass 180.063 tol 5ppm;
+    if p[2] != 'formula' or p[3] != 'mass':
+        raise SyntaxError(f"Invalid query: {p[2]} {p[3]}. Use 'query formula mass <mass> [tol <value> ppm|da|mda]'.")
+    if len(p) > 5:
+        if p[5] != 'tol':
+            raise SyntaxError(f"Invalid query option: {p[5]}. Use 'tol'.")
+        if p[7] not in ('ppm', 'da', 'mda'):
+            raise SyntaxError(f"Invalid tolerance unit: {p[7]}. Use 'ppm', 'da' or 'mda'.")
+        p[0] = nodes.FormulaQueryNode(p[4], tolerance=p[6], unit=p[7])
+    else:
+        p[0] = nodes.FormulaQueryNode(p[4])
+
+def p_query_filters(p):
+    """query_filters : query_filter
+                     | query_filter AND query_filters"""
+    p[0] = [p[1]] + (p[3] if len(p) > 2 else [])
+
+def p_query_filter(p):
+    """query_filter : WITH element_list
+                    | SOLID
+                    | LIQUID
+                    | GAS
+                    | AQUEOUS
+                    | IDENTIFIER STRING
+                    | MOLAR_MASS comparison number"""
+    kind = p.slice[1].type
+    if kind == 'WITH':
+        p[0] = ('elements', p[2])
+    elif kind == 'IDENTIFIER':
+        if p[1] != 'classification':
+            raise SyntaxError(f"Invalid query filter: {p[1]}. Use 'classification \"<words>\"'.")
+        p[0] = ('classification', p[2])
+    elif kind == 'MOLAR_MASS':
+        p[0] = ('mass', (p[2], p[3]))
+    else:
+        p[0] = ('state', kind.lower())
+
+def p_element_list(p):
+    """element_list : ELEMENT_SYMBOL
+                    | ELEMENT_SYMBOL COMMA element_list"""
+    p[0] = [p[1]] + (p[3] if len(p) > 2 else [])
+
+def p_comparison(p):
+    """comparison : LT
+                  | LE
+                  | GT
+                  | GE"""
+    p[0] = p[1]
+
+def p_number(p):
+    """number : INTEGER
+              | FLOAT"""
+    p[0] = p[1]
+
 def p_reaction_expr(p):
     """reaction_expr : reactants_expr ARROW products_expr"""
     p[0] = nodes.ReactionExpressionNode(reactants=p[1], products=p[3])
@@ -168,8 +265,8 @@ def p_chemical_term_list(p):
     p[0] = [p[1]] + (p[3] if len(p) > 3 else [])
 
 def p_chemical_term(p):
-    """chemical_term : INTEGER molecule
-                     | molecule"""
+    """chemical_term : INTEGER species
+                     | species"""
     if len(p) == 3:
         if p[1] <= 0:
             raise SyntaxError("Coefficient must be a positive integer.")
@@ -177,6 +274,33 @@ def p_chemical_term(p):
     else:
         p[0] = nodes.ChemicalTermNode(coefficient=1, molecule=p[1])
 
+def p_species(p):
+    """species : molecule
+               | molecule charge
+               | IDENTIFIER CARET NEGATIVE
+               | IDENTIFIER NEGATIVE"""
+    if isinstance(p[1], nodes.MoleculeNode):
+        # Ions: e.g. MnO4^- or Fe^2+
+        if len(p) == 3:
+            p[1].charge = p[2]
+        p[0] = p[1]
+    elif p[1] == 'e':
+        # The electron as an explicit species: e^- or e-
+        p[0] = nodes.ElectronNode()
+    else:
+        raise SyntaxError(f"Invalid species: {p[1]}. Only 'e^-' may be written in lowercase.")
+
+def p_charge(p):
+    """charge : CARET PLUS
+              | CARET NEGATIVE
+              | CARET INTEGER PLUS
+              | CARET INTEGER NEGATIVE"""
+    magnitude = p[2] if len(p) == 4 else 1
+    sign = p[len(p) - 1]
+    if magnitude <= 0:
+        raise SyntaxError("Charge magnitude must be a positive integer.")
+    p[0] = magnitude if sign == '+' else -magnitude
+
 def p_molecule(p):
     """molecule : molecule_part molecule
                 | molecule_part"""
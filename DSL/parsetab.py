@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'ACID_BASE ALGEBRAIC ANALYZE AND AQUEOUS ARROW ASSIGN BALANCE CARET CATALYST COMBUSTION COMMA COMPOUND DECOMPOSITION DOUBLE_REPLACEMENT ELEMENT ELEMENT_SYMBOL EMPIRICAL_FORMULA ENTHALPY ENTROPY EQUALS EQUILIBRIUM FLOAT FOR GAS GAS_FORMATION GIBBS_ENERGY HALF_REACTION HEAT IDENTIFIER IF INFO INTEGER LBRACE LBRACKET LIMITING_REAGENT LIQUID LPAREN MOLARITY MOLAR_MASS MOLECULAR_FORMULA NEGATIVE NORMALITY OF OR OXIDATION_NUMBER OXIDATION_STATES PERCENT_YIELD PH PLUS POSITIVE PRECIPITATION PREDICT PRESSURE QUERY RBRACE RBRACKET REACTION REACTION_TYPE REDOX RESONANCE_ARROW REVERSIBLE_ARROW RPAREN SEMICOLON SINGLE_REPLACEMENT SOLID STRING TEMPERATURE TIME WITH YIELDprogram : statement_liststatement_list : statement SEMICOLON statement_list\n                     | statement SEMICOLONstatement : balance_statement\n                 | predict_statement\n                 | analyze_statement\n                 | reaction_type_statement\n                 | thermodynamic_statement\n                 | chemical_analysis_statementbalance_statement : BALANCE reaction_exprpredict_statement : PREDICT reaction_expr\n                         | PREDICT reaction_expr IF condition\n                         | PREDICT reactants_expr\n                         | PREDICT reactants_expr IF conditioncondition : condition AND condition\n                 | condition OR condition\n                 | CATALYST LPAREN ELEMENT_SYMBOL RPAREN\n                 | TEMPERATURE LPAREN INTEGER IDENTIFIER RPAREN\n                 | PRESSURE LPAREN INTEGER IDENTIFIER RPARENanalyze_statement : ANALYZE molecule\n                         | ANALYZE molecule FOR IDENTIFIERreaction_type_statement : COMBUSTION\n                               | DECOMPOSITION\n                               | SINGLE_REPLACEMENT\n                               | DOUBLE_REPLACEMENT\n                               | ACID_BASE\n                               | PRECIPITATION\n                               | GAS_FORMATION\n                               | COMBUSTION OF molecule\n                               | DECOMPOSITION OF molecule\n                               | SINGLE_REPLACEMENT OF molecule\n                               | DOUBLE_REPLACEMENT OF molecule\n                               | ACID_BASE OF molecule\n                               | PRECIPITATION OF molecule\n                               | GAS_FORMATION OF moleculethermodynamic_statement : ENTHALPY OF reaction_expr\n                               | ENTROPY OF reaction_expr\n                               | GIBBS_ENERGY OF reaction_expr\n                               | EQUILIBRIUM OF reaction_expr\n                               | ENTHALPY INFO reaction_expr\n                               | ENTROPY INFO reaction_expr\n                               | GIBBS_ENERGY INFO reaction_expr\n                               | EQUILIBRIUM INFO reaction_exprchemical_analysis_statement : OXIDATION_STATES OF molecule\n                                   | LIMITING_REAGENT OF reaction_expr\n                                   | PERCENT_YIELD OF reaction_expr\n                                   | EMPIRICAL_FORMULA OF molecule\n                                   | MOLECULAR_FORMULA OF molecule\n                                   | MOLAR_MASS OF moleculereaction_expr : reactants_expr ARROW products_exprreactants_expr : chemical_term_listproducts_expr : chemical_term_listchemical_term_list : chemical_term PLUS chemical_term_list\n                          | chemical_termchemical_term : INTEGER molecule\n                     | moleculemolecule : molecule_part molecule\n                | molecule_partmolecule_part : element_group\n                     | LPAREN molecule RPAREN INTEGERelement_group : ELEMENT_SYMBOL INTEGER\n                     | ELEMENT_SYMBOL'
+_lr_signature = 'ACID_BASE ALGEBRAIC ANALYZE AND AQUEOUS ARROW ASSIGN BALANCE CARET CATALYST COMBUSTION COMMA COMPOUND DECOMPOSITION DOUBLE_REPLACEMENT ELEMENT ELEMENT_SYMBOL EMPIRICAL_FORMULA ENTHALPY ENTROPY EQUALS EQUILIBRIUM FLOAT FOR GAS GAS_FORMATION GE GIBBS_ENERGY GT HALF_REACTION HEAT IDENTIFIER IF INFO INTEGER LBRACE LBRACKET LE LIMITING_REAGENT LIQUID LPAREN LT MOLARITY MOLAR_MASS MOLECULAR_FORMULA NEGATIVE NORMALITY OF OR OXIDATION_NUMBER OXIDATION_STATES PERCENT_YIELD PH PLUS POSITIVE PRECIPITATION PREDICT PRESSURE QUERY RBRACE RBRACKET REACTION REACTION_TYPE REDOX RESONANCE_ARROW REVERSIBLE_ARROW RPAREN SEMICOLON SINGLE_REPLACEMENT SOLID STRING TEMPERATURE TIME WITH YIELDprogram : statement_liststatement_list : statement SEMICOLON statement_list\n                     | statement SEMICOLONstatement : balance_statement\n                 | predict_statement\n                 | analyze_statement\n                 | reaction_type_statement\n                 | thermodynamic_statement\n                 | chemical_analysis_statement\n                 | query_statementbalance_statement : BALANCE reaction_expr\n                         | BALANCE reaction_expr IDENTIFIERpredict_statement : PREDICT reaction_expr\n                         | PREDICT reaction_expr IF condition\n                         | PREDICT reactants_expr\n                         | PREDICT reactants_expr IF conditioncondition : condition AND condition\n                 | condition OR condition\n                 | CATALYST LPAREN ELEMENT_SYMBOL RPAREN\n                 | TEMPERATURE LPAREN INTEGER IDENTIFIER RPAREN\n                 | PRESSURE LPAREN INTEGER IDENTIFIER RPARENanalyze_statement : ANALYZE molecule\n                         | ANALYZE molecule FOR IDENTIFIERreaction_type_statement : COMBUSTION\n                               | DECOMPOSITION\n                               | SINGLE_REPLACEMENT\n                               | DOUBLE_REPLACEMENT\n                               | ACID_BASE\n                               | PRECIPITATION\n                               | GAS_FORMATION\n                               | COMBUSTION OF molecule\n                               | DECOMPOSITION OF molecule\n                               | SINGLE_REPLACEMENT OF molecule\n                               | DOUBLE_REPLACEMENT OF molecule\n                               | ACID_BASE OF molecule\n                               | PRECIPITATION OF molecule\n                               | GAS_FORMATION OF moleculethermodynamic_statement : ENTHALPY OF reaction_expr\n                               | ENTROPY OF reaction_expr\n                               | GIBBS_ENERGY OF reaction_expr\n                               | EQUILIBRIUM OF reaction_expr\n                               | ENTHALPY INFO reaction_expr\n                               | ENTROPY INFO reaction_expr\n                               | GIBBS_ENERGY INFO reaction_expr\n                               | EQUILIBRIUM INFO reaction_exprchemical_analysis_statement : OXIDATION_STATES OF molecule\n                                   | LIMITING_REAGENT OF reaction_expr\n                                   | PERCENT_YIELD OF reaction_expr\n                                   | EMPIRICAL_FORMULA OF molecule\n                                   | MOLECULAR_FORMULA OF molecule\n                                   | MOLAR_MASS OF molecule\n                                   | EMPIRICAL_FORMULA OF percent_compositionpercent_composition : LBRACKET percent_list RBRACKET\n                           | LBRACKET percent_list RBRACKET WITH MOLAR_MASS numberpercent_list : ELEMENT_SYMBOL number\n                    | ELEMENT_SYMBOL number COMMA percent_listquery_statement : QUERY IDENTIFIER IDENTIFIER number\n                       | QUERY IDENTIFIER IDENTIFIER number IDENTIFIER number IDENTIFIER\n                       | QUERY COMPOUND\n                       | QUERY COMPOUND query_filters\n                       | QUERY REACTION WITH moleculequery_filters : query_filter\n                     | query_filter AND query_filtersquery_filter : WITH element_list\n                    | SOLID\n                    | LIQUID\n                    | GAS\n                    | AQUEOUS\n                    | IDENTIFIER STRING\n                    | MOLAR_MASS comparison numberelement_list : ELEMENT_SYMBOL\n                    | ELEMENT_SYMBOL COMMA element_listcomparison : LT\n                  | LE\n                  | GT\n                  | GEnumber : INTEGER\n              | FLOATreaction_expr : reactants_expr ARROW products_exprreactants_expr : chemical_term_listproducts_expr : chemical_term_listchemical_term_list : chemical_term PLUS chemical_term_list\n                          | chemical_termchemical_term : INTEGER species\n                     | speciesspecies : molecule\n               | molecule charge\n               | IDENTIFIER CARET NEGATIVE\n               | IDENTIFIER NEGATIVEcharge : CARET PLUS\n              | CARET NEGATIVE\n              | CARET INTEGER PLUS\n              | CARET INTEGER NEGATIVEmolecule : molecule_part molecule\n                | molecule_partmolecule_part : element_group\n                     | LPAREN molecule RPAREN INTEGERelement_group : ELEMENT_SYMBOL INTEGER\n                     | ELEMENT_SYMBOL'
     
-_lr_action_items = {'BALANCE':([0,30,],[10,10,]),'PREDICT':([0,30,],[11,11,]),'ANALYZE':([0,30,],[12,12,]),'COMBUSTION':([0,30,],[13,13,]),'DECOMPOSITION':([0,30,],[14,14,]),'SINGLE_REPLACEMENT':([0,30,],[15,15,]),'DOUBLE_REPLACEMENT':([0,30,],[16,16,]),'ACID_BASE':([0,30,],[17,17,]),'PRECIPITATION':([0,30,],[18,18,]),'GAS_FORMATION':([0,30,],[19,19,]),'ENTHALPY':([0,30,],[20,20,]),'ENTROPY':([0,30,],[21,21,]),'GIBBS_ENERGY':([0,30,],[22,22,]),'EQUILIBRIUM':([0,30,],[23,23,]),'OXIDATION_STATES':([0,30,],[24,24,]),'LIMITING_REAGENT':([0,30,],[25,25,]),'PERCENT_YIELD':([0,30,],[26,26,]),'EMPIRICAL_FORMULA':([0,30,],[27,27,]),'MOLECULAR_FORMULA':([0,30,],[28,28,]),'MOLAR_MASS':([0,30,],[29,29,]),'$end':([1,2,30,65,],[0,-1,-3,-2,]),'SEMICOLON':([3,4,5,6,7,8,9,13,14,15,16,17,18,19,31,33,34,36,37,38,40,41,42,43,68,69,71,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,100,104,105,106,112,113,117,120,121,],[30,-4,-5,-6,-7,-8,-9,-22,-23,-24,-25,-26,-27,-28,-10,-51,-54,-56,-58,-59,-62,-11,-13,-20,-55,-57,-61,-29,-30,-31,-32,-33,-34,-35,-36,-40,-37,-41,-38,-42,-39,-43,-44,-45,-46,-47,-48,-49,-50,-52,-53,-12,-14,-21,-60,-15,-16,-17,-18,-19,]),'INTEGER':([10,11,40,51,52,53,54,55,56,57,58,60,61,66,67,99,110,111,],[35,35,71,35,35,35,35,35,35,35,35,35,35,35,35,106,115,116,]),'LPAREN':([10,11,12,35,37,38,39,40,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,66,67,71,101,102,103,106,],[39,39,39,39,39,-59,39,-62,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,-61,109,110,111,-60,]),'ELEMENT_SYMBOL':([10,11,12,35,37,38,39,40,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,66,67,71,106,109,],[40,40,40,40,40,-59,40,-62,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,-61,-60,114,]),'OF':([13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,],[44,45,46,47,48,49,50,51,53,55,57,59,60,61,62,63,64,]),'INFO':([20,21,22,23,],[52,54,56,58,]),'ARROW':([32,33,34,36,37,38,40,42,68,69,71,98,106,],[66,-51,-54,-56,-58,-59,-62,66,-55,-57,-61,-53,-60,]),'IF':([33,34,36,37,38,40,41,42,68,69,71,96,97,98,106,],[-51,-54,-56,-58,-59,-62,72,73,-55,-57,-61,-50,-52,-53,-60,]),'PLUS':([34,36,37,38,40,68,69,71,106,],[67,-56,-58,-59,-62,-55,-57,-61,-60,]),'FOR':([37,38,40,43,69,71,106,],[-58,-59,-62,74,-57,-61,-60,]),'RPAREN':([37,38,40,69,70,71,106,114,118,119,],[-58,-59,-62,-57,99,-61,-60,117,120,121,]),'CATALYST':([72,73,107,108,],[101,101,101,101,]),'TEMPERATURE':([72,73,107,108,],[102,102,102,102,]),'PRESSURE':([72,73,107,108,],[103,103,103,103,]),'IDENTIFIER':([74,115,116,],[105,118,119,]),'AND':([100,104,112,113,117,120,121,],[107,107,107,107,-17,-18,-19,]),'OR':([100,104,112,113,117,120,121,],[108,108,108,108,-17,-18,-19,]),}
+_lr_action_items = {'BALANCE':([0,32,],[11,11,]),'PREDICT':([0,32,],[12,12,]),'ANALYZE':([0,32,],[13,13,]),'COMBUSTION':([0,32,],[14,14,]),'DECOMPOSITION':([0,32,],[15,15,]),'SINGLE_REPLACEMENT':([0,32,],[16,16,]),'DOUBLE_REPLACEMENT':([0,32,],[17,17,]),'ACID_BASE':([0,32,],[18,18,]),'PRECIPITATION':([0,32,],[19,19,]),'GAS_FORMATION':([0,32,],[20,20,]),'ENTHALPY':([0,32,],[21,21,]),'ENTROPY':([0,32,],[22,22,]),'GIBBS_ENERGY':([0,32,],[23,23,]),'EQUILIBRIUM':([0,32,],[24,24,]),'OXIDATION_STATES':([0,32,],[25,25,]),'LIMITING_REAGENT':([0,32,],[26,26,]),'PERCENT_YIELD':([0,32,],[27,27,]),'EMPIRICAL_FORMULA':([0,32,],[28,28,]),'MOLECULAR_FORMULA':([0,32,],[29,29,]),'MOLAR_MASS':([0,32,70,140,169,],[30,30,119,119,176,]),'QUERY':([0,32,],[31,31,]),'$end':([1,2,32,72,],[0,-1,-3,-2,]),'SEMICOLON':([3,4,5,6,7,8,9,10,14,15,16,17,18,19,20,33,36,37,39,40,41,42,44,45,46,47,70,73,75,78,79,81,83,87,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,105,106,108,109,111,112,114,115,116,117,121,122,123,124,125,126,129,133,134,137,138,139,141,142,143,149,150,151,152,158,161,163,164,165,172,173,178,179,180,181,],[32,-4,-5,-6,-7,-8,-9,-10,-24,-25,-26,-27,-28,-29,-30,-11,-80,-83,-85,-86,-95,-96,-99,-13,-15,-22,-59,-12,-89,-84,-87,-94,-98,-31,-32,-33,-34,-35,-36,-37,-38,-42,-39,-43,-40,-44,-41,-45,-46,-47,-48,-49,-52,-50,-51,-60,-62,-65,-66,-67,-68,-88,-79,-81,-82,-90,-91,-14,-16,-23,-57,-77,-78,-64,-71,-69,-61,-92,-93,-97,-53,-63,-70,-17,-18,-72,-19,-58,-20,-21,-54,]),'INTEGER':([11,12,44,55,56,57,58,59,60,61,62,64,65,76,77,80,110,128,136,144,145,146,147,148,156,157,160,176,],[38,38,83,38,38,38,38,38,38,38,38,38,38,38,38,127,138,152,138,138,-73,-74,-75,-76,167,168,138,138,]),'IDENTIFIER':([11,12,31,33,37,38,39,40,41,42,44,55,56,57,58,59,60,61,62,64,65,69,70,75,76,77,78,79,81,83,86,121,122,123,124,125,126,137,138,139,140,150,151,152,167,168,171,],[34,34,69,73,-83,34,-85,-86,-95,-96,-99,34,34,34,34,34,34,34,34,34,34,110,118,-89,34,34,-84,-87,-94,-98,134,-88,-79,-81,-82,-90,-91,160,-77,-78,118,-92,-93,-97,174,175,178,]),'LPAREN':([11,12,13,38,41,42,43,44,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,76,77,83,120,130,131,132,152,],[43,43,43,43,43,-96,43,-99,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,-98,43,155,156,157,-97,]),'ELEMENT_SYMBOL':([11,12,13,38,41,42,43,44,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,76,77,83,107,113,120,152,155,162,170,],[44,44,44,44,44,-96,44,-99,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,-98,136,142,44,-97,166,142,136,]),'OF':([14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,],[48,49,50,51,52,53,54,55,57,59,61,63,64,65,66,67,68,]),'INFO':([21,22,23,24,],[56,58,60,62,]),'COMPOUND':([31,],[70,]),'REACTION':([31,],[71,]),'CARET':([34,40,41,42,44,81,83,152,],[74,80,-95,-96,-99,-94,-98,-97,]),'NEGATIVE':([34,74,80,127,],[75,121,126,151,]),'ARROW':([35,36,37,39,40,41,42,44,46,75,78,79,81,83,121,124,125,126,150,151,152,],[76,-80,-83,-85,-86,-95,-96,-99,76,-89,-84,-87,-94,-98,-88,-82,-90,-91,-92,-93,-97,]),'IF':([36,37,39,40,41,42,44,45,46,75,78,79,81,83,121,122,123,124,125,126,150,151,152,],[-80,-83,-85,-86,-95,-96,-99,84,85,-89,-84,-87,-94,-98,-88,-79,-81,-82,-90,-91,-92,-93,-97,]),'PLUS':([37,39,40,41,42,44,75,78,79,80,81,83,121,125,126,127,150,151,152,],[77,-85,-86,-95,-96,-99,-89,-84,-87,125,-94,-98,-88,-90,-91,150,-92,-93,-97,]),'FOR':([41,42,44,47,81,83,152,],[-95,-96,-99,86,-94,-98,-97,]),'RPAREN':([41,42,44,81,82,83,152,166,174,175,],[-95,-96,-99,-94,128,-98,-97,173,179,180,]),'LBRACKET':([66,],[107,]),'WITH':([70,71,140,158,],[113,120,113,169,]),'SOLID':([70,140,],[114,114,]),'LIQUID':([70,140,],[115,115,]),'GAS':([70,140,],[116,116,]),'AQUEOUS':([70,140,],[117,117,]),'CATALYST':([84,85,153,154,],[130,130,130,130,]),'TEMPERATURE':([84,85,153,154,],[131,131,131,131,]),'PRESSURE':([84,85,153,154,],[132,132,132,132,]),'FLOAT':([110,136,144,145,146,147,148,160,176,],[139,139,139,-73,-74,-75,-76,139,139,]),'AND':([112,114,115,116,117,129,133,138,139,141,142,143,163,164,165,172,173,179,180,],[140,-65,-66,-67,-68,153,153,-77,-78,-64,-71,-69,-70,153,153,-72,-19,-20,-21,]),'STRING':([118,],[143,]),'LT':([119,],[145,]),'LE':([119,],[146,]),'GT':([119,],[147,]),'GE':([119,],[148,]),'OR':([129,133,164,165,173,179,180,],[154,154,154,154,-19,-20,-21,]),'RBRACKET':([135,138,139,159,177,],[158,-77,-78,-55,-56,]),'COMMA':([138,139,142,159,],[-77,-78,162,170,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'program':([0,],[1,]),'statement_list':([0,30,],[2,65,]),'statement':([0,30,],[3,3,]),'balance_statement':([0,30,],[4,4,]),'predict_statement':([0,30,],[5,5,]),'analyze_statement':([0,30,],[6,6,]),'reaction_type_statement':([0,30,],[7,7,]),'thermodynamic_statement':([0,30,],[8,8,]),'chemical_analysis_statement':([0,30,],[9,9,]),'reaction_expr':([10,11,51,52,53,54,55,56,57,58,60,61,],[31,41,82,83,84,85,86,87,88,89,91,92,]),'reactants_expr':([10,11,51,52,53,54,55,56,57,58,60,61,],[32,42,32,32,32,32,32,32,32,32,32,32,]),'chemical_term_list':([10,11,51,52,53,54,55,56,57,58,60,61,66,67,],[33,33,33,33,33,33,33,33,33,33,33,33,97,98,]),'chemical_term':([10,11,51,52,53,54,55,56,57,58,60,61,66,67,],[34,34,34,34,34,34,34,34,34,34,34,34,34,34,]),'molecule':([10,11,12,35,37,39,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,66,67,],[36,36,43,68,69,70,75,76,77,78,79,80,81,36,36,36,36,36,36,36,36,90,36,36,93,94,95,36,36,]),'molecule_part':([10,11,12,35,37,39,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,66,67,],[37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,]),'element_group':([10,11,12,35,37,39,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,66,67,],[38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,]),'products_expr':([66,],[96,]),'condition':([72,73,107,108,],[100,104,112,113,]),}
+_lr_goto_items = {'program':([0,],[1,]),'statement_list':([0,32,],[2,72,]),'statement':([0,32,],[3,3,]),'balance_statement':([0,32,],[4,4,]),'predict_statement':([0,32,],[5,5,]),'analyze_statement':([0,32,],[6,6,]),'reaction_type_statement':([0,32,],[7,7,]),'thermodynamic_statement':([0,32,],[8,8,]),'chemical_analysis_statement':([0,32,],[9,9,]),'query_statement':([0,32,],[10,10,]),'reaction_expr':([11,12,55,56,57,58,59,60,61,62,64,65,],[33,45,94,95,96,97,98,99,100,101,103,104,]),'reactants_expr':([11,12,55,56,57,58,59,60,61,62,64,65,],[35,46,35,35,35,35,35,35,35,35,35,35,]),'chemical_term_list':([11,12,55,56,57,58,59,60,61,62,64,65,76,77,],[36,36,36,36,36,36,36,36,36,36,36,36,123,124,]),'chemical_term':([11,12,55,56,57,58,59,60,61,62,64,65,76,77,],[37,37,37,37,37,37,37,37,37,37,37,37,37,37,]),'species':([11,12,38,55,56,57,58,59,60,61,62,64,65,76,77,],[39,39,78,39,39,39,39,39,39,39,39,39,39,39,39,]),'molecule':([11,12,13,38,41,43,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,76,77,120,],[40,40,47,40,81,82,87,88,89,90,91,92,93,40,40,40,40,40,40,40,40,102,40,40,105,108,109,40,40,149,]),'molecule_part':([11,12,13,38,41,43,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,76,77,120,],[41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,]),'element_group':([11,12,13,38,41,43,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,76,77,120,],[42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,]),'charge':([40,],[79,]),'percent_composition':([66,],[106,]),'query_filters':([70,140,],[111,161,]),'query_filter':([70,140,],[112,112,]),'products_expr':([76,],[122,]),'condition':([84,85,153,154,],[129,133,164,165,]),'percent_list':([107,170,],[135,177,]),'number':([110,136,144,160,176,],[137,159,163,171,181,]),'element_list':([113,162,],[141,172,]),'comparison':([119,],[144,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -36,57 +36,94 @@ _lr_productions = [
   ('statement -> reaction_type_statement','statement',1,'p_statement','parser.py',26),
   ('statement -> thermodynamic_statement','statement',1,'p_statement','parser.py',27),
   ('statement -> chemical_analysis_statement','statement',1,'p_statement','parser.py',28),
-  ('balance_statement -> BALANCE reaction_expr','balance_statement',2,'p_balance_statement','parser.py',33),
-  ('predict_statement -> PREDICT reaction_expr','predict_statement',2,'p_predict_statement','parser.py',38),
-  ('predict_statement -> PREDICT reaction_expr IF condition','predict_statement',4,'p_predict_statement','parser.py',39),
-  ('predict_statement -> PREDICT reactants_expr','predict_statement',2,'p_predict_statement','parser.py',40),
-  ('predict_statement -> PREDICT reactants_expr IF condition','predict_statement',4,'p_predict_statement','parser.py',41),
-  ('condition -> condition AND condition','condition',3,'p_condition','parser.py',74),
-  ('condition -> condition OR condition','condition',3,'p_condition','parser.py',75),
-  ('condition -> CATALYST LPAREN ELEMENT_SYMBOL RPAREN','condition',4,'p_condition','parser.py',76),
-  ('condition -> TEMPERATURE LPAREN INTEGER IDENTIFIER RPAREN','condition',5,'p_condition','parser.py',77),
-  ('condition -> PRESSURE LPAREN INTEGER IDENTIFIER RPAREN','condition',5,'p_condition','parser.py',78),
-  ('analyze_statement -> ANALYZE molecule','analyze_statement',2,'p_analyze_statement','parser.py',99),
-  ('analyze_statement -> ANALYZE molecule FOR IDENTIFIER','analyze_statement',4,'p_analyze_statement','parser.py',100),
-  ('reaction_type_statement -> COMBUSTION','reaction_type_statement',1,'p_reaction_type_statement','parser.py',110),
-  ('reaction_type_statement -> DECOMPOSITION','reaction_type_statement',1,'p_reaction_type_statement','parser.py',111),
-  ('reaction_type_statement -> SINGLE_REPLACEMENT','reaction_type_statement',1,'p_reaction_type_statement','parser.py',112),
-  ('reaction_type_statement -> DOUBLE_REPLACEMENT','reaction_type_statement',1,'p_reaction_type_statement','parser.py',113),
-  ('reaction_type_statement -> ACID_BASE','reaction_type_statement',1,'p_reaction_type_statement','parser.py',114),
-  ('reaction_type_statement -> PRECIPITATION','reaction_type_statement',1,'p_reaction_type_statement','parser.py',115),
-  ('reaction_type_statement -> GAS_FORMATION','reaction_type_statement',1,'p_reaction_type_statement','parser.py',116),
-  ('reaction_type_statement -> COMBUSTION OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',117),
-  ('reaction_type_statement -> DECOMPOSITION OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',118),
-  ('reaction_type_statement -> SINGLE_REPLACEMENT OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',119),
-  ('reaction_type_statement -> DOUBLE_REPLACEMENT OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',120),
-  ('reaction_type_statement -> ACID_BASE OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',121),
-  ('reaction_type_statement -> PRECIPITATION OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',122),
-  ('reaction_type_statement -> GAS_FORMATION OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',123),
-  ('thermodynamic_statement -> ENTHALPY OF reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',130),
-  ('thermodynamic_statement -> ENTROPY OF reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',131),
-  ('thermodynamic_statement -> GIBBS_ENERGY OF reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',132),
-  ('thermodynamic_statement -> EQUILIBRIUM OF reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',133),
-  ('thermodynamic_statement -> ENTHALPY INFO reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',134),
-  ('thermodynamic_statement -> ENTROPY INFO reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',135),
-  ('thermodynamic_statement -> GIBBS_ENERGY INFO reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',136),
-  ('thermodynamic_statement -> EQUILIBRIUM INFO reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',137),
-  ('chemical_analysis_statement -> OXIDATION_STATES OF molecule','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',145),
-  ('chemical_analysis_statement -> LIMITING_REAGENT OF reaction_expr','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',146),
-  ('chemical_analysis_statement -> PERCENT_YIELD OF reaction_expr','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',147),
-  ('chemical_analysis_statement -> EMPIRICAL_FORMULA OF molecule','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',148),
-  ('chemical_analysis_statement -> MOLECULAR_FORMULA OF molecule','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',149),
-  ('chemical_analysis_statement -> MOLAR_MASS OF molecule','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',150),
-  ('reaction_expr -> reactants_expr ARROW products_expr','reaction_expr',3,'p_reaction_expr','parser.py',154),
-  ('reactants_expr -> chemical_term_list','reactants_expr',1,'p_reactants_expr','parser.py',158),
-  ('products_expr -> chemical_term_list','products_expr',1,'p_products_expr','parser.py',162),
-  ('chemical_term_list -> chemical_term PLUS chemical_term_list','chemical_term_list',3,'p_chemical_term_list','parser.py',166),
-  ('chemical_term_list -> chemical_term','chemical_term_list',1,'p_chemical_term_list','parser.py',167),
-  ('chemical_term -> INTEGER molecule','chemical_term',2,'p_chemical_term','parser.py',171),
-  ('chemical_term -> molecule','chemical_term',1,'p_chemical_term','parser.py',172),
-  ('molecule -> molecule_part molecule','molecule',2,'p_molecule','parser.py',181),
-  ('molecule -> molecule_part','molecule',1,'p_molecule','parser.py',182),
-  ('molecule_part -> element_group','molecule_part',1,'p_molecule_part','parser.py',191),
-  ('molecule_part -> LPAREN molecule RPAREN INTEGER','molecule_part',4,'p_molecule_part','parser.py',192),
-  ('element_group -> ELEMENT_SYMBOL INTEGER','element_group',2,'p_element_group','parser.py',205),
-  ('element_group -> ELEMENT_SYMBOL','element_group',1,'p_element_group','parser.py',206),
+  ('statement -> query_statement','statement',1,'p_statement','parser.py',29),
+  ('balance_statement -> BALANCE reaction_expr','balance_statement',2,'p_balance_statement','parser.py',34),
+  ('balance_statement -> BALANCE reaction_expr IDENTIFIER','balance_statement',3,'p_balance_statement','parser.py',35),
+  ('predict_statement -> PREDICT reaction_expr','predict_statement',2,'p_predict_statement','parser.py',46),
+  ('predict_statement -> PREDICT reaction_expr IF condition','predict_statement',4,'p_predict_statement','parser.py',47),
+  ('predict_statement -> PREDICT reactants_expr','predict_statement',2,'p_predict_statement','parser.py',48),
+  ('predict_statement -> PREDICT reactants_expr IF condition','predict_statement',4,'p_predict_statement','parser.py',49),
+  ('condition -> condition AND condition','condition',3,'p_condition','parser.py',82),
+  ('condition -> condition OR condition','condition',3,'p_condition','parser.py',83),
+  ('condition -> CATALYST LPAREN ELEMENT_SYMBOL RPAREN','condition',4,'p_condition','parser.py',84),
+  ('condition -> TEMPERATURE LPAREN INTEGER IDENTIFIER RPAREN','condition',5,'p_condition','parser.py',85),
+  ('condition -> PRESSURE LPAREN INTEGER IDENTIFIER RPAREN','condition',5,'p_condition','parser.py',86),
+  ('analyze_statement -> ANALYZE molecule','analyze_statement',2,'p_analyze_statement','parser.py',107),
+  ('analyze_statement -> ANALYZE molecule FOR IDENTIFIER','analyze_statement',4,'p_analyze_statement','parser.py',108),
+  ('reaction_type_statement -> COMBUSTION','reaction_type_statement',1,'p_reaction_type_statement','parser.py',118),
+  ('reaction_type_statement -> DECOMPOSITION','reaction_type_statement',1,'p_reaction_type_statement','parser.py',119),
+  ('reaction_type_statement -> SINGLE_REPLACEMENT','reaction_type_statement',1,'p_reaction_type_statement','parser.py',120),
+  ('reaction_type_statement -> DOUBLE_REPLACEMENT','reaction_type_statement',1,'p_reaction_type_statement','parser.py',121),
+  ('reaction_type_statement -> ACID_BASE','reaction_type_statement',1,'p_reaction_type_statement','parser.py',122),
+  ('reaction_type_statement -> PRECIPITATION','reaction_type_statement',1,'p_reaction_type_statement','parser.py',123),
+  ('reaction_type_statement -> GAS_FORMATION','reaction_type_statement',1,'p_reaction_type_statement','parser.py',124),
+  ('reaction_type_statement -> COMBUSTION OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',125),
+  ('reaction_type_statement -> DECOMPOSITION OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',126),
+  ('reaction_type_statement -> SINGLE_REPLACEMENT OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',127),
+  ('reaction_type_statement -> DOUBLE_REPLACEMENT OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',128),
+  ('reaction_type_statement -> ACID_BASE OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',129),
+  ('reaction_type_statement -> PRECIPITATION OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',130),
+  ('reaction_type_statement -> GAS_FORMATION OF molecule','reaction_type_statement',3,'p_reaction_type_statement','parser.py',131),
+  ('thermodynamic_statement -> ENTHALPY OF reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',138),
+  ('thermodynamic_statement -> ENTROPY OF reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',139),
+  ('thermodynamic_statement -> GIBBS_ENERGY OF reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',140),
+  ('thermodynamic_statement -> EQUILIBRIUM OF reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',141),
+  ('thermodynamic_statement -> ENTHALPY INFO reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',142),
+  ('thermodynamic_statement -> ENTROPY INFO reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',143),
+  ('thermodynamic_statement -> GIBBS_ENERGY INFO reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',144),
+  ('thermodynamic_statement -> EQUILIBRIUM INFO reaction_expr','thermodynamic_statement',3,'p_thermodynamic_statement','parser.py',145),
+  ('chemical_analysis_statement -> OXIDATION_STATES OF molecule','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',153),
+  ('chemical_analysis_statement -> LIMITING_REAGENT OF reaction_expr','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',154),
+  ('chemical_analysis_statement -> PERCENT_YIELD OF reaction_expr','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',155),
+  ('chemical_analysis_statement -> EMPIRICAL_FORMULA OF molecule','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',156),
+  ('chemical_analysis_statement -> MOLECULAR_FORMULA OF molecule','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',157),
+  ('chemical_analysis_statement -> MOLAR_MASS OF molecule','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',158),
+  ('chemical_analysis_statement -> EMPIRICAL_FORMULA OF percent_composition','chemical_analysis_statement',3,'p_chemical_analysis_statement','parser.py',159),
+  ('percent_composition -> LBRACKET percent_list RBRACKET','percent_composition',3,'p_percent_composition','parser.py',163),
+  ('percent_composition -> LBRACKET percent_list RBRACKET WITH MOLAR_MASS number','percent_composition',6,'p_percent_composition','parser.py',164),
+  ('percent_list -> ELEMENT_SYMBOL number','percent_list',2,'p_percent_list','parser.py',169),
+  ('percent_list -> ELEMENT_SYMBOL number COMMA percent_list','percent_list',4,'p_percent_list','parser.py',170),
+  ('query_statement -> QUERY IDENTIFIER IDENTIFIER number','query_statement',4,'p_query_statement','parser.py',174),
+  ('query_statement -> QUERY IDENTIFIER IDENTIFIER number IDENTIFIER number IDENTIFIER','query_statement',7,'p_query_statement','parser.py',175),
+  ('query_statement -> QUERY COMPOUND','query_statement',2,'p_query_statement','parser.py',176),
+  ('query_statement -> QUERY COMPOUND query_filters','query_statement',3,'p_query_statement','parser.py',177),
+  ('query_statement -> QUERY REACTION WITH molecule','query_statement',4,'p_query_statement','parser.py',178),
+  ('query_filters -> query_filter','query_filters',1,'p_query_filters','parser.py',209),
+  ('query_filters -> query_filter AND query_filters','query_filters',3,'p_query_filters','parser.py',210),
+  ('query_filter -> WITH element_list','query_filter',2,'p_query_filter','parser.py',214),
+  ('query_filter -> SOLID','query_filter',1,'p_query_filter','parser.py',215),
+  ('query_filter -> LIQUID','query_filter',1,'p_query_filter','parser.py',216),
+  ('query_filter -> GAS','query_filter',1,'p_query_filter','parser.py',217),
+  ('query_filter -> AQUEOUS','query_filter',1,'p_query_filter','parser.py',218),
+  ('query_filter -> IDENTIFIER STRING','query_filter',2,'p_query_filter','parser.py',219),
+  ('query_filter -> MOLAR_MASS comparison number','query_filter',3,'p_query_filter','parser.py',220),
+  ('element_list -> ELEMENT_SYMBOL','element_list',1,'p_element_list','parser.py',234),
+  ('element_list -> ELEMENT_SYMBOL COMMA element_list','element_list',3,'p_element_list','parser.py',235),
+  ('comparison -> LT','comparison',1,'p_comparison','parser.py',239),
+  ('comparison -> LE','comparison',1,'p_comparison','parser.py',240),
+  ('comparison -> GT','comparison',1,'p_comparison','parser.py',241),
+  ('comparison -> GE','comparison',1,'p_comparison','parser.py',242),
+  ('number -> INTEGER','number',1,'p_number','parser.py',246),
+  ('number -> FLOAT','number',1,'p_number','parser.py',247),
+  ('reaction_expr -> reactants_expr ARROW products_expr','reaction_expr',3,'p_reaction_expr','parser.py',251),
+  ('reactants_expr -> chemical_term_list','reactants_expr',1,'p_reactants_expr','parser.py',255),
+  ('products_expr -> chemical_term_list','products_expr',1,'p_products_expr','parser.py',259),
+  ('chemical_term_list -> chemical_term PLUS chemical_term_list','chemical_term_list',3,'p_chemical_term_list','parser.py',263),
+  ('chemical_term_list -> chemical_term','chemical_term_list',1,'p_chemical_term_list','parser.py',264),
+  ('chemical_term -> INTEGER species','chemical_term',2,'p_chemical_term','parser.py',268),
+  ('chemical_term -> species','chemical_term',1,'p_chemical_term','parser.py',269),
+  ('species -> molecule','species',1,'p_species','parser.py',278),
+  ('species -> molecule charge','species',2,'p_species','parser.py',279),
+  ('species -> IDENTIFIER CARET NEGATIVE','species',3,'p_species','parser.py',280),
+  ('species -> IDENTIFIER NEGATIVE','species',2,'p_species','parser.py',281),
+  ('charge -> CARET PLUS','charge',2,'p_charge','parser.py',294),
+  ('charge -> CARET NEGATIVE','charge',2,'p_charge','parser.py',295),
+  ('charge -> CARET INTEGER PLUS','charge',3,'p_charge','parser.py',296),
+  ('charge -> CARET INTEGER NEGATIVE','charge',3,'p_charge','parser.py',297),
+  ('molecule -> molecule_part molecule','molecule',2,'p_molecule','parser.py',305),
+  ('molecule -> molecule_part','molecule',1,'p_molecule','parser.py',306),
+  ('molecule_part -> element_group','molecule_part',1,'p_molecule_part','parser.py',315),
+  ('molecule_part -> LPAREN molecule RPAREN INTEGER','molecule_part',4,'p_molecule_part','parser.py',316),
+  ('element_group -> ELEMENT_SYMBOL INTEGER','element_group',2,'p_element_group','parser.py',329),
+  ('element_group -> ELEMENT_SYMBOL','element_group',1,'p_element_group','parser.py',330),
 ]
@@ -0,0 +1,172 @@
+"""
+benchmarks/parse_formula_benchmark.py
+
+Micro-benchmark for compounds.parse_formula, plain and through the shared
+memo (compounds.composition_of), against the original recursive,
+substring-slicing parser. Run from the repository root:
+
+    python benchmarks/parse_formula_benchmark.py [corpus.txt] [--limit N] [--distinct N]
+
+The corpus file holds one formula per line. Without one, a corpus of
+--limit distinct generated formulas (flat, nested and long polymer-like)
+is used; a smaller --distinct draws the corpus from that many formulas
+with Zipf-distributed repeats, as in a real formula collection, which only
+the memo benefits from. The exit status is 1 when parse_formula itself is
+less than 5x faster than the original; the memoized rate is reported but
+not gated on.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from DSL.chemistry.compounds import FormulaMemo, parse_formula
+from DSL.chemistry.elements import SYMBOLS
+
+TARGET_SPEEDUP = 5
+
+# The original parser looked symbols up in the ELEMENTS dict; a plain dict
+# of every symbol gives it the same lookup cost
+BASELINE_ELEMENTS = dict.fromkeys(SYMBOLS)
+
+
+def baseline_parse_formula(formula: str) -> dict:
+    """
+    The parse_formula this module replaced, verbatim apart from the
+    comments: it recurses on a substring copy of every parenthesized group
+    and builds subscripts one character at a time.
+    """
+    if hasattr(formula, 'formula'):
+        formula = formula.formula
+
+    formula = formula.strip()
+    if not formula:
+        raise ValueError("Empty formula")
+
+    composition = {}
+
+    def parse_part(part, multiplier=1):
+        i = 0
+        while i < len(part):
+            if i < len(part) and 'A' <= part[i] <= 'Z':
+                symbol = part[i]
+                i += 1
+                if i < len(part) and 'a' <= part[i] <= 'z':
+                    symbol += part[i]
+                    i += 1
+
+                if symbol not in BASELINE_ELEMENTS:
+                    raise ValueError(f"Unknown element symbol: {symbol}")
+
+                count = ""
+                while i < len(part) and '0' <= part[i] <= '9':
+                    count += part[i]
+                    i += 1
+
+                count = int(count) if count else 1
+                count *= multiplier
+
+                composition[symbol] = composition.get(symbol, 0) + count
+
+            elif i < len(part) and part[i] == '(':
+                paren_level = 1
+                start = i + 1
+                i += 1
+                while i < len(part) and paren_level > 0:
+                    if part[i] == '(':
+                        paren_level += 1
+                    elif part[i] == ')':
+                        paren_level -= 1
+                    i += 1
+
+                if paren_level != 0:
+                    raise ValueError("Mismatched parentheses in formula")
+
+                group_multiplier = ""
+                while i < len(part) and '0' <= part[i] <= '9':
+                    group_multiplier += part[i]
+                    i += 1
+
+                group_multiplier = int(group_multiplier) if group_multiplier else 1
+                group_multiplier *= multiplier
+
+                parse_part(part[start:i-1], group_multiplier)
+
+            else:
+                i += 1
+
+    parse_part(formula)
+
+    return composition
+
+
+def generate_formula(rng):
+    """One random formula: flat (60%), with one or two groups (25%), or a long polymer chain (15%)."""
+    symbols = ['H', 'C', 'N', 'O', 'S', 'P', 'Cl', 'Br', 'Na', 'Ca', 'Fe', 'Cu', 'K', 'Mg']
+
+    def atoms(k):
+        return "".join(rng.choice(symbols) + str(rng.randint(1, 12)) for _ in range(k))
+
+    def group(depth):
+        inner = group(depth - 1) if depth else ""
+        return "(" + atoms(rng.randint(1, 3)) + inner + ")" + str(rng.randint(2, 40))
+
+    kind = rng.random()
+    if kind < 0.6:
+        return "C" + str(rng.randint(1, 40)) + "H" + str(rng.randint(1, 80)) + atoms(rng.randint(0, 3))
+    if kind < 0.85:
+        return atoms(rng.randint(1, 2)) + "".join(group(rng.randint(0, 1)) for _ in range(rng.randint(1, 2)))
+    return "CH3" + "".join(group(rng.randint(0, 3)) for _ in range(rng.randint(2, 6))) + "H"
+
+
+def synthetic_corpus(size, distinct, seed=0):
+    """Draw size formulas from distinct generated ones, the k-th most common with weight 1/k."""
+    rng = random.Random(seed)
+    vocabulary = [generate_formula(rng) for _ in range(distinct)]
+    if distinct >= size:
+        return vocabulary[:size]
+    weights = [1 / rank for rank in range(1, distinct + 1)]
+    return rng.choices(vocabulary, weights, k=size)
+
+
+def throughput(parse, corpus):
+    """Return formulas parsed per second."""
+    start = time.perf_counter()
+    for formula in corpus:
+        parse(formula)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("corpus", nargs="?", help="file with one formula per line")
+    parser.add_argument("--limit", type=int, default=200_000, help="number of formulas to parse")
+    parser.add_argument("--distinct", type=int, default=None,
+                        help="distinct formulas in the generated corpus (default: limit, no repeats)")
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            corpus = [line.strip() for line in f if line.strip()][:args.limit]
+    else:
+        corpus = synthetic_corpus(args.limit, args.distinct or args.limit)
+
+    mismatches = sum(1 for formula in set(corpus) if parse_formula(formula) != baseline_parse_formula(formula))
+    baseline = throughput(baseline_parse_formula, corpus)
+    current = throughput(parse_formula, corpus)
+    memo = FormulaMemo(maxsize=len(corpus))
+    memoized = throughput(memo, corpus)
+    print(f"formulas:   {len(corpus)} ({len(set(corpus))} distinct)")
+    print(f"baseline:   {baseline:,.0f} formulas/s")
+    print(f"scanner:    {current:,.0f} formulas/s ({current / baseline:.1f}x)")
+    print(f"memoized:   {memoized:,.0f} formulas/s ({memoized / baseline:.1f}x, {memo.hits} hits)")
+    print(f"mismatches: {mismatches}")
+    return 0 if current / baseline >= TARGET_SPEEDUP and not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
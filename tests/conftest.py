@@ -0,0 +1,27 @@
+"""
+tests/conftest.py
+
+Shared fixtures: a fresh Evaluator with its own balancing cache, and a
+helper that parses and evaluates a ChemDSL program with it.
+"""
+
+import pytest
+from DSL import lexer
+from DSL.parser import parse
+from DSL.chemistry.balance_cache import BalanceCache
+from DSL.interpreter.evaluator_dsl import Evaluator
+
+
+@pytest.fixture
+def evaluator():
+    """An Evaluator that does not share the process-wide balancing cache."""
+    return Evaluator(cache=BalanceCache())
+
+
+@pytest.fixture
+def run(evaluator):
+    """Parse and evaluate a program, returning the evaluator's output."""
+    def run(program):
+        lexer.lexer.lineno = 1
+        return evaluator.evaluate(parse(program))
+    return run
@@ -0,0 +1,86 @@
+"""
+tests/test_balance_cache.py
+
+The balancing cache keys reactions canonically, so a reaction written in
+another order is a hit, and it maps cached coefficients back to the
+caller's species order.
+"""
+
+import os
+import subprocess
+import sys
+
+from DSL.chemistry import balance_cache
+from DSL.chemistry.balance_cache import BalanceCache, reaction_key
+from DSL.chemistry.balancer import parse_equation
+
+
+def test_reaction_key_ignores_species_order():
+    assert reaction_key(*parse_equation("O2 + 2H2 -> 2H2O")) == reaction_key(*parse_equation("2H2 + O2 -> 2H2O"))
+    assert reaction_key(*parse_equation("H2 + O2 -> H2O")) != reaction_key(*parse_equation("H2 + O2 -> H2O2"))
+
+
+def test_reordered_reaction_is_a_hit_in_the_callers_order():
+    cache = BalanceCache()
+    assert cache.balance_reaction(*parse_equation("H2 + O2 -> H2O")) == (2, 1, 2)
+    assert cache.balance_reaction(*parse_equation("O2 + H2 -> H2O")) == (1, 2, 2)
+    assert cache.balance_reaction(*parse_equation("CH4 + O2 -> H2O + CO2")) == (1, 2, 2, 1)
+    assert cache.balance_reaction(*parse_equation("O2 + CH4 -> CO2 + H2O")) == (2, 1, 1, 2)
+    assert cache.stats() == {'hits': 2, 'misses': 2, 'size': 2, 'maxsize': 4096}
+
+
+def test_failures_are_cached():
+    cache = BalanceCache()
+    assert cache.balance_reaction(*parse_equation("H2 + O2 -> NaCl")) is None
+    assert cache.balance_reaction(*parse_equation("O2 + H2 -> NaCl")) is None
+    assert cache.hits == 1
+
+
+def test_search_results_keep_the_written_order():
+    cache = BalanceCache()
+    cache.balance_reaction(*parse_equation("H2 + O2 -> H2O"), mode="search")
+    cache.balance_reaction(*parse_equation("O2 + H2 -> H2O"), mode="search")
+    assert cache.misses == 2
+
+
+def test_persistent_layer_is_shared_between_caches(tmp_path):
+    writer = BalanceCache(path=str(tmp_path))
+    writer.balance_reaction(*parse_equation("Fe + O2 -> Fe2O3"))
+    writer.close()
+    cache = BalanceCache(path=str(tmp_path))
+    assert cache.balance_reaction(*parse_equation("O2 + Fe -> Fe2O3")) == (3, 4, 2)
+    assert cache.hits == 1
+
+
+def test_persistent_writes_are_batched(tmp_path, monkeypatch):
+    monkeypatch.setattr(balance_cache, "WRITE_BATCH", 2)
+    writer = BalanceCache(path=str(tmp_path))
+    reader = BalanceCache(path=str(tmp_path))
+    writer.balance_reaction(*parse_equation("H2 + O2 -> H2O"))
+    assert reader.get(reaction_key(*parse_equation("H2 + O2 -> H2O"))) == (False, None)
+    writer.balance_reaction(*parse_equation("Fe + O2 -> Fe2O3"))
+    assert reader.get(reaction_key(*parse_equation("H2 + O2 -> H2O")))[0]
+    writer.balance_reaction(*parse_equation("Na + Cl2 -> NaCl"))
+    writer.flush()
+    assert reader.get(reaction_key(*parse_equation("Na + Cl2 -> NaCl")))[0]
+
+
+def test_default_cache_is_opened_on_first_use(tmp_path):
+    cache_dir = tmp_path / "cache"
+    script = ("import os, DSL.chemistry.balance_cache as c; "
+              "assert not os.path.exists(os.environ['CHEMDSL_CACHE_DIR']); "
+              "assert c.get_default_cache() is c.get_default_cache(); "
+              "assert os.path.exists(os.environ['CHEMDSL_CACHE_DIR'])")
+    env = dict(os.environ, CHEMDSL_CACHE_DIR=str(cache_dir), PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    subprocess.run([sys.executable, "-c", script], env=env, check=True)
+
+
+def test_resize_evicts_least_recently_used():
+    cache = BalanceCache(maxsize=2)
+    for equation in ("H2 + O2 -> H2O", "Fe + O2 -> Fe2O3", "Na + Cl2 -> NaCl"):
+        cache.balance_reaction(*parse_equation(equation))
+    assert len(cache) == 2
+    cache.resize(1)
+    assert len(cache) == 1
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 1}
@@ -0,0 +1,29 @@
+"""
+tests/test_balance_many.py
+
+Bulk balancing keeps results in input order, in process and over a pool,
+and reports a bad equation without aborting the batch.
+"""
+
+from DSL.chemistry.balancer import CancellationToken, balance_many
+
+EQUATIONS = ["H2 + O2 -> H2O", "bad", "H2 + O2 -> NaCl",
+             ([(1, "Fe"), (1, "O2")], [(1, "Fe2O3")])]
+EXPECTED = [((2, 1, 2), None), (None, "ValueError: Malformed equation: bad"),
+            (None, None), ((4, 3, 2), None)]
+
+
+def test_in_process_results_follow_input_order():
+    assert list(balance_many(EQUATIONS, workers=1, chunksize=3)) == EXPECTED
+
+
+def test_pool_results_follow_input_order():
+    assert list(balance_many(iter(EQUATIONS * 3), workers=2, chunksize=2)) == EXPECTED * 3
+
+
+def test_cancelled_batch_stops_after_the_current_chunk():
+    token = CancellationToken()
+    token.cancel()
+    results = list(balance_many(["H2 + O2 -> H2O"] * 5, workers=1, chunksize=2, token=token))
+    assert len(results) == 2
+    assert not any(coeffs for coeffs, _ in results)
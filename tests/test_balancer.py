@@ -0,0 +1,166 @@
+"""
+tests/test_balancer.py
+
+Balancing reactions by the exact nullspace of their composition matrix,
+and the diagnoses given for reactions that cannot be balanced.
+"""
+
+import pytest
+from DSL.chemistry import balancer
+from DSL.chemistry.balancer import BalanceDiagnosis, parse_equation
+
+
+def balance(equation, **options):
+    return balancer.balance_reaction(*parse_equation(equation), **options)
+
+
+def diagnose(equation):
+    return balancer.diagnose_reaction(*parse_equation(equation))
+
+
+@pytest.mark.parametrize("equation, coeffs", [
+    ("H2 + O2 -> H2O", (2, 1, 2)),
+    ("Fe + O2 -> Fe2O3", (4, 3, 2)),
+    ("CH4 + O2 -> CO2 + H2O", (1, 2, 1, 2)),
+    ("C3H8 + O2 -> CO2 + H2O", (1, 5, 3, 4)),
+    ("Al + HCl -> AlCl3 + H2", (2, 6, 2, 3)),
+    ("Ca(OH)2 + H3PO4 -> Ca3(PO4)2 + H2O", (3, 2, 1, 6)),
+    ("Cu + HNO3 -> Cu(NO3)2 + NO + H2O", (3, 8, 3, 2, 4)),
+    ("K4Fe(CN)6 + KMnO4 + H2SO4 -> KHSO4 + Fe2(SO4)3 + MnSO4 + HNO3 + CO2 + H2O",
+     (10, 122, 299, 162, 5, 122, 60, 60, 188)),
+])
+def test_balances_molecular_equations(equation, coeffs):
+    assert balance(equation) == coeffs
+
+
+def test_written_coefficients_scale_the_multipliers():
+    assert balance("2H2 + O2 -> 2H2O") == (1, 1, 1)
+
+
+def test_unbalanceable_reaction_gives_none():
+    assert balance("H2 + O2 -> NaCl") is None
+
+
+def test_problem_compiles_the_composition_matrix_once():
+    problem = balancer.BalanceProblem(*parse_equation("H2 + O2 -> 2H2O"))
+    assert problem.elements == ["H", "O"]
+    assert problem.matrix == [[2, 0, -4], [0, 2, -2]]
+    assert problem.residual([1, 1, 1]) == [-2, 0]
+    assert problem.is_balanced([1, 1, 1]) is False
+    assert problem.is_balanced([2, 1, 1])
+    assert balancer.is_balanced(*parse_equation("2H2 + O2 -> 2H2O"), (1, 1, 1))
+
+
+def test_search_mode_matches_exact_mode():
+    assert balance("Cu + HNO3 -> Cu(NO3)2 + NO + H2O", mode="search") == (3, 8, 3, 2, 4)
+
+
+def test_search_mode_is_bounded_by_max_coeff():
+    equation = "K4Fe(CN)6 + KMnO4 + H2SO4 -> KHSO4 + Fe2(SO4)3 + MnSO4 + HNO3 + CO2 + H2O"
+    assert balance("Fe + O2 -> Fe2O3", mode="search", max_coeff=3) is None
+    assert balance("Fe + O2 -> Fe2O3", mode="search", max_coeff=4) == (4, 3, 2)
+    assert balance(equation, mode="search", max_coeff=2) is None
+
+
+def test_search_blocks_return_the_first_candidate_in_order():
+    problem = balancer.BalanceProblem(*parse_equation("H2 + O2 -> H2O"))
+    assert balancer.search_coefficients(problem, max_coeff=6, block_size=7) == (2, 1, 2)
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="Unknown balancing mode"):
+        balance("H2 + O2 -> H2O", mode="guess")
+
+
+def test_balanced_reaction_needs_no_diagnosis():
+    assert diagnose("H2 + O2 -> H2O") is None
+
+
+@pytest.mark.parametrize("equation, reason, elements, species", [
+    ("H2 + O2 -> NaCl", BalanceDiagnosis.ONE_SIDED_ELEMENT, ["H", "O", "Na", "Cl"], []),
+    ("H2O -> H2O2", BalanceDiagnosis.TRIVIAL_SOLUTION_ONLY, ["H", "O"], []),
+    ("CO2 -> CO2 + O2", BalanceDiagnosis.NO_POSITIVE_SOLUTION, ["O"], ["O2"]),
+    ("CO2 + H2 -> CO2 + H2O", BalanceDiagnosis.NO_POSITIVE_SOLUTION, ["H", "O"], ["H2", "H2O"]),
+])
+def test_diagnoses_unbalanceable_reactions(equation, reason, elements, species):
+    diagnosis = diagnose(equation)
+    assert diagnosis.reason == reason
+    assert diagnosis.elements == elements
+    assert diagnosis.species == species
+    assert balance(equation) is None
+
+
+def test_balance_all_returns_a_reduced_basis():
+    assert balancer.balance_all(*parse_equation("H2 + O2 -> H2O")) == [(2, 1, 2)]
+    assert balancer.balance_all(*parse_equation("H2 + O2 -> H2O + H2O2")) == [(1, 1, 0, 1), (1, 0, 2, -1)]
+    assert balancer.balance_all(*parse_equation("H2O -> H2O2")) == []
+
+
+def test_enumerate_balancings_yields_distinct_positive_balancings():
+    reactants, products = parse_equation("H2 + O2 -> H2O + H2O2")
+    balancings = list(balancer.enumerate_balancings(reactants, products, limit=4))
+    assert balancings == [(3, 2, 2, 1), (4, 3, 2, 2), (5, 3, 4, 1), (5, 4, 2, 3)]
+    assert all(balancer.is_balanced(reactants, products, coeffs) for coeffs in balancings)
+    assert list(balancer.enumerate_balancings(*parse_equation("H2O -> H2O2"))) == []
+
+
+def test_operation_budget_stops_balancing():
+    result = balance("K4Fe(CN)6 + KMnO4 + H2SO4 -> KHSO4 + Fe2(SO4)3 + MnSO4 + HNO3 + CO2 + H2O",
+                     max_operations=10)
+    assert isinstance(result, balancer.BudgetExceeded)
+    assert result.reason == "operations"
+    assert not result
+
+
+def test_cancellation_stops_balancing():
+    token = balancer.CancellationToken()
+    token.cancel()
+    result = balance("H2 + O2 -> H2O", token=token)
+    assert isinstance(result, balancer.BudgetExceeded)
+    assert str(result) == "balancing was cancelled"
+
+
+def test_one_budget_is_shared_between_calls():
+    budget = balancer.Budget(max_operations=10)
+    reactants, products = parse_equation("Cu + HNO3 -> Cu(NO3)2 + NO + H2O")
+    assert isinstance(balancer.balance_all(reactants, products, budget=budget), balancer.BudgetExceeded)
+    assert isinstance(balancer.diagnose_reaction(reactants, products, budget=budget), balancer.BudgetExceeded)
+
+
+def test_exhausted_enumeration_ends_with_budget_exceeded():
+    reactants, products = parse_equation("H2 + O2 -> H2O + H2O2")
+    *balancings, last = balancer.enumerate_balancings(reactants, products, max_operations=60)
+    assert balancings == list(balancer.enumerate_balancings(reactants, products, limit=len(balancings)))
+    assert isinstance(last, balancer.BudgetExceeded)
+    results = list(balancer.enumerate_balancings(reactants, products, max_operations=5))
+    assert len(results) == 1 and isinstance(results[0], balancer.BudgetExceeded)
+
+
+@pytest.mark.parametrize("equation, coeffs", [
+    ("Cu + Ag^+ -> Cu^2+ + Ag", (1, 2, 1, 2)),
+    ("MnO4^- + Fe^2+ + H^+ -> Mn^2+ + Fe^3+ + H2O", (1, 5, 8, 1, 5, 4)),
+    ("Cr2O7^2- + H^+ + e^- -> Cr^3+ + H2O", (1, 14, 6, 2, 7)),
+    ("Fe^3+ + e^- -> Fe^2+", (1, 1, 1)),
+    ("Zn -> Zn^2+ + e^-", (1, 1, 2)),
+])
+def test_balances_redox_and_half_reactions(equation, coeffs):
+    assert balance(equation) == coeffs
+
+
+@pytest.mark.parametrize("equation, reason, elements, species", [
+    ("Na -> Na^+", BalanceDiagnosis.UNBALANCED_CHARGE, [], ["Na^+"]),
+    ("Fe^2+ -> Fe^3+", BalanceDiagnosis.TRIVIAL_SOLUTION_ONLY, ["Fe"], []),
+    ("Na^+ + Cl^- -> Na^+ + Cl2", BalanceDiagnosis.NO_POSITIVE_SOLUTION, ["Cl"], ["Cl^-", "Cl2"]),
+    ("Na -> Cl^-", BalanceDiagnosis.ONE_SIDED_ELEMENT, ["Na", "Cl"], []),
+])
+def test_diagnoses_unbalanceable_ionic_reactions(equation, reason, elements, species):
+    diagnosis = diagnose(equation)
+    assert diagnosis.reason == reason
+    assert diagnosis.elements == elements
+    assert diagnosis.species == species
+    assert balance(equation) is None
+
+
+def test_charge_is_named_apart_from_the_elements():
+    assert str(diagnose("Na -> Na^+")).startswith("Net charge is unbalanced")
+    assert str(diagnose("Fe^2+ -> Fe^3+")).startswith("The 1 element constraint and the charge constraint have rank 2")
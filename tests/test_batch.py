@@ -0,0 +1,34 @@
+"""
+tests/test_batch.py
+
+Whole columns of formulas parsed into one composition matrix.
+"""
+
+import pytest
+
+from DSL.chemistry.batch import molar_masses, parse_formulas
+from DSL.chemistry.compounds import Compound
+
+
+def test_parse_formulas_builds_one_row_per_formula():
+    counts, element_index, errors = parse_formulas(["H2O", "NaCl", "Xx", "H2O", None, "Ca(OH)2"])
+    assert list(element_index) == ["H", "O", "Na", "Cl", "Ca"]
+    assert counts.tolist() == [[2, 1, 0, 0, 0],
+                               [0, 0, 1, 1, 0],
+                               [0, 0, 0, 0, 0],
+                               [2, 1, 0, 0, 0],
+                               [0, 0, 0, 0, 0],
+                               [2, 2, 0, 0, 1]]
+    assert errors.tolist() == [False, False, True, False, True, False]
+
+
+def test_molar_masses_match_compounds():
+    formulas = ["H2O", "C6H12O6", "Al2(SO4)3"]
+    counts, element_index, _ = parse_formulas(formulas)
+    masses = molar_masses(counts, element_index)
+    assert masses.tolist() == pytest.approx([Compound(f).molar_mass() for f in formulas])
+
+
+def test_empty_column():
+    counts, element_index, errors = parse_formulas([])
+    assert counts.shape == (0, 0) and element_index == {} and errors.shape == (0,)
@@ -0,0 +1,58 @@
+"""
+tests/test_canonical.py
+
+Hill-order canonical formulas, stable composition hashes and one-pass
+deduplication of formula spellings.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from DSL.chemistry.compounds import canonical_formula, composition_hash, formula_hash, hill_formula, unique_formulas
+from DSL.chemistry.elements import get_compound
+
+
+@pytest.mark.parametrize("formula, canonical", [
+    ("C2H5OH", "C2H6O"),
+    ("CH3CH2OH", "C2H6O"),
+    ("HOCH2CH3", "C2H6O"),
+    ("CCl4", "CCl4"),
+    ("NaCl", "ClNa"),
+    ("H2SO4", "H2O4S"),
+    ("SO4^2-", "O4S^2-"),
+    ("e^-", "e^-"),
+])
+def test_canonical_formulas_are_in_hill_order(formula, canonical):
+    assert canonical_formula(formula) == canonical
+
+
+def test_hill_formula_omits_zero_counts():
+    assert hill_formula({'C': 1, 'H': 0, 'O': 2}) == "CO2"
+
+
+def test_hash_depends_on_composition_and_charge_only():
+    assert formula_hash("CH3CH2OH") == formula_hash("C2H6O") == composition_hash({'O': 1, 'C': 2, 'H': 6})
+    assert formula_hash("SO4^2-") != formula_hash("SO4")
+    assert 0 <= formula_hash("H2O") < 2 ** 64
+
+
+def test_hash_is_stable_across_processes():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = "from DSL.chemistry.compounds import formula_hash; print(formula_hash('C2H5OH'))"
+    env = dict(os.environ, PYTHONPATH=root, PYTHONHASHSEED="1")
+    output = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+    assert int(output.stdout) == formula_hash("C2H5OH")
+
+
+def test_unique_formulas_keeps_the_first_spelling():
+    formulas = ["C2H5OH", "H2O", "CH3CH2OH", "HOH", "NaCl", "ClNa"]
+    assert list(unique_formulas(iter(formulas))) == ["C2H5OH", "H2O", "NaCl"]
+
+
+def test_compound_lookup_accepts_any_spelling():
+    assert get_compound("CH3CH2OH") is get_compound("C2H5OH")
+    with pytest.raises(ValueError, match="Unknown compound formula"):
+        get_compound("C60")
@@ -0,0 +1,64 @@
+"""
+tests/test_catalog.py
+
+The SQLite catalog finds compounds under any spelling, indexes reaction
+species (charged ions included) by canonical formula, and answers
+repeated lookups from its LRU.
+"""
+
+import pytest
+
+from DSL.chemistry import elements
+from DSL.chemistry.catalog import Catalog, _species, csv_record
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.db"))
+    yield catalog
+    catalog.close()
+
+
+def test_species_keep_charges():
+    assert list(_species("Ca^2+ + CO3^2- -> CaCO3")) == [("Ca^2+", 0), ("CO3^2-", 0), ("CaCO3", 1)]
+    assert list(_species("2H2 + O2 -> 2H2O")) == [("H2", 0), ("O2", 0), ("H2O", 1)]
+    with pytest.raises(ValueError):
+        list(_species("H2 + O2"))
+
+
+def test_csv_record_converts_columns():
+    record = csv_record({"formula": "NaCl", "molar_mass": "58.44", "hazards": "Irritant; ", "name": ""})
+    assert record == {"formula": "NaCl", "molar_mass": 58.44, "hazards": ["Irritant"]}
+
+
+def test_compounds_match_any_spelling(catalog):
+    assert catalog.load_compounds([{"formula": "C2H5OH", "name": "Ethanol", "molar_mass": 46.07},
+                                   {"formula": "NaCl", "molar_mass": 58.44},
+                                   {"formula": "Xx2"}]) == 2
+    assert len(catalog) == 2
+    assert catalog.get_compound("CH3CH2OH")["name"] == "Ethanol"
+    with pytest.raises(ValueError):
+        catalog.get_compound("KBr")
+    assert [r["formula"] for r in catalog.compounds_by_mass(40, 60)] == ["C2H5OH", "NaCl"]
+
+
+def test_lookups_are_cached(catalog):
+    catalog.load_compounds([{"formula": "NaCl"}])
+    catalog.get_compound("NaCl")
+    catalog.get_compound("NaCl")
+    assert (catalog.hits, catalog.misses) == (1, 1)
+
+
+def test_reactions_of_charged_species(catalog):
+    assert catalog.load_reactions(["Ca^2+ + CO3^2- -> CaCO3", "CaCO3 -> CaO + CO2",
+                                   "CaCO3 -> CaO + CO2", "H2 + -> H2O"]) == 2
+    assert catalog.reactions_of("Ca^2+") == ["Ca^2+ + CO3^2- -> CaCO3"]
+    assert catalog.reactions_of("CaCO3") == ["Ca^2+ + CO3^2- -> CaCO3", "CaCO3 -> CaO + CO2"]
+    assert catalog.reactions_of("Ca^2-") == []
+
+
+def test_elements_consult_the_catalog(catalog, monkeypatch):
+    catalog.load_compounds([{"formula": "NaCl", "name": "Catalog salt"}])
+    monkeypatch.setattr(elements, "_catalog", catalog)
+    assert elements.get_compound("NaCl")["name"] == "Catalog salt"
+    assert elements.get_compound("H2O")["formula"] == "H2O"
@@ -0,0 +1,87 @@
+"""
+tests/test_compound_db.py
+
+The indexed compound database behind 'query compound', checked against a
+plain scan of its records.
+"""
+
+import random
+
+import pytest
+
+from DSL.chemistry.compound_db import CompoundDB, compound_db
+from DSL.chemistry.compounds import composition_of
+
+STATES = ['Solid', 'Liquid', 'Gas', 'Aqueous solution']
+CLASSES = ['Ionic salt', 'Strong acid', 'Weak acid', 'Strong base', 'Metal oxide']
+
+
+def random_compounds(n, seed=0):
+    rng = random.Random(seed)
+    compounds = {}
+    while len(compounds) < n:
+        formula = "".join(rng.choice(['C', 'H', 'O', 'Na', 'Cl', 'Fe']) + str(rng.randint(1, 9)) for _ in range(2))
+        compounds[formula] = {'state': rng.choice(STATES), 'classification': rng.choice(CLASSES)}
+    return compounds
+
+
+def scan(db, elements=(), state=None, classification=None, mass=()):
+    """The same query as CompoundDB.query, answered by testing every record."""
+    compare = {'<': float.__lt__, '<=': float.__le__, '>': float.__gt__, '>=': float.__ge__}
+    rows = []
+    for formula, record in zip(db.formulas, db.records):
+        words = record.get('classification', '').lower().split()
+        if (all(e in composition_of(formula) for e in elements)
+                and (state is None or state in record.get('state', '').lower())
+                and (classification is None or all(w in words for w in classification.lower().split()))
+                and all(compare[op](float(record['molar_mass']), value) for op, value in mass)):
+            rows.append((formula, record))
+    return sorted(rows, key=lambda pair: pair[1]['molar_mass'])
+
+
+QUERIES = [
+    dict(elements=['Na']),
+    dict(elements=['C']),
+    dict(elements=['Fe', 'O'], state='solid'),
+    dict(state='gas', classification='acid'),
+    dict(classification='strong acid', mass=[('>=', 40.0), ('<', 120.0)]),
+    dict(mass=[('<=', 60.0)]),
+    dict(elements=['Cl'], mass=[('>', 200.0)]),
+]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_queries_match_a_scan(query):
+    db = CompoundDB(random_compounds(300))
+    assert db.query(**query) == scan(db, **query)
+
+
+def test_bulk_build_matches_incremental_adds():
+    compounds = random_compounds(200, seed=1)
+    bulk = CompoundDB(compounds)
+    incremental = CompoundDB()
+    for formula, record in compounds.items():
+        incremental.add(formula, record)
+    assert bulk._masses == incremental._masses and bulk._mass_rows == incremental._mass_rows
+    assert bulk._by_element == incremental._by_element and bulk._by_class == incremental._by_class
+    assert bulk._by_state == incremental._by_state and bulk._all == incremental._all
+
+
+def test_add_after_bulk_build():
+    db = CompoundDB(random_compounds(50))
+    row = db.add("KCl", {'state': 'Solid', 'classification': 'Ionic salt'})
+    assert row == 50 and db.records[row]['molar_mass'] == pytest.approx(74.55, abs=0.01)
+    assert ("KCl", db.records[row]) in db.query(elements=['K'], state='solid')
+
+
+def test_plan_starts_from_the_most_selective_filter():
+    plan = compound_db().explain(elements=['Na'], state='solid', mass=[('<', 50)])
+    assert plan.splitlines()[0].split() == ["2", "element", "Na"]
+    assert CompoundDB().explain() == "full scan (0 rows)"
+
+
+def test_invalid_filters():
+    with pytest.raises(ValueError, match="Unknown state: plasma"):
+        compound_db().query(state='plasma')
+    with pytest.raises(ValueError, match="Unknown mass comparison"):
+        compound_db().query(mass=[('==', 18.0)])
@@ -0,0 +1,56 @@
+"""
+tests/test_compounds.py
+
+Compound is an interned, immutable, hashable flyweight.
+"""
+
+import gc
+import pickle
+
+import pytest
+
+from DSL.chemistry.compounds import Compound
+
+
+def test_compounds_are_interned_by_formula():
+    assert Compound("H2O") is Compound(" H2O ")
+    assert Compound("C2H5OH") is not Compound("CH3OCH3")
+    assert Compound("CH3OCH3").formula == "CH3OCH3"
+
+
+def test_registry_entries_vanish_with_their_last_reference():
+    Compound("C17H35COONa")
+    gc.collect()
+    assert "C17H35COONa" not in Compound._registry
+
+
+def test_compounds_are_immutable_and_slotted():
+    water = Compound("H2O")
+    with pytest.raises(AttributeError, match="immutable"):
+        water.formula = "D2O"
+    with pytest.raises(AttributeError, match="immutable"):
+        del water.charge
+    assert not hasattr(water, "__dict__")
+
+
+def test_compounds_hash_like_their_formula():
+    assert {Compound("NaCl"): 1}["NaCl"] == 1
+    assert Compound("NaCl") == "NaCl" and Compound("NaCl") != Compound("KCl")
+    assert len({Compound("CO2"), Compound("CO2"), "CO2"}) == 1
+
+
+def test_pickling_returns_the_interned_instance():
+    sulfate = Compound("SO4^2-")
+    assert pickle.loads(pickle.dumps(sulfate)) is sulfate
+    assert sulfate.charge == -2
+
+
+def test_molar_mass_is_cached():
+    water = Compound("H2O")
+    assert water.molar_mass() == pytest.approx(18.015, abs=0.001)
+    assert water._molar_mass == water.molar_mass()
+
+
+def test_invalid_formula_is_reported():
+    with pytest.raises(ValueError, match="Invalid compound formula 'Xx2'"):
+        Compound("Xx2")
@@ -0,0 +1,57 @@
+"""
+tests/test_elemental_analysis.py
+
+Candidate formulas recovered from mass-percent composition.
+"""
+
+import pytest
+
+from DSL.chemistry.compounds import Compound
+from DSL.chemistry.elemental_analysis import formulas_from_percentages, formulas_from_percentages_many
+from DSL.chemistry.elements import atomic_weight
+
+
+def percentages_of(formula):
+    compound = Compound(formula)
+    total = compound.molar_mass()
+    return {e: 100 * n * atomic_weight(e) / total for e, n in compound.composition.items()}
+
+
+@pytest.mark.parametrize("formula, empirical", [
+    ("C6H12O6", "CH2O"),
+    ("C6H6", "CH"),
+    ("C2H5OH", "C2H6O"),
+    ("Fe2O3", "Fe2O3"),
+    ("C8H10N4O2", "C4H5N2O"),
+])
+def test_exact_percentages_recover_the_empirical_formula(formula, empirical):
+    best, molecular, error = formulas_from_percentages(percentages_of(formula))[0]
+    assert best == empirical and molecular is None
+    assert error == pytest.approx(0, abs=1e-6)
+
+
+def test_molar_mass_gives_the_molecular_formula():
+    best = formulas_from_percentages({'C': 40.0, 'H': 6.7, 'O': 53.3}, molar_mass=180.16)[0]
+    assert best[:2] == ("CH2O", "C6H12O6")
+    assert best[2] < 0.05
+
+
+def test_results_are_sorted_by_error():
+    errors = [error for _, _, error in formulas_from_percentages({'C': 40.0, 'H': 6.7, 'O': 53.3}, limit=5)]
+    assert errors == sorted(errors) and len(errors) == 5
+
+
+@pytest.mark.parametrize("percentages, message", [
+    ({}, "No percentages given"),
+    ({'Xx': 100}, "Unknown element symbol: Xx"),
+    ({'C': 50, 'H': 0}, "must be positive"),
+])
+def test_invalid_analyses(percentages, message):
+    with pytest.raises(ValueError, match=message):
+        formulas_from_percentages(percentages)
+
+
+def test_batch_reports_failures_per_analysis():
+    results = formulas_from_percentages_many([{'Na': 39.34, 'Cl': 60.66}, {}], [58.44, None])
+    assert results[0][0][:2] == ("ClNa", "ClNa")
+    assert isinstance(results[1], ValueError)
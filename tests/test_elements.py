@@ -0,0 +1,60 @@
+"""
+tests/test_elements.py
+
+The lazily loaded table of all 118 elements.
+"""
+
+import math
+
+import pytest
+
+from DSL.chemistry.elements import (ATOMIC_NUMBERS, DATA_FILE, ELEMENTS, SYMBOLS, ElementTable, atomic_weight,
+                                    atomic_weights, get_element, is_metal)
+
+
+def test_table_holds_all_118_elements_in_atomic_number_order():
+    assert len(ELEMENTS) == 118 and list(ELEMENTS) == list(SYMBOLS)
+    assert ATOMIC_NUMBERS['H'] == 1 and ATOMIC_NUMBERS['Og'] == 118
+    assert ELEMENTS['Og']['name'] == "Oganesson"
+    assert all(ELEMENTS[symbol]['atomic_weight'] > 0 for symbol in SYMBOLS)
+
+
+def test_file_is_read_on_first_access_only():
+    table = ElementTable(DATA_FILE)
+    assert table._rows is None
+    assert "Fe" in table and table._rows is None
+    assert table["Fe"]["name"] == "Iron"
+    assert table["Fe"] is table["Fe"]
+
+
+def test_records_keep_the_original_fields():
+    iron = get_element('Fe')
+    assert iron['atomic_weight'] == pytest.approx(55.845)
+    assert iron['group'] == "Transition Metal" and iron['state'] == "Solid"
+    assert "Fe2O3" in iron['common_compounds']
+    assert ELEMENTS['He']['electronegativity'] is None
+
+
+def test_weights_array_is_indexed_by_atomic_number():
+    weights = atomic_weights()
+    assert weights[0] == 0.0 and weights[ATOMIC_NUMBERS['C']] == atomic_weight('C') == pytest.approx(12.011)
+    assert math.isnan(ELEMENTS.electronegativities[ATOMIC_NUMBERS['Ne']])
+
+
+def test_unknown_symbols():
+    with pytest.raises(ValueError, match="Unknown element symbol: Xx"):
+        get_element('Xx')
+    with pytest.raises(ValueError, match="Unknown element: Xx"):
+        atomic_weight('Xx')
+    assert 'Xx' not in ELEMENTS
+
+
+def test_metal_groups():
+    assert is_metal('Na') and is_metal('Fe') and not is_metal('Cl')
+
+
+def test_malformed_data_file_is_rejected(tmp_path):
+    path = tmp_path / "elements.tsv"
+    path.write_text("# symbol\tweight\n" + "H\t1.008\t2.2\tHydrogen\tGas\tNonmetal\t\t\n")
+    with pytest.raises(ValueError, match="expected 118 elements, found 1"):
+        ElementTable(str(path))["H"]
@@ -0,0 +1,44 @@
+"""
+tests/test_formatting.py
+
+Display formulas with polyatomic ions grouped.
+"""
+
+import pytest
+
+from DSL.chemistry.formatting import FormulaFormatter, format_formula, ionic_formula
+
+
+@pytest.mark.parametrize("formula, formatted", [
+    ("CuN2O6", "Cu(NO3)2"),
+    ("N2H8SO4", "(NH4)2SO4"),
+    ("Ca3P2O8", "Ca3(PO4)2"),
+    ("Fe2S3O12", "Fe2(SO4)3"),
+    ("CaO2H2", "Ca(OH)2"),
+    ("N2H8S", "(NH4)2S"),
+    ("C6H12O6", "C6H12O6"),
+    ("CuSO4", "CuSO4"),
+    ("NH4Cl", "NH4Cl"),
+    ("CH2O2", "CH2O2"),
+    ("Fe^3+", "Fe^3+"),
+    ("e", "e^-"),
+    ("Xx", "Xx"),
+])
+def test_format_formula(formula, formatted):
+    assert format_formula(formula) == formatted
+
+
+def test_ionic_formula_needs_a_repeated_ion():
+    assert ionic_formula({'Ca': 3, 'P': 2, 'O': 8}) == "Ca3(PO4)2"
+    assert ionic_formula({'Na': 1, 'O': 1, 'H': 1}) is None
+
+
+def test_groupings_are_memoized_per_composition_within_maxsize():
+    formatter = FormulaFormatter(maxsize=2)
+    assert formatter.format("CuN2O6") == formatter.format("CuO6N2") == "Cu(NO3)2"
+    assert (formatter.hits, formatter.misses) == (1, 1)
+    formatter.format("Ca3P2O8")
+    formatter.format("C6H12O6")
+    assert len(formatter) == 2
+    formatter.clear()
+    assert len(formatter) == 0
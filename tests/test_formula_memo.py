@@ -0,0 +1,50 @@
+"""
+tests/test_formula_memo.py
+
+The shared formula memo hands out one read-only composition per formula,
+counts its hits and misses, and stays within its size.
+"""
+
+import pytest
+
+from DSL.chemistry.balancer import species_composition
+from DSL.chemistry.compounds import Compound, FormulaMemo, composition_of
+
+
+def test_memo_counts_hits_and_misses():
+    memo = FormulaMemo(maxsize=8)
+    assert memo("H2O") == {'H': 2, 'O': 1}
+    assert memo("H2O") is memo(Compound("H2O").formula)
+    assert memo.stats() == {'hits': 2, 'misses': 1, 'size': 1, 'maxsize': 8}
+
+
+def test_compositions_are_read_only():
+    composition = composition_of("Fe2O3")
+    with pytest.raises(TypeError):
+        composition['Fe'] = 99
+    assert composition_of("Fe2O3") == {'Fe': 2, 'O': 3}
+
+
+def test_compound_and_balancer_share_the_memo():
+    assert Compound("C6H12O6").composition is composition_of("C6H12O6")
+    assert species_composition("C6H12O6") is composition_of("C6H12O6")
+
+
+def test_invalid_formulas_are_not_cached():
+    memo = FormulaMemo()
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Unknown element symbol: Xx"):
+            memo("Xx2")
+    assert len(memo) == 0
+
+
+def test_memo_evicts_least_recently_used():
+    memo = FormulaMemo(maxsize=2)
+    memo("H2O")
+    memo("CO2")
+    memo("H2O")
+    memo("NaCl")
+    assert memo.peek("CO2") == (False, None)
+    assert memo.peek("H2O")[0]
+    memo.resize(1)
+    assert len(memo) == 1
@@ -0,0 +1,76 @@
+"""
+tests/test_interpreter.py
+
+ChemDSL statements parsed and evaluated end to end.
+"""
+
+
+def test_balance(run):
+    assert run("balance Fe + O2 -> Fe2O3;") == "Balanced Reaction: 4Fe + 3O2 → 2Fe2O3"
+
+
+def test_predict(run):
+    assert run("predict H2O;") == "Predicted Reaction: 2H2O -> 2H2 + O2"
+
+
+def test_program_joins_statement_output(run):
+    output = run("balance H2 + O2 -> H2O; empirical_formula of C6H12O6;")
+    assert output == "Balanced Reaction: 2H2 + O2 → 2H2O\nEmpirical Formula of C6H12O6: C1H2O1"
+
+
+def test_balance_all(run):
+    assert run("balance H2 + O2 -> H2O all;") == "Balanced Reactions (1 independent solution):\n  1. 2H2 + O2 → 2H2O"
+    output = run("balance H2 + O2 -> H2O + H2O2 all;").splitlines()
+    assert output[0] == "Balanced Reactions (2 independent solutions):"
+    assert output[1:3] == ["  1. 3H2 + 2O2 → 2H2O + H2O2", "  2. 4H2 + 3O2 → 2H2O + 2H2O2"]
+    assert len(output) == 11
+
+
+def test_balance_all_reports_an_exhausted_budget(evaluator, run):
+    evaluator.set_budgets(max_operations=40)
+    output = run("balance H2 + O2 -> H2O + H2O2 all;").splitlines()
+    assert output == ["Balanced Reactions (2 independent solutions):",
+                      "Balancing stopped: operations budget exceeded after 41 operations."]
+
+
+def test_balance_reports_net_charge(run):
+    assert run("balance Zn + Cu^2+ -> Zn^2+ + Cu;") == "Balanced Reaction: Zn + Cu^2+ → Zn^2+ + Cu"
+    assert run("balance Na -> Na^+;") == (
+        "Could not balance reaction: Net charge is unbalanced: nothing on the other side "
+        "of the reaction offsets the charge of Na^+.")
+
+
+def test_query_formula_mass(run):
+    assert run("query formula mass 18.0106;") == (
+        "Formulas matching 18.0106 ± 5.0 ppm (1 found):\n  H2O  18.01056  (-2.0 ppm)")
+    assert "± 2 mda" in run("query formula mass 18.0106 tol 2 mda;")
+    assert run("query formula mass 44.0;") == "No formulas match 44.0 ± 5.0 ppm."
+
+
+def test_empirical_formula_from_composition(run):
+    output = run("empirical_formula of [C 40.0, H 6.7, O 53.3];")
+    assert output.startswith("Candidate formulas for C 40.0%, H 6.7%, O 53.3%:")
+    assert "1. CH2O (error 0.01%)" in output
+
+
+def test_empirical_formula_with_molar_mass(run):
+    output = run("empirical_formula of [C 40.0, H 6.7, O 53.3] with molar_mass 180.16;")
+    assert output.splitlines()[0].endswith("(M = 180.16 g/mol):")
+    assert "1. C6H12O6 (empirical CH2O, error 0.01%)" in output
+
+
+def test_empirical_formula_of_compound(run):
+    assert run("empirical_formula of C6H12O6;") == "Empirical Formula of C6H12O6: C1H2O1"
+
+
+def test_query_compound(run):
+    output = run("query compound with Na and solid;")
+    assert output.splitlines()[0] == "Compounds with Na and state solid (2 found):"
+    assert "NaOH" in output and "NaCl" in output
+
+
+def test_query_reaction(run):
+    output = run("query reaction with CaCO3;")
+    lines = output.splitlines()
+    assert lines[0].startswith("Known reactions involving CaCO3")
+    assert "  CaCO3 -> CaO + CO2  (Thermal decomposition)" in lines
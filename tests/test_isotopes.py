@@ -0,0 +1,51 @@
+"""
+tests/test_isotopes.py
+
+Isotopic distributions against patterns that can be worked out by hand,
+and the packaged isotope data behind them.
+"""
+
+import pytest
+
+from DSL.chemistry.elements import ELECTRON_MASS, ISOTOPES
+from DSL.chemistry.isotopes import isotope_pattern, isotope_patterns
+
+ELEMENTS_WITHOUT_STABLE_ISOTOPES = {'Tc', 'Pm'}
+
+
+def test_isotope_data_covers_every_naturally_occurring_element():
+    assert len(ISOTOPES) == 84
+    assert not ELEMENTS_WITHOUT_STABLE_ISOTOPES & set(ISOTOPES)
+    for symbol, isotopes in ISOTOPES.items():
+        assert sum(abundance for _, abundance in isotopes) == pytest.approx(1, abs=1e-3), symbol
+
+
+def test_chlorine_pattern_is_binomial():
+    (m0, a0), (m1, a1), (m2, a2) = isotope_pattern("Cl2", resolution=0.3)
+    assert (a0, a1, a2) == pytest.approx((0.7576 ** 2, 2 * 0.7576 * 0.2424, 0.2424 ** 2), abs=1e-6)
+    assert m0 == pytest.approx(2 * 34.96885268, abs=1e-4)
+    assert m2 - m0 == pytest.approx(2 * (36.96590259 - 34.96885268), abs=1e-4)
+
+
+def test_high_resolution_separates_fine_structure():
+    peaks = isotope_pattern("CH4", resolution=0.001)
+    assert peaks[0] == pytest.approx((16.0313, 0.98885), abs=1e-4)
+    # 13C and 2H isotopologues sit 3 mDa apart near mass 17
+    assert [round(mass, 3) for mass, _ in peaks[1:3]] == [17.035, 17.038]
+
+
+def test_charge_shifts_by_the_electron_mass():
+    anion = isotope_pattern("SO4^2-", resolution=0.3)[0][0]
+    neutral = isotope_pattern("SO4", resolution=0.3)[0][0]
+    assert anion - neutral == pytest.approx(2 * ELECTRON_MASS, abs=1e-6)
+
+
+def test_batch_matches_single_patterns():
+    batch = isotope_patterns(["C60", "H2O"], resolution=0.3)
+    assert batch == [isotope_pattern("C60", resolution=0.3), isotope_pattern("H2O", resolution=0.3)]
+    assert sum(abundance for _, abundance in batch[0]) == pytest.approx(1)
+
+
+def test_element_without_isotope_data():
+    with pytest.raises(ValueError, match="No isotope data for element: Tc"):
+        isotope_pattern("Tc")
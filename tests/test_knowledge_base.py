@@ -0,0 +1,85 @@
+"""
+tests/test_knowledge_base.py
+
+Free-text reaction entries are parsed with the balancer's term parser,
+indexed by canonical formula and by reactant set, and saved indexes are
+reused only while their sources are unchanged.
+"""
+
+from DSL.chemistry import knowledge_base
+from DSL.chemistry.knowledge_base import KnownReaction, ReactionIndex, build_index, cached_index, parse_equations
+
+
+def test_parse_equations():
+    assert parse_equations("Contact process: S + O₂ → SO₂, 2SO₂ + O₂ ⇌ 2SO₃") == [
+        ("Contact process", [(1, "S"), (1, "O2")], [(1, "SO2")], False),
+        ("Contact process", [(2, "SO2"), (1, "O2")], [(2, "SO3")], True),
+    ]
+    assert parse_equations("Ca²⁺ + CO₃²⁻ → CaCO₃") == [(None, [(1, "Ca^2+"), (1, "CO3^2-")], [(1, "CaCO3")], False)]
+    assert parse_equations("6CO2 + 6H2O + light energy -> C6H12O6 + 6O2")[0][1] == [(6, "CO2"), (6, "H2O")]
+    assert parse_equations("Used as a food preservative") == []
+
+
+def test_terms_without_spaces_are_split():
+    assert parse_equations("H2+O2 -> H2O") == [(None, [(1, "H2"), (1, "O2")], [(1, "H2O")], False)]
+    assert parse_equations("Fe^3+ + e^- -> Fe^2+")[0][1] == [(1, "Fe^3+"), (1, "e^-")]
+    assert parse_equations("H2 + -> H2O") == []
+    assert parse_equations("H2 + water gas shift reaction -> H2O") == [(None, [(1, "H2")], [(1, "H2O")], False)]
+
+
+def test_index_lookups_match_any_spelling():
+    index = ReactionIndex()
+    assert index.add_text("Fermentation: C6H12O6 -> 2C2H5OH + 2CO2", "compound C6H12O6") == 1
+    assert index.add_text("C6H12O6 -> 2CH3CH2OH + 2CO2", "file.txt:1") == 0
+    assert index.add_text("Combustion: CH3CH2OH + 3O2 -> 2CO2 + 3H2O") == 1
+    assert [r.label for r in index.involving("CH3CH2OH")] == ["Fermentation", "Combustion"]
+    assert [r.label for r in index.producing("C2H5OH")] == ["Fermentation"]
+    assert [r.label for r in index.consuming("C2H5OH")] == ["Combustion"]
+    assert index.involving("Xx") == [] and index.involving("NaCl") == []
+
+
+def test_priority_and_rank():
+    element = KnownReaction([(1, "C"), (1, "O2")], [(1, "CO2")], source="element C")
+    compound = KnownReaction([(1, "C"), (1, "O2")], [(1, "CO2")], source="compound CO2")
+    production = KnownReaction([(2, "C"), (1, "O2")], [(2, "CO")], source="production of CO")
+    assert [element.priority, compound.priority, production.priority, KnownReaction([], []).priority] == [0, 1, 2, 1]
+    reversible = KnownReaction([(1, "N2"), (3, "H2")], [(2, "NH3")], reversible=True)
+    assert reversible.equation == "N2 + 3H2 <-> 2NH3"
+    assert reversible.rank() == (1, 1) and reversible.rank(-1) == (1, 2)
+
+
+def test_from_reactants_orders_by_rank():
+    index = ReactionIndex([
+        KnownReaction([(2, "C"), (1, "O2")], [(2, "CO")], source="production of CO"),
+        KnownReaction([(1, "C"), (1, "O2")], [(1, "CO2")], source="compound CO2"),
+        KnownReaction([(1, "C"), (1, "O2")], [(1, "CO"), (1, "CO2")], source="element C"),
+        KnownReaction([(1, "CO2")], [(1, "C"), (1, "O2")], reversible=True),
+    ])
+    assert [(r.equation, d) for r, d in index.from_reactants(["O2", "C"])] == [
+        ("C + O2 -> CO + CO2", 1), ("C + O2 -> CO2", 1), ("CO2 <-> C + O2", -1), ("2C + O2 -> 2CO", 1)]
+    assert index.from_reactants(["C"]) == [] and index.from_reactants(["Xx"]) == []
+
+
+def test_saved_index_is_reused_while_sources_match(tmp_path):
+    sources = [("CaCO3 -> CaO + CO2", "compound CaCO3")]
+    index = cached_index(str(tmp_path), sources)
+    assert (tmp_path / knowledge_base.INDEX_FILENAME).exists()
+    reloaded = ReactionIndex.load(str(tmp_path / knowledge_base.INDEX_FILENAME))
+    assert [r.equation for r in reloaded.involving("CO2")] == ["CaCO3 -> CaO + CO2"]
+    assert reloaded.fingerprint == index.fingerprint
+    changed = cached_index(str(tmp_path), sources + [("2H2 + O2 -> 2H2O", "compound H2O")])
+    assert len(changed) == 2 and changed.fingerprint != index.fingerprint
+
+
+def test_reaction_file(tmp_path):
+    path = tmp_path / "reactions.txt"
+    path.write_text("# extra reactions\n\nHaber process: N2 + 3H2 <-> 2NH3\nnot an equation\n", encoding="utf-8")
+    index = build_index(sources=[], paths=[str(path)])
+    reaction, direction = index.from_reactants(["NH3"])[0]
+    assert (reaction.label, reaction.source, direction) == ("Haber process", f"{path}:3", -1)
+
+
+def test_builtin_index():
+    index = build_index()
+    assert "CaCO3 -> CaO + CO2" in [r.equation for r in index.involving("CaCO3")]
+    assert "Ca^2+ + CO3^2- -> CaCO3" in [r.equation for r in index.involving("Ca^2+")]
@@ -0,0 +1,101 @@
+"""
+tests/test_mapped_catalog.py
+
+A mapped catalog written by build_mapped_catalog finds compounds under
+any spelling and by molar mass, and the builder tool writes one from
+the built-in table and from CSV and JSONL files.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from DSL.chemistry.compounds import Compound
+from DSL.chemistry.elements import COMPOUNDS
+from DSL.chemistry.mapped_catalog import MappedCatalog, build_mapped_catalog
+
+TOOL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools", "build_mapped_catalog.py")
+
+RECORDS = [
+    {"formula": "C2H5OH", "name": "Ethanol", "molar_mass": 46.07},
+    {"formula": "CH3OCH3", "name": "Dimethyl ether"},
+    {"formula": "NaCl", "name": "Sodium chloride", "molar_mass": 58.44},
+    {"formula": "SO4^2-", "name": "Sulfate"},
+    {"formula": "Xx2", "name": "Unparseable"},
+    {"name": "No formula"},
+]
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = str(tmp_path / "compounds.chemcat")
+    assert build_mapped_catalog(path, RECORDS) == 4
+    return MappedCatalog(path)
+
+
+def test_find_matches_any_spelling_and_isomers(catalog):
+    assert len(catalog) == 4
+    assert sorted(entry.properties["name"] for entry in catalog.find("CH3CH2OH")) == ["Dimethyl ether", "Ethanol"]
+    assert catalog.find("KBr") == []
+    assert catalog.find("SO4") == []
+    assert catalog.find("SO4^2-")[0].composition == {"O": 4, "S": 1}
+
+
+def test_get_compound_prefers_the_same_spelling(catalog):
+    assert catalog.get_compound("CH3OCH3")["name"] == "Dimethyl ether"
+    assert catalog.get_compound("C2H5OH")["name"] == "Ethanol"
+    for formula in ("KBr", "Xx2"):
+        with pytest.raises(ValueError):
+            catalog.get_compound(formula)
+    with pytest.raises(ValueError):
+        catalog.get_element("Na")
+
+
+def test_by_mass_is_lightest_first(catalog):
+    entries = catalog.by_mass(40, 60)
+    assert [entry.properties["name"] for entry in entries] == ["Dimethyl ether", "Ethanol", "Sodium chloride"]
+    assert entries[0].molar_mass == pytest.approx(46.07, abs=0.01)
+    assert catalog.by_mass(100, 200) == []
+
+
+def test_entry_materializes_a_compound(catalog):
+    entry = catalog.find("NaCl")[0]
+    assert entry.formula == "NaCl"
+    assert entry.compound() is Compound("NaCl")
+
+
+def test_empty_catalog(tmp_path):
+    path = str(tmp_path / "empty.chemcat")
+    assert build_mapped_catalog(path, []) == 0
+    catalog = MappedCatalog(path)
+    assert len(catalog) == 0 and catalog.find("H2O") == [] and catalog.by_mass(0, 1000) == []
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.db"
+    path.write_bytes(b"SQLite format 3\0")
+    with pytest.raises(ValueError):
+        MappedCatalog(str(path))
+
+
+def test_build_tool(tmp_path):
+    csv_path = tmp_path / "extra.csv"
+    csv_path.write_text("formula,name,molar_mass\nKBr,Potassium bromide,119.0\n", encoding="utf-8")
+    jsonl_path = tmp_path / "extra.jsonl"
+    jsonl_path.write_text(json.dumps({"formula": "LiF", "name": "Lithium fluoride"}) + "\n", encoding="utf-8")
+    output = tmp_path / "all.chemcat"
+    result = subprocess.run([sys.executable, TOOL, str(output), str(csv_path), "--builtin", str(jsonl_path)],
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.startswith(f"Wrote {len(COMPOUNDS) + 2} compounds")
+    catalog = MappedCatalog(str(output))
+    assert catalog.get_compound("KBr")["molar_mass"] == 119.0
+    assert catalog.get_compound("LiF")["name"] == "Lithium fluoride"
+    assert catalog.get_compound("H2O")["formula"] == "H2O"
+
+
+def test_build_tool_needs_sources(tmp_path):
+    result = subprocess.run([sys.executable, TOOL, str(tmp_path / "none.chemcat")], capture_output=True, text=True)
+    assert result.returncode == 2 and "nothing to build" in result.stderr
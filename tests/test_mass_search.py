@@ -0,0 +1,62 @@
+"""
+tests/test_mass_search.py
+
+Mass decomposition against a brute-force enumeration, and its filters.
+"""
+
+from itertools import product
+
+import pytest
+
+from DSL.chemistry.compounds import hill_formula, parse_formula
+from DSL.chemistry.mass_search import (DEFAULT_ALPHABET, MassDecomposer, decompose_mass, element_mass, rdbe,
+                                       tolerance_window)
+
+
+def brute_force(mass, low, high, alphabet):
+    """Every formula over alphabet with a monoisotopic mass in [low, high]."""
+    masses = [element_mass(e) for e in alphabet]
+    found = set()
+    for counts in product(*(range(int(high // m) + 1) for m in masses)):
+        exact = sum(n * m for n, m in zip(counts, masses))
+        if any(counts) and low <= exact <= high:
+            found.add(hill_formula({e: n for e, n in zip(alphabet, counts) if n}))
+    return found
+
+
+@pytest.mark.parametrize("mass", [18.0106, 44.0, 60.021, 98.0])
+def test_matches_brute_force(mass):
+    alphabet = ('C', 'H', 'N', 'O')
+    low, high = tolerance_window(mass, 20, "mda")
+    found = {formula for formula, _ in MassDecomposer(alphabet).decompose(mass, 20, "mda")}
+    assert found == brute_force(mass, low, high, alphabet)
+
+
+def test_glucose_is_found_within_five_ppm():
+    results = dict(decompose_mass(180.0634))
+    assert results["C6H12O6"] == pytest.approx(180.06339, abs=1e-4)
+
+
+def test_default_alphabet_keeps_every_halogen():
+    assert set(DEFAULT_ALPHABET) >= {'F', 'Cl', 'Br', 'I'}
+    assert "CH3Br" in dict(decompose_mass(93.9418, 5, "mda"))
+    assert "CH3I" in dict(decompose_mass(141.9279, 5, "mda"))
+
+
+def test_bounds_and_rdbe_filters():
+    formulas = dict(decompose_mass(180.0634, bounds={'N': (0, 0)}, valence=True))
+    assert "C6H12O6" in formulas
+    assert all('N' not in formula for formula in formulas)
+    assert rdbe({'C': 6, 'H': 6}) == 4
+    benzene = dict(decompose_mass(78.047, 5, "mda", rdbe_range=(4, 4)))
+    assert "C6H6" in benzene
+    assert all(rdbe(parse_formula(formula)) == 4 for formula in benzene)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="Unknown tolerance unit"):
+        tolerance_window(18.0, 5, "percent")
+    with pytest.raises(ValueError, match="not in the search alphabet"):
+        list(decompose_mass(18.0106, bounds={'Na': (0, 1)}))
+    with pytest.raises(ValueError, match="No isotope data"):
+        element_mass('Tc')
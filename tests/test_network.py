@@ -0,0 +1,62 @@
+"""
+tests/test_network.py
+
+Sparse stoichiometric matrices for reaction networks: mass balance,
+conservation laws and the independent subset of reactions.
+"""
+
+import numpy as np
+import pytest
+
+from DSL.chemistry.network import CSRMatrix, ReactionNetwork
+
+MECHANISM = [
+    "2H2 + O2 -> 2H2O",
+    "H2 + O2 -> H2O2",
+    "2H2O2 -> 2H2O + O2",
+    "H2O2 -> H2O + O",
+]
+
+
+def test_csr_matrix_round_trip():
+    matrix = CSRMatrix.from_coo([0, 1, 1, 0, 2], [1, 0, 0, 1, 2], [3, 1, 1, -3, 5], (3, 3))
+    assert matrix.nnz == 2
+    assert matrix.toarray().tolist() == [[0, 0, 0], [2, 0, 0], [0, 0, 5]]
+    assert matrix.transpose().toarray().tolist() == [[0, 2, 0], [0, 0, 0], [0, 0, 5]]
+    assert matrix.dot([1, 2, 3]).tolist() == [0, 2, 15]
+    assert matrix.dense_rows(1, 3).tolist() == [[2, 0, 0], [0, 0, 5]]
+
+
+def test_stoichiometric_matrix_has_products_positive():
+    network = ReactionNetwork.from_equations(MECHANISM)
+    assert network.species == ["H2", "O2", "H2O", "H2O2", "O"]
+    assert network.stoichiometric_matrix().toarray()[:, 0].tolist() == [-2, -1, 2, 0, 0]
+
+
+def test_mass_balance_per_reaction():
+    network = ReactionNetwork.from_equations(MECHANISM + ["H2 -> H2O"])
+    assert network.check_mass_balance().tolist() == [True, True, True, True, False]
+    assert network.unbalanced_reactions() == ["R5"]
+
+
+def test_charge_is_conserved_as_its_own_row():
+    network = ReactionNetwork.from_equations(["Fe^3+ + e^- -> Fe^2+", "Fe^2+ -> Fe^3+"])
+    elements, _ = network.element_matrix()
+    assert elements == ["Fe", "charge"]
+    assert network.unbalanced_reactions() == ["R2"]
+
+
+def test_conservation_laws_and_rank():
+    network = ReactionNetwork.from_equations(MECHANISM)
+    elements, laws = network.conservation_laws()
+    assert elements == ["H", "O"]
+    assert np.array_equal(laws @ network.stoichiometric_matrix().toarray(), np.zeros((2, 4)))
+    assert network.rank() == 3
+    assert network.independent_reactions() == ["R1", "R2", "R4"]
+
+
+def test_reaction_names_are_unique():
+    network = ReactionNetwork()
+    network.add_equation("H2 + O2 -> H2O2", name="peroxide")
+    with pytest.raises(ValueError, match="Duplicate reaction name"):
+        network.add_equation("2H2 + O2 -> 2H2O", name="peroxide")
@@ -0,0 +1,183 @@
+"""
+tests/test_parse_formula.py
+
+parse_formula must agree with the recursive parser it replaced, kept below
+as the reference: same counts, same key order, and the same ValueError
+message for every malformed formula. Square brackets and hydrate dots,
+which the original did not know, are checked against equivalent formulas
+written with parentheses.
+"""
+
+import random
+
+import pytest
+
+from DSL.chemistry.compounds import Compound, parse_formula
+from DSL.chemistry.elements import SYMBOLS
+
+# The original parser looked symbols up in the ELEMENTS dict
+ORIGINAL_ELEMENTS = dict.fromkeys(SYMBOLS)
+
+PARITY_ALPHABET = ['H', 'C', 'O', 'Na', 'Cl', 'Xx', 'Q', '(', ')', '(', ')',
+                   '2', '12', '3', ' ', 'a', '-', 'e', 'Fe', 'Zz']
+
+
+def original_parse_formula(formula: str) -> dict:
+    """The recursive parse_formula that the scanner replaced, kept as the reference."""
+    if hasattr(formula, 'formula'):
+        formula = formula.formula
+
+    formula = formula.strip()
+    if not formula:
+        raise ValueError("Empty formula")
+
+    composition = {}
+
+    def parse_part(part, multiplier=1):
+        i = 0
+        while i < len(part):
+            if i < len(part) and 'A' <= part[i] <= 'Z':
+                symbol = part[i]
+                i += 1
+                if i < len(part) and 'a' <= part[i] <= 'z':
+                    symbol += part[i]
+                    i += 1
+
+                if symbol not in ORIGINAL_ELEMENTS:
+                    raise ValueError(f"Unknown element symbol: {symbol}")
+
+                count = ""
+                while i < len(part) and '0' <= part[i] <= '9':
+                    count += part[i]
+                    i += 1
+
+                count = int(count) if count else 1
+                count *= multiplier
+
+                composition[symbol] = composition.get(symbol, 0) + count
+
+            elif i < len(part) and part[i] == '(':
+                paren_level = 1
+                start = i + 1
+                i += 1
+                while i < len(part) and paren_level > 0:
+                    if part[i] == '(':
+                        paren_level += 1
+                    elif part[i] == ')':
+                        paren_level -= 1
+                    i += 1
+
+                if paren_level != 0:
+                    raise ValueError("Mismatched parentheses in formula")
+
+                group_multiplier = ""
+                while i < len(part) and '0' <= part[i] <= '9':
+                    group_multiplier += part[i]
+                    i += 1
+
+                group_multiplier = int(group_multiplier) if group_multiplier else 1
+                group_multiplier *= multiplier
+
+                parse_part(part[start:i-1], group_multiplier)
+
+            else:
+                i += 1
+
+    parse_part(formula)
+
+    return composition
+
+
+def outcome(parse, formula):
+    try:
+        composition = parse(formula)
+    except ValueError as e:
+        return 'error', str(e)
+    return 'ok', composition, list(composition)
+
+
+@pytest.mark.parametrize("formula, expected", [
+    ("H2O", {'H': 2, 'O': 1}),
+    ("  NaCl ", {'Na': 1, 'Cl': 1}),
+    ("H2O)", {'H': 2, 'O': 1}),
+    ("Ca(OH)2", {'Ca': 1, 'O': 2, 'H': 2}),
+    ("Al2(SO4)3", {'Al': 2, 'S': 3, 'O': 12}),
+    ("K4(Fe(CN)6)", {'K': 4, 'Fe': 1, 'C': 6, 'N': 6}),
+    ("CH3(CH2)10CH3", {'C': 12, 'H': 26}),
+])
+def test_compositions(formula, expected):
+    assert parse_formula(formula) == expected
+    assert outcome(parse_formula, formula) == outcome(original_parse_formula, formula)
+
+
+@pytest.mark.parametrize("formula", ["", "   ", "Xx", "Q2", "(H2O", "((H)2", "Na(Cl", "(Xx"])
+def test_errors_match_the_original(formula):
+    with pytest.raises(ValueError) as excinfo:
+        original_parse_formula(formula)
+    with pytest.raises(ValueError, match=str(excinfo.value).replace("(", r"\(")):
+        parse_formula(formula)
+
+
+def test_accepts_compounds():
+    assert parse_formula(Compound("C6H12O6")) == {'C': 6, 'H': 12, 'O': 6}
+
+
+def test_random_parity_with_the_original():
+    rng = random.Random(1)
+    for _ in range(20_000):
+        formula = "".join(rng.choice(PARITY_ALPHABET) for _ in range(rng.randint(0, 10)))
+        assert outcome(parse_formula, formula) == outcome(original_parse_formula, formula), formula
+
+
+@pytest.mark.parametrize("formula, expected", [
+    ("K4[Fe(CN)6]", {'K': 4, 'Fe': 1, 'C': 6, 'N': 6}),
+    ("K3[Fe(CN)6]2", {'K': 3, 'Fe': 2, 'C': 12, 'N': 12}),
+    ("[Cu(NH3)4]SO4", {'Cu': 1, 'N': 4, 'H': 12, 'S': 1, 'O': 4}),
+    ("CuSO4·5H2O", {'Cu': 1, 'S': 1, 'O': 9, 'H': 10}),
+    ("CuSO4.5H2O", {'Cu': 1, 'S': 1, 'O': 9, 'H': 10}),
+    ("Na2CO3*10H2O", {'Na': 2, 'C': 1, 'O': 13, 'H': 20}),
+    ("CaSO4·H2O", {'Ca': 1, 'S': 1, 'O': 5, 'H': 2}),
+])
+def test_brackets_and_hydrates(formula, expected):
+    assert parse_formula(formula) == expected
+
+
+@pytest.mark.parametrize("formula, message", [
+    ("Fe(CN]6", "Mismatched parentheses"),
+    ("[Fe(CN)6", "Mismatched parentheses"),
+    ("Ca(H2O·2)", "Mismatched parentheses"),
+    ("[Xx", "Unknown element symbol: Xx"),
+])
+def test_bracket_errors(formula, message):
+    with pytest.raises(ValueError, match=message.replace("(", r"\(")):
+        parse_formula(formula)
+
+
+def random_group(rng, depth):
+    """A random formula of nested groups, each in round or square brackets."""
+    parts = []
+    for _ in range(rng.randint(1, 3)):
+        if depth and rng.random() < 0.4:
+            opener, closer = rng.choice(["()", "[]"])
+            parts.append(opener + random_group(rng, depth - 1) + closer + rng.choice(["", "2", "13"]))
+        else:
+            parts.append(rng.choice(["H", "C", "O", "Na", "Cl", "Fe"]) + rng.choice(["", "2", "12"]))
+    return "".join(parts)
+
+
+def test_square_brackets_parse_like_parentheses():
+    rng = random.Random(2)
+    for _ in range(5_000):
+        formula = random_group(rng, 3)
+        rounded = formula.replace("[", "(").replace("]", ")")
+        assert outcome(parse_formula, formula) == outcome(original_parse_formula, rounded), formula
+
+
+def test_hydrates_add_the_scaled_water_segment():
+    rng = random.Random(3)
+    for _ in range(2_000):
+        salt, water, n = random_group(rng, 2), random_group(rng, 1), rng.randint(1, 12)
+        expected = dict(original_parse_formula(salt.replace("[", "(").replace("]", ")")))
+        for element, count in original_parse_formula(water.replace("[", "(").replace("]", ")")).items():
+            expected[element] = expected.get(element, 0) + n * count
+        assert parse_formula(f"{salt}·{n}{water}") == expected
@@ -0,0 +1,67 @@
+"""
+tests/test_vectors.py
+
+Dense composition vectors, with NumPy and with the array('i') fallback.
+"""
+
+import pytest
+
+from DSL.chemistry import vectors
+from DSL.chemistry.compounds import Compound
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    """Run a test with NumPy vectors and again with the pure-Python fallback."""
+    if request.param == "array":
+        monkeypatch.setattr(vectors, "_np", False)
+        monkeypatch.setattr(vectors, "_WEIGHTS", None)
+    return request.param
+
+
+def test_round_trip(backend):
+    vector = vectors.to_vector({'O': 4, 'S': 1}, -2)
+    assert len(vector) == vectors.VECTOR_LENGTH
+    assert vector[8] == 4 and vector[16] == 1 and vector[vectors.CHARGE_INDEX] == -2
+    assert vectors.from_vector(vector) == ({'O': 4, 'S': 1}, -2)
+
+
+def test_arithmetic(backend):
+    water = vectors.to_vector({'H': 2, 'O': 1})
+    hydrogen = vectors.to_vector({'H': 2})
+    oxygen = vectors.to_vector({'O': 2})
+    assert vectors.equal(vectors.scale(water, 2), vectors.add(vectors.scale(hydrogen, 2), oxygen))
+    assert vectors.equal(vectors.subtract(water, hydrogen), vectors.to_vector({'O': 1}))
+    assert vectors.is_balanced([hydrogen, oxygen], [water], (2, 1, 2))
+    assert not vectors.is_balanced([hydrogen, oxygen], [water], (1, 1, 1))
+
+
+def test_charge_must_balance(backend):
+    ferric = vectors.to_vector({'Fe': 1}, 3)
+    ferrous = vectors.to_vector({'Fe': 1}, 2)
+    electron = vectors.to_vector({}, -1)
+    assert vectors.is_balanced([ferric, electron], [ferrous], (1, 1, 1))
+    assert not vectors.is_balanced([ferric], [ferrous], (1, 1))
+
+
+def test_molar_mass(backend):
+    assert vectors.molar_mass(vectors.to_vector({'H': 2, 'O': 1}, 5)) == pytest.approx(18.015, abs=0.001)
+
+
+def test_compound_vectors_are_cached_and_read_only():
+    carbon_dioxide = Compound("CO2")
+    vector = carbon_dioxide.vector
+    assert vector is carbon_dioxide.vector
+    with pytest.raises(ValueError):
+        vector[6] = 2
+
+
+def test_from_vector_writes_hill_order():
+    assert Compound.from_vector(vectors.to_vector({'O': 1, 'H': 6, 'C': 2})).formula == "C2H6O"
+    assert Compound.from_vector(vectors.to_vector({'O': 4, 'S': 1}, -2)).formula == "O4S^2-"
+
+
+def test_stack_builds_species_columns():
+    matrix = vectors.stack([Compound("H2O").vector, Compound("O2").vector])
+    assert matrix.shape == (vectors.VECTOR_LENGTH, 2)
+    assert matrix[8].tolist() == [1, 2]
@@ -0,0 +1,50 @@
+"""
+tools/build_mapped_catalog.py
+
+Builds a memory-mapped compound catalog (see DSL/chemistry/mapped_catalog.py)
+from the built-in COMPOUNDS table and/or external CSV and JSONL files. Run
+from the repository root:
+
+    python tools/build_mapped_catalog.py compounds.chemcat [--builtin] [data.csv data.jsonl ...]
+
+CSV files need a header row with at least a 'formula' column; JSONL files
+hold one record per line. Files ending in .jsonl or .json are read as JSONL,
+everything else as CSV.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from DSL.chemistry.catalog import read_csv, read_jsonl
+from DSL.chemistry.elements import COMPOUNDS
+from DSL.chemistry.mapped_catalog import build_mapped_catalog, MappedCatalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("output", help="catalog file to write")
+    parser.add_argument("sources", nargs="*", help="CSV or JSONL files of compound records")
+    parser.add_argument("--builtin", action="store_true", help="include the built-in COMPOUNDS table")
+    args = parser.parse_intermixed_args()
+    if not args.builtin and not args.sources:
+        parser.error("nothing to build: give source files and/or --builtin")
+
+    sources = [COMPOUNDS.values()] if args.builtin else []
+    for path in args.sources:
+        sources.append(read_jsonl(path) if path.endswith((".jsonl", ".json")) else read_csv(path))
+
+    start = time.perf_counter()
+    written = build_mapped_catalog(args.output, itertools.chain.from_iterable(sources))
+    elapsed = time.perf_counter() - start
+    catalog = MappedCatalog(args.output)
+    print(f"Wrote {written} compounds to {args.output} "
+          f"({os.path.getsize(args.output) / 1e6:.1f} MB) in {elapsed:.1f} s; {catalog!r}")
+
+
+if __name__ == "__main__":
+    main()